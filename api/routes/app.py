@@ -3,37 +3,40 @@ Main application routes for She&Soul FastAPI application
 Based on Java implementation for production readiness
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import Dict, Any
+from datetime import date
 
-from core.database import get_sync_db
+from core.database import get_db
+from core.db_routing import replica_read
 from core.security import get_current_user, create_access_token
 from db.models.user import User
-from db.models.profile import Profile, UserType, UserServiceType
+from db.repository import profile_id_by_user_id
 from api.schemas.auth import SignUpRequest, SignUpResponse, LoginRequest, LoginResponse, VerifyEmailRequest, ResendOtpRequest
 from api.schemas.profile import (
     ProfileRequest, ProfileResponse, ProfileServiceDto, MenstrualTrackingDto,
-    PartnerDataDto, CyclePredictionDto
+    PartnerDataDto, CyclePredictionDto, CycleForecastDto, CycleCalendarDto,
+    ProbabilisticCyclePredictionDto, ProfileBasicUpdate, ProfileBasicDto
 )
+from api.schemas.risk import McqAssessmentDto, McqBatchRequest, McqBatchResponse
 from services.app_service import AppService
 
 router = APIRouter()
 app_service = AppService()
 
 @router.post("/signup", response_model=SignUpResponse)
-def signup_user(
+async def signup_user(
     signup_request: SignUpRequest,
-    db: Session = Depends(get_sync_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Register a new user (simplified like Java implementation)
     Only requires email and password, profile creation is separate
     """
     try:
-        user = app_service.register_user(db, signup_request)
+        user = await app_service.register_user(db, signup_request)
         
         # Create JWT token
         access_token = create_access_token(data={"sub": user.email})
@@ -61,15 +64,15 @@ def signup_user(
         )
 
 @router.post("/verify-email")
-def verify_email(
+async def verify_email(
     request: VerifyEmailRequest,
-    db: Session = Depends(get_sync_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Verify user email with OTP
     """
     try:
-        app_service.verify_email(db, request.email, request.otp)
+        await app_service.verify_email(db, request.email, request.otp)
         return {"message": "Email verified successfully!"}
         
     except ValueError as e:
@@ -84,15 +87,15 @@ def verify_email(
         )
 
 @router.post("/resend-otp")
-def resend_otp(
+async def resend_otp(
     request: ResendOtpRequest,
-    db: Session = Depends(get_sync_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Resend OTP to user email
     """
     try:
-        app_service.resend_otp(db, request.email)
+        await app_service.resend_otp(db, request.email)
         return {"message": "OTP resent successfully!"}
         
     except ValueError as e:
@@ -107,15 +110,15 @@ def resend_otp(
         )
 
 @router.post("/login", response_model=LoginResponse)
-def login_user(
+async def login_user(
     login_request: LoginRequest,
-    db: Session = Depends(get_sync_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Login user and return JWT token
     """
     try:
-        user = app_service.login_user(db, login_request.email, login_request.password)
+        user = await app_service.login_user(db, login_request.email, login_request.password)
         
         # Create JWT token
         access_token = create_access_token(data={"sub": user.email})
@@ -139,16 +142,16 @@ def login_user(
         )
 
 @router.post("/profile", response_model=ProfileResponse)
-def create_profile(
+async def create_profile(
     profile_request: ProfileRequest,
-    db: Session = Depends(get_sync_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Create user profile
     """
     try:
-        return app_service.create_profile(db, profile_request, current_user)
+        return await app_service.create_profile(db, profile_request, current_user)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -161,16 +164,16 @@ def create_profile(
         )
 
 @router.get("/profile", response_model=ProfileResponse)
-def get_profile(
-    db: Session = Depends(get_sync_db),
+@replica_read
+async def get_profile(
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get user profile
     """
     try:
-        profile = app_service.find_profile_by_user_id(db, current_user.id)
-        return ProfileResponse.from_orm(profile)
+        return await app_service.get_profile_response(db, current_user.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -183,16 +186,16 @@ def get_profile(
         )
 
 @router.put("/profile/service", response_model=ProfileServiceDto)
-def update_service(
+async def update_service(
     service_dto: ProfileServiceDto,
-    db: Session = Depends(get_sync_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update user service preferences
     """
     try:
-        return app_service.update_user_service(db, current_user.id, service_dto)
+        return await app_service.update_user_service(db, current_user.id, service_dto)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -205,16 +208,16 @@ def update_service(
         )
 
 @router.put("/profile/menstrual-data", response_model=MenstrualTrackingDto)
-def update_menstrual_data(
+async def update_menstrual_data(
     update_dto: MenstrualTrackingDto,
-    db: Session = Depends(get_sync_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Update menstrual tracking data
     """
     try:
-        return app_service.update_menstrual_data(db, current_user.id, update_dto)
+        return await app_service.update_menstrual_data(db, current_user.id, update_dto)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -227,15 +230,16 @@ def update_menstrual_data(
         )
 
 @router.get("/cycle-prediction", response_model=CyclePredictionDto)
-def get_cycle_prediction(
-    db: Session = Depends(get_sync_db),
+@replica_read
+async def get_cycle_prediction(
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get next cycle prediction
     """
     try:
-        return app_service.predict_next_cycle(db, current_user.id)
+        return await app_service.predict_next_cycle(db, current_user.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -247,32 +251,104 @@ def get_cycle_prediction(
             detail=f"Failed to get cycle prediction: {str(e)}"
         )
 
+@router.get("/cycle-prediction/probabilistic", response_model=ProbabilisticCyclePredictionDto)
+@replica_read
+async def get_probabilistic_cycle_prediction(
+    confidence: float = Query(0.9, ge=0.5, le=0.99, description="Probability covered by each interval"),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get next cycle prediction as intervals fitted to the user's logged cycles
+    """
+    try:
+        return await app_service.predict_next_cycle_probabilistic(db, current_user.id, confidence)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get probabilistic cycle prediction: {str(e)}"
+        )
+
 @router.get("/cycle-prediction-text", response_model=str)
-def get_cycle_prediction_text(
-    db: Session = Depends(get_sync_db),
+@replica_read
+async def get_cycle_prediction_text(
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get cycle prediction as formatted text
     """
     try:
-        return app_service.get_cycle_prediction_as_text(db, current_user.id)
+        return await app_service.get_cycle_prediction_as_text(db, current_user.id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get cycle prediction text: {str(e)}"
         )
 
+@router.get("/cycle-forecast", response_model=CycleForecastDto)
+@replica_read
+async def get_cycle_forecast(
+    cycles: int = Query(6, ge=1, le=24, description="Number of cycles to predict"),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get predictions for the next N cycles
+    """
+    try:
+        return await app_service.forecast_cycles(db, current_user.id, cycles)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get cycle forecast: {str(e)}"
+        )
+
+@router.get("/cycle-calendar", response_model=CycleCalendarDto)
+@replica_read
+async def get_cycle_calendar(
+    from_date: date = Query(..., alias="from", description="First calendar day"),
+    to_date: date = Query(..., alias="to", description="Last calendar day (inclusive)"),
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the run-length encoded per-day phase calendar for a date range
+    """
+    try:
+        return await app_service.get_cycle_calendar(db, current_user.id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get cycle calendar: {str(e)}"
+        )
+
 @router.get("/partner-data", response_model=PartnerDataDto)
-def get_partner_data(
-    db: Session = Depends(get_sync_db),
+@replica_read
+async def get_partner_data(
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get partner data for the logged-in partner
     """
     try:
-        return app_service.get_partner_data(db, current_user.id)
+        return await app_service.get_partner_data(db, current_user.id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -285,16 +361,16 @@ def get_partner_data(
         )
 
 @router.post("/mcq-risk-assessment", response_model=str)
-def process_mcq_risk_assessment(
+async def process_mcq_risk_assessment(
     answers: Dict[str, str],
-    db: Session = Depends(get_sync_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Process MCQ risk assessment and return risk level
     """
     try:
-        return app_service.process_mcq_risk_assessment(db, current_user.id, answers)
+        return await app_service.process_mcq_risk_assessment(db, current_user.id, answers)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -306,82 +382,115 @@ def process_mcq_risk_assessment(
             detail=f"Failed to process MCQ risk assessment: {str(e)}"
         )
 
+@router.get("/mcq-risk-assessment", response_model=McqAssessmentDto)
+@replica_read
+async def get_mcq_risk_assessment(
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the stored MCQ answers and risk level
+    """
+    try:
+        return await app_service.get_mcq_risk_assessment(db, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get MCQ risk assessment: {str(e)}"
+        )
+
+@router.post("/mcq-risk-assessment/batch", response_model=McqBatchResponse)
+async def score_mcq_batch(
+    request: McqBatchRequest,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Score several MCQ answer sets at once without storing them
+    """
+    try:
+        return await app_service.score_mcq_batch(db, request.answer_sets)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to score MCQ batch: {str(e)}"
+        )
+
+@router.patch("/profile", response_model=ProfileBasicDto)
+async def patch_profile(
+    patch: ProfileBasicUpdate,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Update only the basic profile fields present in the request
+    """
+    try:
+        return await app_service.patch_profile(db, current_user.id, patch)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Profile update failed: {str(e)}"
+        )
+
+# PUT /profile/basic error messages, in the order the fields were checked
+BASIC_INFO_ERRORS = {
+    "age": "Age must be between 0 and 120",
+    "height": "Height must be a positive number",
+    "weight": "Weight must be a positive number",
+    "name": "Name must be a non-empty string",
+    "nick_name": "Nickname must be a string or null",
+}
+
 @router.put("/profile/basic")
 async def update_profile_basic(
     basic_info: Dict[str, Any],
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user)
 ):
     """
     Update basic profile information (age, height, weight, name, nickname)
+    Kept for older clients; PATCH /profile is the typed equivalent
     """
     try:
-        result = await db.execute(select(Profile).where(Profile.user_id == current_user.id))
-        profile = result.scalar_one_or_none()
-
-        if not profile:
+        # Strict: numbers must be JSON numbers, not numeric strings
+        patch = ProfileBasicUpdate.model_validate(basic_info, strict=True)
+    except ValidationError as e:
+        # A missing profile is reported before the body, as before strict validation
+        if not await profile_id_by_user_id(db, current_user.id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Profile not found"
             )
-
-        # 2) Update only provided fields with validation
-        if "age" in basic_info and basic_info["age"] is not None:
-            age_val = basic_info["age"]
-            if not isinstance(age_val, int) or age_val < 0 or age_val > 120:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Age must be between 0 and 120"
-                )
-            profile.age = age_val
-
-        if "height" in basic_info and basic_info["height"] is not None:
-            height_val = basic_info["height"]
-            if not isinstance(height_val, (int, float)) or float(height_val) <= 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Height must be a positive number"
-                )
-            profile.height = float(height_val)
-
-        if "weight" in basic_info and basic_info["weight"] is not None:
-            weight_val = basic_info["weight"]
-            if not isinstance(weight_val, (int, float)) or float(weight_val) <= 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Weight must be a positive number"
-                )
-            profile.weight = float(weight_val)
-
-        if "name" in basic_info and basic_info["name"] is not None:
-            name_val = basic_info["name"]
-            if not isinstance(name_val, str) or len(name_val.strip()) == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Name must be a non-empty string"
-                )
-            profile.name = name_val.strip()
-
-        if "nick_name" in basic_info:
-            nickname_val = basic_info["nick_name"]
-            if nickname_val is not None and not isinstance(nickname_val, str):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Nickname must be a string or null"
-                )
-            profile.nick_name = nickname_val
-
-        # 3) Commit without errors
-        await db.commit()
-
+        fields = [error["loc"][0] for error in e.errors()]
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=next(
+                (message for field, message in BASIC_INFO_ERRORS.items() if field in fields),
+                e.errors()[0]["msg"]
+            )
+        )
+    
+    try:
+        await app_service.patch_profile(db, current_user.id, patch)
         return {"message": "Profile updated successfully"}
-
-    except HTTPException:
-        # Re-raise intentional API errors
-        raise
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
     except Exception as e:
-        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Profile update failed: {str(e)}"
-        )
\ No newline at end of file
+        )
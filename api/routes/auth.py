@@ -2,14 +2,15 @@
 Authentication routes for She&Soul FastAPI application
 """
 
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from core.database import get_db
+from core.database import get_db, release_connection
 from core.security import verify_password, create_access_token, get_current_user, get_password_hash
 from db.models.user import User
+from db.repository import user_credentials_by_email, user_id_by_email
 # Assuming AuthResponse is defined in api.schemas.auth
 from api.schemas.auth import LoginRequest, AuthResponse, SignUpRequest
 
@@ -18,15 +19,14 @@ router = APIRouter()
 @router.post("/signup", response_model=AuthResponse)
 async def signup(
     signup_request: SignUpRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Register a new user
     """
     try:
         # Check if user already exists
-        result = await db.execute(select(User).filter(User.email == signup_request.email))
-        existing_user = result.scalar_one_or_none()
+        existing_user = await user_id_by_email(db, signup_request.email)
         
         if existing_user:
             raise HTTPException(
@@ -34,16 +34,18 @@ async def signup(
                 detail="Email already registered"
             )
         
+        # Hashing takes a few hundred ms; don't hold a pooled connection meanwhile
+        await release_connection(db)
+        
         # Create new user
         new_user = User(
             email=signup_request.email,
-            password=get_password_hash(signup_request.password),
+            password=await asyncio.to_thread(get_password_hash, signup_request.password),
             is_email_verified=False
         )
         
         db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
+        await db.flush()
         
         # Create access token
         access_token = create_access_token(data={"sub": new_user.email})
@@ -56,7 +58,6 @@ async def signup(
     except HTTPException:
         raise
     except Exception as e:
-        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Signup failed: {str(e)}"
@@ -66,15 +67,14 @@ async def signup(
 @router.post("/login", response_model=AuthResponse)
 async def login(
     login_request: LoginRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Authenticate user and return JWT token
     """
     try:
         # Find user by email
-        result = await db.execute(select(User).filter(User.email == login_request.email))
-        user = result.scalar_one_or_none()
+        user = await user_credentials_by_email(db, login_request.email)
         
         if not user:
             raise HTTPException(
@@ -83,7 +83,8 @@ async def login(
             )
         
         # Verify password
-        if not verify_password(login_request.password, user.password):
+        await release_connection(db)
+        if not await asyncio.to_thread(verify_password, login_request.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
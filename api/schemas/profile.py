@@ -2,8 +2,8 @@
 Profile schemas for She&Soul FastAPI application
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List
 from datetime import date
 from enum import Enum
 
@@ -39,6 +39,31 @@ class ProfileResponse(BaseModel):
     user_type: UserType = Field(..., description="User type")
     referral_code: Optional[str] = Field(None, description="User's referral code")
 
+class ProfileBasicUpdate(BaseModel):
+    """Partial update of basic profile fields; only fields sent are written"""
+    name: Optional[str] = Field(None, min_length=1, description="User name")
+    nick_name: Optional[str] = Field(None, description="User nickname (null clears it)")
+    age: Optional[int] = Field(None, ge=0, le=120, description="User age")
+    height: Optional[float] = Field(None, gt=0, description="User height")
+    weight: Optional[float] = Field(None, gt=0, description="User weight")
+
+    @field_validator("name")
+    @classmethod
+    def name_not_blank(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            value = value.strip()
+            if not value:
+                raise ValueError("Name must be a non-empty string")
+        return value
+
+class ProfileBasicDto(BaseModel):
+    """Basic profile fields after an update"""
+    name: str = Field(..., description="User name")
+    nick_name: Optional[str] = Field(None, description="User nickname")
+    age: Optional[int] = Field(None, description="User age")
+    height: Optional[float] = Field(None, description="User height")
+    weight: Optional[float] = Field(None, description="User weight")
+
 class ProfileServiceDto(BaseModel):
     """Profile service update schema"""
     preferred_service_type: UserServiceType = Field(..., description="Preferred service type")
@@ -66,4 +91,45 @@ class CyclePredictionDto(BaseModel):
 class PartnerDataDto(BaseModel):
     """Partner data schema - matches Java implementation"""
     name: str = Field(..., description="Partner's linked user name")
-    cycle_prediction: Optional[CyclePredictionDto] = Field(None, description="Cycle prediction data") 
\ No newline at end of file
+    cycle_prediction: Optional[CyclePredictionDto] = Field(None, description="Cycle prediction data")
+
+class CyclePhase(str, Enum):
+    """Per-day menstrual cycle phase"""
+    PERIOD = "PERIOD"
+    FOLLICULAR = "FOLLICULAR"
+    FERTILE = "FERTILE"
+    OVULATION = "OVULATION"
+    LUTEAL = "LUTEAL"
+
+class CycleForecastDto(BaseModel):
+    """Predictions for several consecutive cycles"""
+    cycles: List[CyclePredictionDto] = Field(..., description="Predicted cycles, nearest first")
+
+class PhaseRunDto(BaseModel):
+    """Run of consecutive days sharing one phase"""
+    phase: CyclePhase = Field(..., description="Cycle phase")
+    start_date: date = Field(..., description="First day of the run")
+    days: int = Field(..., ge=1, description="Number of days in the run")
+
+class CycleCalendarDto(BaseModel):
+    """Run-length encoded per-day phase calendar"""
+    start_date: date = Field(..., description="First calendar day")
+    end_date: date = Field(..., description="Last calendar day (inclusive)")
+    runs: List[PhaseRunDto] = Field(..., description="Phase runs covering the range in order")
+
+class DateIntervalDto(BaseModel):
+    """Predicted date with its confidence interval"""
+    earliest: date = Field(..., description="Lower bound of the interval")
+    most_likely: date = Field(..., description="Point estimate")
+    latest: date = Field(..., description="Upper bound of the interval")
+
+class ProbabilisticCyclePredictionDto(BaseModel):
+    """Next-cycle prediction fitted to the user's logged cycle lengths"""
+    confidence: float = Field(..., description="Probability mass covered by each interval")
+    cycles_observed: int = Field(..., description="Logged cycles used for the fit")
+    mean_cycle_length: float = Field(..., description="Fitted mean cycle length in days")
+    cycle_length_std: float = Field(..., description="Fitted cycle length standard deviation in days")
+    next_period_start: DateIntervalDto = Field(..., description="Next period start interval")
+    next_ovulation: DateIntervalDto = Field(..., description="Next ovulation interval")
+    fertile_window_start_date: date = Field(..., description="Earliest possible fertile day")
+    fertile_window_end_date: date = Field(..., description="Latest possible fertile day")
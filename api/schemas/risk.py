@@ -0,0 +1,29 @@
+"""
+Risk assessment schemas for She&Soul FastAPI application
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from core.config import settings
+
+class McqBatchRequest(BaseModel):
+    """Several MCQ answer sets scored in one request"""
+    answer_sets: List[Dict[str, str]] = Field(
+        ..., min_length=1, max_length=settings.MCQ_BATCH_MAX_ANSWER_SETS, description="MCQ answers keyed by question"
+    )
+
+class McqRiskResultDto(BaseModel):
+    """Score and risk level for one MCQ answer set"""
+    score: int = Field(..., description="Risk score (never below 0)")
+    risk_level: str = Field(..., description="Low Risk, Moderate Risk or High Risk")
+
+class McqBatchResponse(BaseModel):
+    """Batch MCQ scoring results, in request order"""
+    rules_version: int = Field(..., description="Scoring rule version used")
+    results: List[McqRiskResultDto] = Field(..., description="One result per answer set")
+
+class McqAssessmentDto(BaseModel):
+    """Stored MCQ answers with the resulting risk level"""
+    answers: Dict[str, str] = Field(..., description="MCQ answers keyed by question")
+    risk_level: Optional[str] = Field(None, description="Risk level of the stored answers")
@@ -3,7 +3,7 @@ Configuration settings for She&Soul FastAPI application
 """
 
 import os
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -21,6 +21,37 @@ class Settings(BaseSettings):
         env="DATABASE_URL"
     )
     
+    # Optional streaming replica for routes marked @replica_read; callers stay
+    # on the primary for READ_YOUR_WRITES_SECONDS after their own writes
+    DATABASE_REPLICA_URL: Optional[str] = Field(default=None, env="DATABASE_REPLICA_URL")
+    READ_YOUR_WRITES_SECONDS: float = Field(default=5.0, env="READ_YOUR_WRITES_SECONDS")
+    
+    # Connection pool: profile from core/db_optimization.py, DB_* values override it.
+    # DB_CONNECTION_BUDGET is the server-side pool the pooler grants this app
+    # (15 is Supabase's smallest pooler pool); per-worker pools are sized so
+    # that all workers fit inside it. The worker count is WORKERS, else
+    # WEB_CONCURRENCY, which uvicorn and gunicorn read when --workers is not given.
+    ENVIRONMENT: str = Field(default="production", env="ENVIRONMENT")
+    WORKERS: Optional[int] = Field(default=None, env="WORKERS")
+    WEB_CONCURRENCY: Optional[int] = Field(default=None, env="WEB_CONCURRENCY")
+    DB_POOL_SIZE: Optional[int] = Field(default=None, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: Optional[int] = Field(default=None, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: Optional[float] = Field(default=None, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: Optional[int] = Field(default=None, env="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: Optional[bool] = Field(default=None, env="DB_POOL_PRE_PING")
+    DB_CONNECT_TIMEOUT: Optional[float] = Field(default=None, env="DB_CONNECT_TIMEOUT")
+    DB_COMMAND_TIMEOUT: Optional[float] = Field(default=None, env="DB_COMMAND_TIMEOUT")
+    DB_CONNECTION_BUDGET: int = Field(default=15, env="DB_CONNECTION_BUDGET")
+    DB_RESERVED_CONNECTIONS: int = Field(default=2, env="DB_RESERVED_CONNECTIONS")
+    DB_QUERY_CACHE_SIZE: Optional[int] = Field(default=None, env="DB_QUERY_CACHE_SIZE")
+    # "auto" detects transaction pooling (pooler=true or port 6543) from the URL
+    # and turns off named prepared statements; "session" or "transaction" force it
+    DB_POOL_MODE: str = Field(default="auto", env="DB_POOL_MODE")
+    # Connections opened in the background after startup (default pool_size);
+    # /health/ready answers 503 until they are open
+    DB_WARMUP_ENABLED: bool = Field(default=True, env="DB_WARMUP_ENABLED")
+    DB_WARMUP_CONNECTIONS: Optional[int] = Field(default=None, env="DB_WARMUP_CONNECTIONS")
+    
     # Security
     SECRET_KEY: str = Field(
         default="ThisIsMySuperSecretKeyForSheAndSoulApplication",
@@ -48,6 +79,30 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
+
+    # Per-worker caches
+    PROFILE_CACHE_TTL_SECONDS: int = Field(default=60, env="PROFILE_CACHE_TTL_SECONDS")
+    PROFILE_CACHE_MAX_ENTRIES: int = Field(default=10000, env="PROFILE_CACHE_MAX_ENTRIES")
+    PREDICTION_CACHE_MAX_ENTRIES: int = Field(default=10000, env="PREDICTION_CACHE_MAX_ENTRIES")
+    
+    # Largest number of answer sets accepted by POST /mcq-risk-assessment/batch
+    MCQ_BATCH_MAX_ANSWER_SETS: int = Field(default=10000, env="MCQ_BATCH_MAX_ANSWER_SETS")
+    
+    # Idempotency-Key support ("memory" is per worker, "postgres" is shared)
+    IDEMPOTENCY_BACKEND: str = Field(default="memory", env="IDEMPOTENCY_BACKEND")
+    IDEMPOTENCY_TTL_SECONDS: int = Field(default=86400, env="IDEMPOTENCY_TTL_SECONDS")
+    IDEMPOTENCY_WAIT_SECONDS: float = Field(default=10.0, env="IDEMPOTENCY_WAIT_SECONDS")
+    IDEMPOTENCY_LOCK_SECONDS: int = Field(default=60, env="IDEMPOTENCY_LOCK_SECONDS")
+    
+    # Prometheus-style metrics at /metrics (per worker process). Scrapers send
+    # "Authorization: Bearer <METRICS_TOKEN>"; without a token /metrics is off.
+    METRICS_ENABLED: bool = Field(default=True, env="METRICS_ENABLED")
+    METRICS_TOKEN: Optional[str] = Field(default=None, env="METRICS_TOKEN")
+    
+    # Statement tracking: slow statements are logged; with DEBUG, query shapes
+    # repeated N_PLUS_ONE_THRESHOLD times in one request are flagged
+    SLOW_QUERY_MS: float = Field(default=200.0, env="SLOW_QUERY_MS")
+    N_PLUS_ONE_THRESHOLD: int = Field(default=3, env="N_PLUS_ONE_THRESHOLD")
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -2,38 +2,184 @@
 Database configuration for She&Soul FastAPI application
 """
 
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy.engine import make_url
 from core.config import settings
+from core.db_optimization import (
+    DATABASE_OPTIMIZATION_CONFIG, resolve_pool_config, resolve_worker_count, engine_options, detect_pool_mode, driver_url
+)
+from core.metrics import TimedAsyncQueuePool, instrument_engine
+from core.query_log import instrument_statements
+from core.db_routing import SessionRouter, session_wrote
+from core.db_retry import RetryPolicy, RetryingAsyncSession
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create the engine with the correct connection pool settings
+# Per-worker pool settings from the environment profile, DB_* overrides and
+# the pooler's connection budget (see core/db_optimization.py)
+pool_config = resolve_pool_config(
+    settings.ENVIRONMENT,
+    overrides={
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_timeout": settings.DB_CONNECT_TIMEOUT,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    },
+    workers=resolve_worker_count(settings.WORKERS, settings.WEB_CONCURRENCY),
+    connection_budget=settings.DB_CONNECTION_BUDGET,
+    reserved_connections=settings.DB_RESERVED_CONNECTIONS,
+    pool_mode=detect_pool_mode(settings.DATABASE_URL, settings.DB_POOL_MODE)
+)
+
+# Create the engine with the resolved connection pool settings
 engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=0,
-    pool_pre_ping=True,
-    pool_recycle=300,
+    driver_url(settings.DATABASE_URL),
+    **engine_options(pool_config, make_url(settings.DATABASE_URL).get_backend_name()),
+    poolclass=TimedAsyncQueuePool,
+    pool_logging_name="primary",
     echo=settings.DEBUG  # Use debug setting instead of hardcoded True
 )
 
+if settings.METRICS_ENABLED:
+    instrument_engine(engine, "primary")
+instrument_statements(
+    engine, "primary", slow_query_seconds=settings.SLOW_QUERY_MS / 1000, record_metrics=settings.METRICS_ENABLED
+)
+
+# Transient connection errors on reads are retried with jittered backoff
+retry_policy = RetryPolicy(
+    max_retries=DATABASE_OPTIMIZATION_CONFIG["max_retries"],
+    base_delay=DATABASE_OPTIMIZATION_CONFIG["retry_base_delay"],
+    max_delay=DATABASE_OPTIMIZATION_CONFIG["retry_delay"],
+    request_budget=DATABASE_OPTIMIZATION_CONFIG["retry_budget"]
+)
+
 # Create a configured "Session" class
-async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+async_session_maker = async_sessionmaker(
+    engine, class_=RetryingAsyncSession, expire_on_commit=False, retry_policy=retry_policy
+)
+
+# Optional read replica, same pool sizing as the primary
+replica_engine = None
+replica_session_maker = None
+if settings.DATABASE_REPLICA_URL:
+    replica_pool_config = {**pool_config, "pool_mode": detect_pool_mode(settings.DATABASE_REPLICA_URL, settings.DB_POOL_MODE)}
+    replica_engine = create_async_engine(
+        driver_url(settings.DATABASE_REPLICA_URL),
+        **engine_options(replica_pool_config, make_url(settings.DATABASE_REPLICA_URL).get_backend_name()),
+        poolclass=TimedAsyncQueuePool,
+        pool_logging_name="replica",
+        echo=settings.DEBUG
+    )
+    if settings.METRICS_ENABLED:
+        instrument_engine(replica_engine, "replica")
+    instrument_statements(
+        replica_engine, "replica", slow_query_seconds=settings.SLOW_QUERY_MS / 1000, record_metrics=settings.METRICS_ENABLED
+    )
+    replica_session_maker = async_sessionmaker(
+        replica_engine, class_=RetryingAsyncSession, expire_on_commit=False, retry_policy=retry_policy
+    )
+
+def _token_claims(scope) -> Optional[dict]:
+    """Claims of the request's bearer token, or None if absent or invalid"""
+    from core.security import verify_token
+
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return verify_token(token)
+    return None
+
+session_router = SessionRouter(
+    replica_enabled=replica_session_maker is not None,
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    identify=_token_claims
+)
 
 # Create base class for models
 Base = declarative_base()
 
+AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+def run_after_commit(session: Union[Session, AsyncSession], callback: Callable[[], None]) -> None:
+    """
+    Run callback once the session's transaction commits (cache invalidation,
+    emails). Callbacks are dropped if the transaction rolls back.
+    """
+    session.info.setdefault(AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT_CALLBACKS, []):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"After-commit callback failed: {e}")
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT_CALLBACKS, None)
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """Commit once if the block succeeds, roll back otherwise (sync sessions, scripts and tests)"""
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    End a read-only transaction early so its connection goes back to the
+    pool while the request does slow work that needs no database (password
+    hashing); the next statement checks out a connection again. Does
+    nothing once the session has staged or written changes, or registered
+    after-commit callbacks: those belong to the request's single commit.
+    """
+    if (
+        session.in_transaction()
+        and not session_wrote(session.sync_session)
+        and not (session.new or session.dirty or session.deleted)
+        and not session.info.get(AFTER_COMMIT_CALLBACKS)
+    ):
+        await session.commit()
+
 # Create the dependency that will be used in the routes
-async def get_db() -> AsyncSession:
+async def get_db(request: Request = None) -> AsyncSession:
     """
     Dependency that provides a database session per request.
-    This ensures proper session lifecycle management and prevents connection leaks.
+    The request is one unit of work: services only stage and flush changes,
+    and the session commits once after the route returns (or rolls back if
+    it raised). Declare it with Depends(get_db, scope="function") so the
+    commit happens before the response is sent.
+    The session is lazy: a connection is checked out by the first statement
+    (never, for requests rejected before touching the database or served
+    from cache) and returned when the transaction ends. FastAPI caches the
+    dependency per request, so get_current_user and the route share it.
+    GET routes marked @replica_read get a replica session unless the
+    caller wrote within READ_YOUR_WRITES_SECONDS.
     """
-    async with async_session_maker() as session:
+    use_replica = request is not None and session_router.use_replica(request.scope)
+    session_maker = replica_session_maker if use_replica else async_session_maker
+    async with session_maker() as session:
         try:
             yield session
+            await session.commit()
+            if request is not None and session_wrote(session):
+                session_router.record_write(request.scope)
         except Exception as e:
             logger.error(f"Database session error: {e}")
             await session.rollback()
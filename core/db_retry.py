@@ -0,0 +1,134 @@
+"""
+Retry of transient database connection errors for She&Soul FastAPI application
+A pooler restart or dropped connection otherwise fails whatever statement
+happens to run next. The request session retries reads that are safe to
+repeat (nothing written yet in its transaction) with exponential backoff and
+full jitter, within a per-request retry budget so a real outage is not
+multiplied into a retry storm.
+"""
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db_routing import session_wrote
+
+logger = logging.getLogger(__name__)
+
+RETRY_BUDGET = "retry_budget"
+
+# SQLSTATE class 08 (connection exception) plus server shutdown / startup and
+# connection limits: the statement never ran, or ran on a connection that is gone
+RETRYABLE_SQLSTATE_CLASSES = ("08",)
+RETRYABLE_SQLSTATES = {
+    "57P01",  # admin_shutdown
+    "57P02",  # crash_shutdown
+    "57P03",  # cannot_connect_now
+    "53300",  # too_many_connections
+}
+
+
+def _sqlstate(error: BaseException):
+    orig = getattr(error, "orig", None)
+    for candidate in (orig, getattr(orig, "__cause__", None)):
+        sqlstate = getattr(candidate, "sqlstate", None) or getattr(candidate, "pgcode", None)
+        if sqlstate:
+            return sqlstate
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error means the connection failed rather than the statement.
+    Timeouts are fatal: the statement may still be running and repeating it
+    only adds load. Constraint, syntax and data errors are fatal.
+    """
+    if isinstance(error, TimeoutError):
+        return False
+    if isinstance(error, DBAPIError):
+        if error.connection_invalidated:
+            return True
+        sqlstate = _sqlstate(error)
+        if sqlstate:
+            return sqlstate.startswith(RETRYABLE_SQLSTATE_CLASSES) or sqlstate in RETRYABLE_SQLSTATES
+        error = error.orig
+    # Raised while opening a connection (refused, reset, DNS), before any statement ran
+    return isinstance(error, ConnectionError) or (isinstance(error, OSError) and not isinstance(error, TimeoutError))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Attempts per statement, backoff bounds and retries allowed per request (session)"""
+    max_retries: int = 3
+    base_delay: float = 0.05
+    max_delay: float = 1.0
+    request_budget: int = 3
+
+    def delay(self, attempt: int, rand: Callable[[], float] = random.random) -> float:
+        """Full jitter: uniform in [0, min(max_delay, base_delay * 2 ** (attempt - 1))]"""
+        return rand() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+
+class RetryingAsyncSession(AsyncSession):
+    """
+    AsyncSession that retries SELECTs and get() after a transient connection
+    error while its transaction has written nothing. The failed transaction
+    is rolled back and objects already loaded are refreshed, so the request
+    carries on as if the connection had never dropped. Writes and commits
+    are never retried; get_db's rollback handles those.
+    """
+
+    def __init__(self, *args, retry_policy: RetryPolicy = RetryPolicy(), sleep=asyncio.sleep, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_policy = retry_policy
+        self._sleep = sleep
+        self.info[RETRY_BUDGET] = retry_policy.request_budget
+
+    async def execute(self, statement, *args, **kwargs):
+        if not getattr(statement, "is_select", False):
+            return await super().execute(statement, *args, **kwargs)
+        return await self._with_retry(super().execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        if not getattr(statement, "is_select", False):
+            return await super().scalar(statement, *args, **kwargs)
+        return await self._with_retry(super().scalar, statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._with_retry(super().get, *args, **kwargs)
+
+    def _can_retry(self, error: BaseException, attempt: int) -> bool:
+        return (
+            attempt < self.retry_policy.max_retries
+            and self.info.get(RETRY_BUDGET, 0) > 0
+            and is_retryable(error)
+            and not session_wrote(self.sync_session)
+            and not (self.new or self.dirty or self.deleted)
+        )
+
+    async def _with_retry(self, operation, *args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                if attempt:
+                    await self._reset_transaction()
+                return await operation(*args, **kwargs)
+            except Exception as e:
+                if not self._can_retry(e, attempt):
+                    raise
+                attempt += 1
+                self.info[RETRY_BUDGET] -= 1
+                delay = self.retry_policy.delay(attempt)
+                logger.warning(f"Transient database error, retry {attempt} in {delay * 1000:.0f} ms: {e}")
+                await self._sleep(delay)
+
+    async def _reset_transaction(self) -> None:
+        """Discard the broken transaction and reload what the request already read"""
+        await self.rollback()
+        for instance in list(self.identity_map.values()):
+            await self.refresh(instance)
@@ -0,0 +1,97 @@
+"""
+Primary/replica session routing for She&Soul FastAPI application
+"""
+
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+
+SESSION_WROTE = "session_wrote"
+REPLICA_READ_ATTRIBUTE = "__replica_read__"
+READ_METHODS = {"GET", "HEAD"}
+
+
+def replica_read(endpoint: Callable) -> Callable:
+    """
+    Mark a read-only route as safe to serve from the replica. Apply it
+    below the router decorator:
+
+        @router.get("/profile")
+        @replica_read
+        async def get_profile(...): ...
+    """
+    setattr(endpoint, REPLICA_READ_ATTRIBUTE, True)
+    return endpoint
+
+
+def is_replica_read(scope) -> bool:
+    """Whether the matched route of a request may read from the replica"""
+    route = scope.get("route")
+    return (
+        scope.get("method") in READ_METHODS
+        and getattr(getattr(route, "endpoint", None), REPLICA_READ_ATTRIBUTE, False)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session: Session, flush_context) -> None:
+    session.info[SESSION_WROTE] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[SESSION_WROTE] = True
+
+
+def session_wrote(session) -> bool:
+    """Whether the session flushed changes or ran INSERT/UPDATE/DELETE statements"""
+    return session.info.get(SESSION_WROTE, False)
+
+
+class SessionRouter:
+    """
+    Decides whether a request may use the replica. Routes marked with
+    @replica_read go to the replica unless the caller wrote recently:
+    after a committed write, a caller's reads stay on the primary for
+    sticky_seconds so they see their own changes despite replica lag.
+    A freshly issued token counts as a write (signup or login just ran).
+
+    Recent writers are remembered per worker process, so with several
+    workers the token age check and sticky_seconds should cover the
+    replica lag rather than relying on the next read reaching the same
+    worker.
+    """
+
+    def __init__(self, replica_enabled: bool, sticky_seconds: float = 5.0,
+                 identify: Callable[[dict], Optional[dict]] = lambda scope: None,
+                 max_tracked_writers: int = 100000, clock: Callable[[], float] = time.time):
+        self.replica_enabled = replica_enabled
+        self.sticky_seconds = sticky_seconds
+        self.identify = identify
+        self._clock = clock
+        self._recent_writers = TTLCache(max_entries=max_tracked_writers, ttl_seconds=sticky_seconds, clock=clock)
+
+    def use_replica(self, scope) -> bool:
+        """Whether this request's session should be bound to the replica"""
+        if not self.replica_enabled or not is_replica_read(scope):
+            return False
+
+        claims = self.identify(scope)
+        if claims:
+            if self._recent_writers.get(claims.get("sub")) is not None:
+                return False
+            issued_at = claims.get("iat")
+            if issued_at is not None and self._clock() - issued_at < self.sticky_seconds:
+                return False
+        return True
+
+    def record_write(self, scope) -> None:
+        """Keep the caller on the primary for the next sticky_seconds"""
+        claims = self.identify(scope)
+        if claims and claims.get("sub"):
+            self._recent_writers.set(claims["sub"], True)
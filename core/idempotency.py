@@ -0,0 +1,395 @@
+"""
+Idempotency-Key support for She&Soul FastAPI application
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from starlette.responses import JSONResponse
+
+from core.config import settings
+from core.security import create_access_token, verify_token
+from db.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+# Bodies are buffered to fingerprint them; the covered routes take small JSON
+MAX_BODY_BYTES = 64 * 1024
+# Response headers kept with the stored body
+STORED_HEADERS = {b"content-type", b"location"}
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used with a different request body"""
+
+
+class IdempotencyInProgress(Exception):
+    """The original request is still running after the wait timeout"""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """First response recorded for an idempotency key"""
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyStore(ABC):
+    """
+    Records the first response per key. reserve() returns None when the
+    caller now owns the key and must call complete() or release(); it
+    returns the stored response for a finished duplicate and waits while
+    the original request is still in flight.
+    """
+
+    @abstractmethod
+    async def reserve(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        ...
+
+    @abstractmethod
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        ...
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        ...
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    expires_at: float
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    response: Optional[StoredResponse] = None
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Per-worker store: duplicates are only detected within one process"""
+
+    def __init__(self, ttl_seconds: float, wait_seconds: float, lock_seconds: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.lock_seconds = lock_seconds
+        self._clock = clock
+        self._entries: Dict[str, _Entry] = {}
+
+    async def reserve(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        deadline = self._clock() + self.wait_seconds
+        while True:
+            self._purge()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _Entry(fingerprint=fingerprint, expires_at=self._clock() + self.lock_seconds)
+                return None
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyConflict(key)
+            if entry.response is not None:
+                return entry.response
+
+            try:
+                await asyncio.wait_for(entry.done.wait(), timeout=max(deadline - self._clock(), 0))
+            except asyncio.TimeoutError:
+                raise IdempotencyInProgress(key)
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.response = response
+        entry.expires_at = self._clock() + self.ttl_seconds
+        entry.done.set()
+
+    async def release(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.done.set()
+
+    def _purge(self) -> None:
+        now = self._clock()
+        for key in [key for key, entry in self._entries.items() if entry.expires_at <= now]:
+            self._entries.pop(key).done.set()
+
+
+class PostgresIdempotencyStore(IdempotencyStore):
+    """
+    Store shared by every worker, backed by the idempotency_keys table.
+    A key is reserved by inserting its row; duplicates poll the row until
+    the owner stores the response or releases it. In-flight rows expire
+    after lock_seconds so a crashed worker does not block the key forever.
+    """
+
+    POLL_SECONDS = 0.1
+
+    def __init__(self, session_maker, ttl_seconds: float, wait_seconds: float, lock_seconds: float):
+        self.session_maker = session_maker
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.lock_seconds = lock_seconds
+
+    async def reserve(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            async with self.session_maker() as session:
+                now = datetime.utcnow()
+                await session.execute(
+                    delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+                )
+                insert = postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+                inserted = await session.execute(
+                    insert(IdempotencyKey)
+                    .values(
+                        key=key,
+                        fingerprint=fingerprint,
+                        created_at=now,
+                        expires_at=now + timedelta(seconds=self.lock_seconds)
+                    )
+                    .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+                    .returning(IdempotencyKey.key)
+                )
+                owned = inserted.first() is not None
+                row = None if owned else (await session.execute(
+                    select(
+                        IdempotencyKey.fingerprint,
+                        IdempotencyKey.status_code,
+                        IdempotencyKey.response_headers,
+                        IdempotencyKey.response_body
+                    ).where(IdempotencyKey.key == key)
+                )).first()
+                await session.commit()
+
+            if owned:
+                return None
+            if row is not None:
+                if row.fingerprint != fingerprint:
+                    raise IdempotencyConflict(key)
+                if row.status_code is not None:
+                    headers = [(name.encode(), value.encode()) for name, value in row.response_headers or []]
+                    return StoredResponse(status_code=row.status_code, headers=headers, body=row.response_body or b"")
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress(key)
+            await asyncio.sleep(self.POLL_SECONDS)
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        async with self.session_maker() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(
+                    status_code=response.status_code,
+                    response_headers=[[name.decode(), value.decode()] for name, value in response.headers],
+                    response_body=response.body,
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                )
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with self.session_maker() as session:
+            await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+            await session.commit()
+
+
+def create_idempotency_store() -> IdempotencyStore:
+    """Store selected by IDEMPOTENCY_BACKEND ("memory" or "postgres")"""
+    options = dict(
+        ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+        wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+        lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS
+    )
+    if settings.IDEMPOTENCY_BACKEND == "postgres":
+        from core.database import async_session_maker
+        return PostgresIdempotencyStore(async_session_maker, **options)
+    if settings.IDEMPOTENCY_BACKEND != "memory":
+        raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {settings.IDEMPOTENCY_BACKEND}")
+    return InMemoryIdempotencyStore(**options)
+
+
+class ResponseRedactor(ABC):
+    """Removes secrets from a response body before it is stored and restores them on replay"""
+
+    @abstractmethod
+    def strip(self, body: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def restore(self, body: bytes) -> bytes:
+        ...
+
+
+class AccessTokenRedactor(ResponseRedactor):
+    """
+    Stores JSON responses with each access token replaced by its subject
+    and issues a fresh token for that subject on replay, so the store
+    never holds a usable credential
+    """
+
+    def __init__(self, token_fields: Iterable[str] = ("access_token", "jwt")):
+        self.token_fields = tuple(token_fields)
+
+    def strip(self, body: bytes) -> bytes:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body
+        if not isinstance(data, dict):
+            return body
+        for name in self.token_fields:
+            if isinstance(data.get(name), str):
+                claims = verify_token(data[name]) or {}
+                data[name] = {"sub": claims.get("sub")}
+        return json.dumps(data).encode()
+
+    def restore(self, body: bytes) -> bytes:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body
+        if not isinstance(data, dict):
+            return body
+        for name in self.token_fields:
+            stripped = data.get(name)
+            if isinstance(stripped, dict):
+                data[name] = create_access_token(data={"sub": stripped["sub"]}) if stripped.get("sub") else None
+        return json.dumps(data).encode()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware replaying the first response for requests that repeat
+    an Idempotency-Key header. Keys are scoped to method, path and the
+    caller's Authorization header; reusing a key with a different body is
+    rejected with 422. 5xx responses are not stored so the client can retry.
+    Response bodies are stored until they expire; routes whose responses
+    carry credentials need a redactor (e.g. AccessTokenRedactor) so the
+    secret is not stored.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, paths: Iterable[str], methods: Iterable[str] = ("POST",),
+                 redactors: Optional[Dict[str, ResponseRedactor]] = None, max_body_bytes: int = MAX_BODY_BYTES):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.store = store
+        self.paths = set(paths)
+        self.methods = set(methods)
+        self.redactors = dict(redactors or {})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            await self._error(scope, receive, send, 400, "Idempotency-Key is too long")
+            return
+
+        body = await self._read_body(receive, self.max_body_bytes)
+        if body is None:
+            await self._error(scope, receive, send, 413, "Request body is too large")
+            return
+        key = hashlib.sha256(b"\0".join([
+            scope["method"].encode(), scope["path"].encode(),
+            headers.get(b"authorization", b""), idempotency_key
+        ])).hexdigest()
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        try:
+            stored = await self.store.reserve(key, fingerprint)
+        except IdempotencyConflict:
+            await self._error(scope, receive, send, 422, "Idempotency-Key was already used with a different request")
+            return
+        except IdempotencyInProgress:
+            await self._error(scope, receive, send, 409, "A request with this Idempotency-Key is still in progress")
+            return
+
+        if stored is not None:
+            redactor = self.redactors.get(scope["path"])
+            await self._replay(send, stored, redactor.restore(stored.body) if redactor else stored.body)
+            return
+
+        await self._run_and_record(scope, receive, send, key, body)
+
+    async def _run_and_record(self, scope, receive, send, key: str, body: bytes) -> None:
+        """Run the route once, forwarding and recording its response"""
+        body_sent = False
+        status_code = None
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def recording_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers.extend(
+                    (name, value) for name, value in message.get("headers", []) if name.lower() in STORED_HEADERS
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, recording_send)
+        except BaseException:
+            await self.store.release(key)
+            raise
+
+        if status_code is None or status_code >= 500:
+            await self.store.release(key)
+        else:
+            body = b"".join(chunks)
+            redactor = self.redactors.get(scope["path"])
+            await self.store.complete(key, StoredResponse(status_code, response_headers, redactor.strip(body) if redactor else body))
+
+    @staticmethod
+    async def _read_body(receive, max_bytes: int) -> Optional[bytes]:
+        """The whole request body, or None once it grows past max_bytes"""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > max_bytes:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(send, stored: StoredResponse, body: bytes) -> None:
+        headers = list(stored.headers) + [
+            (b"content-length", str(len(body)).encode()),
+            (REPLAYED_HEADER, b"true")
+        ]
+        await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _error(scope, receive, send, status_code: int, detail: str) -> None:
+        await JSONResponse({"detail": detail}, status_code=status_code)(scope, receive, send)
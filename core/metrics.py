@@ -0,0 +1,311 @@
+"""
+In-process metrics for She&Soul FastAPI application
+Exported in the Prometheus text format at /metrics, for scrapers holding
+METRICS_TOKEN. Values are per worker process; scrape each worker (or
+aggregate by instance) when running several.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for queries and requests in the millisecond range
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+CHECKOUT_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Named metric with a fixed set of label names"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float, Sequence[str]]]:
+        """(sample name, label values, value, label names) tuples"""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for sample_name, values, value, names in self.samples():
+            lines.append(f"{sample_name}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self):
+        for values, value in sorted(self._values.items()):
+            yield self.name, values, value, self.labelnames
+
+
+class Gauge(Metric):
+    """Current value read from a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 collect: Callable[[], Dict[LabelValues, float]] = dict):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def samples(self):
+        for values, value in sorted(self.collect().items()):
+            yield self.name, values, value, self.labelnames
+
+
+class Histogram(Metric):
+    """Bucketed distribution; observe() is a bisect and three additions"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last one is +Inf), sum, count]
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def total(self, *label_values: str) -> float:
+        series = self._series.get(label_values)
+        return series[1] if series else 0.0
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for values, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", values + (_format_value(bound),), cumulative, names
+            yield f"{self.name}_sum", values, total, self.labelnames
+            yield f"{self.name}_count", values, count, self.labelnames
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+_pools: Dict[str, Callable] = {}
+
+
+def _pool_stats() -> Dict[str, Dict[LabelValues, float]]:
+    stats = {"size": {}, "checked_out": {}, "checked_in": {}, "overflow": {}}
+    for name, get_pool in _pools.items():
+        pool = get_pool()
+        stats["size"][(name,)] = pool.size()
+        stats["checked_out"][(name,)] = pool.checkedout()
+        stats["checked_in"][(name,)] = pool.checkedin()
+        # QueuePool counts overflow from -pool_size until the pool is full
+        stats["overflow"][(name,)] = max(pool.overflow(), 0)
+    return stats
+
+
+POOL_SIZE = registry.register(Gauge(
+    "db_pool_size", "Configured number of pooled connections", ("pool",),
+    lambda: _pool_stats()["size"]
+))
+POOL_CHECKED_OUT = registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ("pool",),
+    lambda: _pool_stats()["checked_out"]
+))
+POOL_CHECKED_IN = registry.register(Gauge(
+    "db_pool_checked_in", "Idle connections in the pool", ("pool",),
+    lambda: _pool_stats()["checked_in"]
+))
+POOL_OVERFLOW = registry.register(Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ("pool",),
+    lambda: _pool_stats()["overflow"]
+))
+POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection, excluding connect time", ("pool",),
+    CHECKOUT_WAIT_BUCKETS
+))
+POOL_CONNECT_DURATION = registry.register(Histogram(
+    "db_pool_connect_seconds", "Time spent opening a new database connection", ("pool",)
+))
+DB_STATEMENT_DURATION = registry.register(Histogram(
+    "db_statement_duration_seconds", "Statement execution time by operation", ("pool", "operation")
+))
+DB_STATEMENT_ERRORS = registry.register(Counter(
+    "db_statement_errors_total", "Statements that raised a database error", ("pool", "operation")
+))
+DB_STATEMENTS_PER_REQUEST = registry.register(Histogram(
+    "db_statements_per_request", "Statements issued while handling one request", ("method", "route"),
+    STATEMENT_COUNT_BUCKETS
+))
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route", "status")
+))
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records checkout wait time, labelled with the engine's
+    pool_logging_name.
+
+    SQLAlchemy has no event before a checkout starts waiting, so the wait
+    is timed around QueuePool._do_get(), a private method: check this
+    class when upgrading SQLAlchemy (tests/test_metrics.py fails if the
+    histogram stops being fed). _do_get() also opens a new connection when
+    the pool grows; instrument_engine() times connects with the public
+    do_connect and connect events, and that time is subtracted here, so
+    db_pool_checkout_wait_seconds is queueing only. Without
+    instrument_engine() the wait includes connect time.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        record = None
+        try:
+            record = super()._do_get()
+            return record
+        finally:
+            connect_seconds = record.info.pop("connect_seconds", 0.0) if record is not None else 0.0
+            POOL_CHECKOUT_WAIT.observe(
+                max(time.perf_counter() - started - connect_seconds, 0.0), self.logging_name or "default"
+            )
+
+
+def statement_operation(statement: str) -> str:
+    """Leading SQL keyword of a statement, used as the operation label"""
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "OTHER"
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Export pool gauges and connect times for an engine (sync or async).
+    Statement timings are recorded by core.query_log.instrument_statements,
+    which shares one set of cursor events with the per-request statement stats.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    _pools[name] = lambda: sync_engine.pool
+
+    @event.listens_for(sync_engine, "do_connect")
+    def start_connect_timer(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine.pool, "connect")
+    def stop_connect_timer(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            seconds = time.perf_counter() - started
+            POOL_CONNECT_DURATION.observe(seconds, name)
+            # Picked up by TimedAsyncQueuePool so checkout wait excludes it
+            connection_record.info["connect_seconds"] = seconds
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def drop_connect_time(dbapi_connection, connection_record, connection_proxy):
+        # Reconnects of recycled connections happen after _do_get(); never carry them over
+        connection_record.info.pop("connect_seconds", None)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing HTTP requests by method, route template and status"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def recording_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code)
+            )
@@ -0,0 +1,100 @@
+"""
+Background connection pool warm-up for She&Soul FastAPI application
+Opens a worker's pooled connections after startup so the first requests do
+not pay for TCP, TLS and authentication to the pooler. Startup does not wait
+for it; readiness reports the state so the load balancer can hold traffic.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+COLD = "cold"
+WARMING = "warming"
+WARM = "warm"
+FAILED = "failed"
+
+
+class PoolWarmer:
+    """
+    Opens `connections` connections at once (so the pool has to create
+    distinct ones), checks each with SELECT 1 and returns them to the pool.
+    A failed attempt is retried up to max_retries times, waiting
+    retry_delay * attempt seconds in between; after that the state is
+    "failed" until start() is called again.
+    """
+
+    def __init__(self, engine, name: str, connections: int, max_retries: int = 3, retry_delay: float = 1.0,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.engine = engine
+        self.name = name
+        self.connections = connections
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._sleep = sleep
+        self.state = COLD
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == WARM
+
+    def start(self) -> asyncio.Task:
+        """Start warming in the background unless already warm or warming"""
+        if self._task is None or (self._task.done() and self.state == FAILED):
+            self.state = WARMING
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self) -> None:
+        self.state = WARMING
+        self.attempts = 0
+        while True:
+            self.attempts += 1
+            try:
+                await self._open_connections()
+            except Exception as e:
+                self.error = str(e)
+                if self.attempts > self.max_retries:
+                    self.state = FAILED
+                    logger.error(f"Pool warm-up for {self.name} failed after {self.attempts} attempts: {e}")
+                    return
+                logger.warning(f"Pool warm-up for {self.name} attempt {self.attempts} failed: {e}")
+                await self._sleep(self.retry_delay * self.attempts)
+            else:
+                self.state = WARM
+                self.error = None
+                logger.info(f"Pool warm-up for {self.name}: {self.connections} connection(s) ready")
+                return
+
+    async def _open_connections(self) -> None:
+        connections = []
+        try:
+            for _ in range(self.connections):
+                connection = await self.engine.connect()
+                connections.append(connection)
+                await connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                await connection.close()
+
+    async def stop(self) -> None:
+        """Cancel a warm-up still in progress (shutdown)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> Dict[str, object]:
+        status = {"state": self.state, "connections": self.connections, "attempts": self.attempts}
+        if self.error:
+            status["error"] = self.error
+        return status
@@ -0,0 +1,147 @@
+"""
+Per-request SQL statement tracking for She&Soul FastAPI application
+Counts and times every statement issued while a request is handled, logs
+slow statements with their normalized SQL and, in debug mode, flags query
+shapes repeated within one request (typically an N+1 lazy load). The same
+timing feeds the db_statement_duration_seconds histogram.
+"""
+
+import logging
+import re
+import time
+from collections import Counter as ShapeCounter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from core.metrics import (
+    DB_STATEMENT_DURATION, DB_STATEMENT_ERRORS, DB_STATEMENTS_PER_REQUEST, statement_operation
+)
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Query shape of a statement: literals and bind parameters become ?,
+    IN lists collapse to (?...) and whitespace is squashed, so the same
+    query with different values normalizes to the same string.
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class RequestQueryStats:
+    """Statements issued by one request; shapes are only counted with track_shapes"""
+    track_shapes: bool = False
+    count: int = 0
+    total_seconds: float = 0.0
+    shapes: ShapeCounter = field(default_factory=ShapeCounter)
+
+    def record(self, statement: str, seconds: float, shape: Optional[str] = None) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if self.track_shapes:
+            self.shapes[shape or normalize_sql(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Query shapes issued at least `threshold` times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Statement stats of the request being handled, if any"""
+    return _current_stats.get()
+
+
+def instrument_statements(engine, name: str, slow_query_seconds: float, record_metrics: bool = True) -> None:
+    """
+    Time every statement on an engine (sync or async) once, for the request
+    stats, the slow-query log and, with record_metrics, the per-pool
+    statement duration and error metrics. Timing uses cursor execute
+    events, so executemany batches count as one statement.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["statement_started"].pop()
+        if record_metrics:
+            DB_STATEMENT_DURATION.observe(seconds, name, statement_operation(statement))
+        stats = _current_stats.get()
+        slow = seconds >= slow_query_seconds
+        # Normalizing is the costly part; only do it when something reads the shape
+        shape = normalize_sql(statement) if slow or (stats is not None and stats.track_shapes) else None
+        if stats is not None:
+            stats.record(statement, seconds, shape)
+        if slow:
+            logger.warning(f"Slow query ({seconds * 1000:.1f} ms): {shape}")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def drop_timer(context):
+        started = context.connection.info.get("statement_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        if record_metrics:
+            DB_STATEMENT_ERRORS.inc(name, statement_operation(context.statement or ""))
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware giving each request its own RequestQueryStats. The
+    statement count feeds the db_statements_per_request histogram; with
+    detect_repeats, shapes issued repeat_threshold or more times are logged
+    as possible N+1 queries and a Server-Timing header reports the totals.
+    """
+
+    def __init__(self, app, detect_repeats: bool = False, repeat_threshold: int = 3):
+        self.app = app
+        self.detect_repeats = detect_repeats
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(track_shapes=self.detect_repeats)
+        token = _current_stats.set(stats)
+
+        async def timing_send(message):
+            if message["type"] == "http.response.start" and self.detect_repeats:
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} statements"'.encode()
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            _current_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            DB_STATEMENTS_PER_REQUEST.observe(stats.count, scope["method"], route)
+            if self.detect_repeats:
+                for shape, count in stats.repeated_shapes(self.repeat_threshold):
+                    logger.warning(f"Possible N+1 in {scope['method']} {route}: {count} x {shape}")
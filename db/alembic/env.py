@@ -0,0 +1,83 @@
+"""
+Alembic environment for She&Soul FastAPI application
+Uses the application's database URL (pooler hints stripped, prepared
+statements disabled behind a transaction pooler) unless -x url=... or
+sqlalchemy.url is given. Sync and async drivers are both supported.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import settings
+from core.database import Base
+from core.db_optimization import detect_pool_mode, driver_url, engine_options, resolve_pool_config
+import db.models  # noqa: F401  (registers every table)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return context.get_x_argument(as_dictionary=True).get("url") or config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def connect_args(url: str) -> dict:
+    """Driver timeouts and, behind a transaction pooler, no named prepared statements"""
+    pool_config = resolve_pool_config(settings.ENVIRONMENT, pool_mode=detect_pool_mode(url, settings.DB_POOL_MODE))
+    return engine_options(pool_config, make_url(url).get_backend_name()).get("connect_args", {})
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting (alembic upgrade head --sql)"""
+    context.configure(
+        url=driver_url(database_url()),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations(url: str) -> None:
+    connectable = create_async_engine(driver_url(url), poolclass=pool.NullPool, connect_args=connect_args(url))
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    url = database_url()
+    if make_url(url).get_dialect().is_async:
+        asyncio.run(run_async_migrations(url))
+        return
+
+    connectable = create_engine(driver_url(url), poolclass=pool.NullPool, connect_args=connect_args(url))
+    with connectable.connect() as connection:
+        do_run_migrations(connection)
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,198 @@
+"""Baseline: the schema as created by the dated SQL scripts in db/migrations
+
+Databases that already have these tables are stamped instead of upgraded:
+alembic stamp 0001_baseline
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 11:45:19.444009
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotency_keys',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('response_headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('response_body', sa.LargeBinary(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_expires_at'), 'idempotency_keys', ['expires_at'], unique=False)
+    op.create_table('mcq_scoring_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('question', sa.String(), nullable=False),
+    sa.Column('answer', sa.String(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('version', 'question', 'answer', name='uq_mcq_scoring_rules_version_question_answer')
+    )
+    op.create_index(op.f('ix_mcq_scoring_rules_version'), 'mcq_scoring_rules', ['version'], unique=False)
+    op.create_table('otps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('otp_code', sa.String(), nullable=False),
+    sa.Column('used', sa.Boolean(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_otps_email'), 'otps', ['email'], unique=False)
+    op.create_index(op.f('ix_otps_id'), 'otps', ['id'], unique=False)
+    op.create_table('risk_rescore_jobs',
+    sa.Column('rules_version', sa.Integer(), nullable=False),
+    sa.Column('last_profile_id', sa.Integer(), nullable=False),
+    sa.Column('processed', sa.Integer(), nullable=False),
+    sa.Column('changed', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('rules_version')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('password', sa.String(), nullable=False),
+    sa.Column('is_email_verified', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('cycle_phase_spans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('phase', sa.String(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cycle_phase_spans_user_id'), 'cycle_phase_spans', ['user_id'], unique=False)
+    op.create_table('cycle_predictions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('next_period_start_date', sa.Date(), nullable=False),
+    sa.Column('next_period_end_date', sa.Date(), nullable=False),
+    sa.Column('next_ovulation_date', sa.Date(), nullable=False),
+    sa.Column('next_fertile_window_start_date', sa.Date(), nullable=False),
+    sa.Column('next_fertile_window_end_date', sa.Date(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_cycle_predictions_next_period_start_date'), 'cycle_predictions', ['next_period_start_date'], unique=False)
+    op.create_table('cycle_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('cycle_count', sa.Integer(), nullable=False),
+    sa.Column('last_period_start_date', sa.Date(), nullable=True),
+    sa.Column('mean_cycle_length', sa.Float(), nullable=True),
+    sa.Column('m2', sa.Float(), nullable=False),
+    sa.Column('regularity_score', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('period_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'start_date', name='uq_period_logs_user_id_start_date')
+    )
+    op.create_index(op.f('ix_period_logs_id'), 'period_logs', ['id'], unique=False)
+    op.create_index(op.f('ix_period_logs_user_id'), 'period_logs', ['user_id'], unique=False)
+    op.create_table('profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('nick_name', sa.String(), nullable=True),
+    sa.Column('user_type', sa.Enum('USER', 'PARTNER', name='usertype'), nullable=False),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Float(), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('referral_code', sa.String(), nullable=True),
+    sa.Column('referred_code', sa.String(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('preferred_service_type', sa.Enum('MENSTRUATION', 'BREAST_HEALTH', 'MENTAL_HEALTH', 'PCOS', name='userservicetype'), nullable=True),
+    sa.Column('period_length', sa.Integer(), nullable=True),
+    sa.Column('cycle_length', sa.Integer(), nullable=True),
+    sa.Column('last_period_start_date', sa.Date(), nullable=True),
+    sa.Column('last_period_end_date', sa.Date(), nullable=True),
+    sa.Column('device_token', sa.Text(), nullable=True),
+    sa.Column('language_code', sa.String(), nullable=True),
+    sa.Column('risk_assessment_mcq_codes', sa.LargeBinary(), nullable=True),
+    sa.Column('risk_assessment_mcq_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('breast_cancer_risk_level', sa.String(), nullable=True),
+    sa.Column('medical_summary', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('referral_code')
+    )
+    op.create_index(op.f('ix_profiles_id'), 'profiles', ['id'], unique=False)
+    op.create_table('risk_assessments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('answer_codes', sa.LargeBinary(), nullable=True),
+    sa.Column('extra_answers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('risk_level', sa.String(), nullable=False),
+    sa.Column('rules_version', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_risk_assessments_user_id_created_at', 'risk_assessments', ['user_id', 'created_at'], unique=False)
+
+    # GiST over (phase, daterange) for PhaseSpanService; PostgreSQL only
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "CREATE INDEX ix_cycle_phase_spans_phase_span ON cycle_phase_spans "
+            "USING gist (phase, daterange(start_date, end_date, '[]'))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_risk_assessments_user_id_created_at', table_name='risk_assessments')
+    op.drop_table('risk_assessments')
+    op.drop_index(op.f('ix_profiles_id'), table_name='profiles')
+    op.drop_table('profiles')
+    op.drop_index(op.f('ix_period_logs_user_id'), table_name='period_logs')
+    op.drop_index(op.f('ix_period_logs_id'), table_name='period_logs')
+    op.drop_table('period_logs')
+    op.drop_table('cycle_stats')
+    op.drop_index(op.f('ix_cycle_predictions_next_period_start_date'), table_name='cycle_predictions')
+    op.drop_table('cycle_predictions')
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_cycle_phase_spans_phase_span")
+    op.drop_index(op.f('ix_cycle_phase_spans_user_id'), table_name='cycle_phase_spans')
+    op.drop_table('cycle_phase_spans')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_table('risk_rescore_jobs')
+    op.drop_index(op.f('ix_otps_id'), table_name='otps')
+    op.drop_index(op.f('ix_otps_email'), table_name='otps')
+    op.drop_table('otps')
+    op.drop_index(op.f('ix_mcq_scoring_rules_version'), table_name='mcq_scoring_rules')
+    op.drop_table('mcq_scoring_rules')
+    op.drop_index(op.f('ix_idempotency_keys_expires_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
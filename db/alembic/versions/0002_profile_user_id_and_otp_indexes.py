@@ -0,0 +1,67 @@
+"""Index profiles.user_id (unique, one profile per user) and otps (email, created_at)
+
+profiles.user_id is a foreign key every AppService lookup filters on, and
+had no index. OTP lookups filter by email and read the newest code first;
+the composite index replaces the email-only one. On PostgreSQL the indexes
+are built CONCURRENTLY so the tables stay writable; IF [NOT] EXISTS makes
+the revision safe on databases where they were added by hand. A failed
+concurrent build leaves an INVALID index behind, which IF NOT EXISTS
+would keep, so invalid leftovers are dropped before each build. The unique
+index fails if a user already has two profiles; resolve those rows first:
+SELECT user_id FROM profiles GROUP BY user_id HAVING count(*) > 1;
+
+Revision ID: 0002_profile_user_id_and_otp_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_profile_user_id_and_otp_indexes'
+down_revision: Union[str, Sequence[str], None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_invalid_index(name: str) -> None:
+    """Drop the index left INVALID by an interrupted CREATE INDEX CONCURRENTLY"""
+    if op.get_context().as_sql or op.get_bind().dialect.name != 'postgresql':
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+        "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+    ), {'name': name}).first()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        _drop_invalid_index('ix_profiles_user_id')
+        _drop_invalid_index('ix_otps_email_created_at')
+        op.create_index(
+            'ix_profiles_user_id', 'profiles', ['user_id'], unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_otps_email_created_at', 'otps', ['email', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_otps_email', table_name='otps', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        _drop_invalid_index('ix_otps_email')
+        op.create_index(
+            'ix_otps_email', 'otps', ['email'], postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_otps_email_created_at', table_name='otps', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_profiles_user_id', table_name='profiles', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,59 @@
+"""Add mcq_answer_codes, the append-only code table of MCQ answers
+
+Seeded with the codes assigned before the table existed (MCQ_VOCABULARY in
+services/mcq_codec.py at this revision). Answers first seen later get the
+next free code of their question. Afterwards, re-run
+python -m scripts.encode_mcq_answers to move answers kept in the JSONB
+extras to codes.
+
+Revision ID: 0003_mcq_answer_codes
+Revises: 0002_profile_user_id_and_otp_indexes
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_mcq_answer_codes'
+down_revision: Union[str, Sequence[str], None] = '0002_profile_user_id_and_otp_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEED_CODES = {
+    'menstruation_start_age': ('MENSTRUATION_START_LT_12',),
+    'menopause_status': ('MENOPAUSE_YES_GT_55',),
+    'pregnancy_history': ('PREGNANCY_NO',),
+    'breastfeeding_history': ('BREASTFED_NO', 'BREASTFED_NA', 'BREASTFED_YES_GT_6MO'),
+    'alcohol_use': ('ALCOHOL_WEEKLY', 'ALCOHOL_DAILY'),
+    'smoking_status': ('SMOKING_OCCASIONALLY', 'SMOKING_REGULARLY'),
+    'hrt_use': ('HRT_YES_LT_5Y', 'HRT_YES_GT_5Y'),
+    'oral_contraceptives_use': ('OC_YES_LT_5Y', 'OC_YES_GT_5Y'),
+    'family_history': ('YES_FIRST_DEGREE',),
+    'personal_history_biopsy': ('YES_ATYPICAL_HYPERPLASIA',),
+    'age_group': ('AGE_50_PLUS',),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    codes = op.create_table('mcq_answer_codes',
+    sa.Column('question', sa.String(), nullable=False),
+    sa.Column('code', sa.SmallInteger(), autoincrement=False, nullable=False),
+    sa.Column('answer', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('question', 'code'),
+    sa.UniqueConstraint('question', 'answer', name='uq_mcq_answer_codes_question_answer')
+    )
+    op.bulk_insert(codes, [
+        {'question': question, 'code': code, 'answer': answer}
+        for question, answers in SEED_CODES.items()
+        for code, answer in enumerate(answers, start=1)
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('mcq_answer_codes')
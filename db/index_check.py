@@ -0,0 +1,43 @@
+"""
+Foreign key index check for She&Soul FastAPI application
+PostgreSQL does not index foreign key columns by itself: lookups and joins
+on them, and cascading deletes from the parent, scan the child table. Every
+foreign key must be the leading column(s) of an index, a unique constraint
+or the primary key.
+"""
+
+from typing import List, Tuple
+
+from sqlalchemy import Column, MetaData, Table
+
+
+def _leading_columns(columns) -> Tuple[str, ...]:
+    names = []
+    for column in columns:
+        if not isinstance(column, Column):
+            break
+        names.append(column.name)
+    return tuple(names)
+
+
+def _covering_prefixes(table: Table) -> List[Tuple[str, ...]]:
+    prefixes = [_leading_columns(table.primary_key.columns)]
+    prefixes.extend(_leading_columns(index.expressions) for index in table.indexes)
+    prefixes.extend(
+        _leading_columns(constraint.columns)
+        for constraint in table.constraints
+        if constraint.__visit_name__ == "unique_constraint"
+    )
+    return prefixes
+
+
+def unindexed_foreign_keys(metadata: MetaData) -> List[Tuple[str, Tuple[str, ...]]]:
+    """(table, foreign key columns) pairs not covered by any index, sorted"""
+    missing = []
+    for table in metadata.tables.values():
+        prefixes = _covering_prefixes(table)
+        for foreign_key in table.foreign_key_constraints:
+            columns = tuple(column.name for column in foreign_key.columns)
+            if not any(set(prefix[:len(columns)]) == set(columns) for prefix in prefixes):
+                missing.append((table.name, columns))
+    return sorted(missing)
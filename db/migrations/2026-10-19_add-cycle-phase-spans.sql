@@ -0,0 +1,25 @@
+-- Migration: Add cycle_phase_spans with a GiST index for "who is in phase X on date D"
+-- This script is idempotent and safe to re-run.
+
+-- 1) btree_gist lets the GiST index combine the phase equality with the range
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- 2) One row per materialized phase run per user (inclusive dates)
+CREATE TABLE IF NOT EXISTS public.cycle_phase_spans (
+  id serial PRIMARY KEY,
+  user_id integer NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  phase varchar NOT NULL,
+  start_date date NOT NULL,
+  end_date date NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_cycle_phase_spans_user_id
+  ON public.cycle_phase_spans (user_id);
+
+-- 3) Must match span_range() in db/models/cycle_phase_span.py exactly
+CREATE INDEX IF NOT EXISTS ix_cycle_phase_spans_phase_span
+  ON public.cycle_phase_spans USING gist (phase, daterange(start_date, end_date, '[]'));
+
+-- 4) Optional: check the lookup uses the index
+-- EXPLAIN SELECT user_id FROM public.cycle_phase_spans
+-- WHERE phase = 'OVULATION' AND daterange(start_date, end_date, '[]') @> CURRENT_DATE;
@@ -0,0 +1,16 @@
+-- Migration: Add cycle_predictions, the bulk-refreshed next-cycle prediction per user
+-- This script is idempotent and safe to re-run.
+
+CREATE TABLE IF NOT EXISTS public.cycle_predictions (
+  user_id integer PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+  next_period_start_date date NOT NULL,
+  next_period_end_date date NOT NULL,
+  next_ovulation_date date NOT NULL,
+  next_fertile_window_start_date date NOT NULL,
+  next_fertile_window_end_date date NOT NULL,
+  computed_at timestamp NOT NULL DEFAULT now()
+);
+
+-- Reminder jobs select upcoming periods by date
+CREATE INDEX IF NOT EXISTS ix_cycle_predictions_next_period_start_date
+  ON public.cycle_predictions (next_period_start_date);
@@ -0,0 +1,16 @@
+-- Migration: Add idempotency_keys, the shared store behind the Idempotency-Key header
+-- This script is idempotent and safe to re-run.
+
+CREATE TABLE IF NOT EXISTS public.idempotency_keys (
+  key varchar(64) PRIMARY KEY,
+  fingerprint varchar(64) NOT NULL,
+  status_code integer NULL,
+  response_headers jsonb NULL,
+  response_body bytea NULL,
+  created_at timestamp NOT NULL,
+  expires_at timestamp NOT NULL
+);
+
+-- Expired keys are deleted in bulk by expires_at
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at
+  ON public.idempotency_keys (expires_at);
@@ -0,0 +1,7 @@
+-- Migration: Add risk_assessment_mcq_codes, the compact one-byte-per-question MCQ answers
+-- This script is idempotent and safe to re-run.
+-- Existing rows keep reading from risk_assessment_mcq_data until
+-- `python -m scripts.encode_mcq_answers` moves them to the codes column.
+
+ALTER TABLE public.profiles
+  ADD COLUMN IF NOT EXISTS risk_assessment_mcq_codes bytea NULL;
@@ -0,0 +1,35 @@
+-- Migration: Add mcq_scoring_rules, the versioned weights of the MCQ risk score
+-- This script is idempotent and safe to re-run.
+
+CREATE TABLE IF NOT EXISTS public.mcq_scoring_rules (
+  id serial PRIMARY KEY,
+  version integer NOT NULL,
+  question varchar NOT NULL,
+  answer varchar NOT NULL,
+  weight integer NOT NULL,
+  CONSTRAINT uq_mcq_scoring_rules_version_question_answer UNIQUE (version, question, answer)
+);
+
+CREATE INDEX IF NOT EXISTS ix_mcq_scoring_rules_version
+  ON public.mcq_scoring_rules (version);
+
+-- Version 1: the rules of the Java implementation
+INSERT INTO public.mcq_scoring_rules (version, question, answer, weight) VALUES
+  (1, 'menstruation_start_age', 'MENSTRUATION_START_LT_12', 1),
+  (1, 'menopause_status', 'MENOPAUSE_YES_GT_55', 2),
+  (1, 'pregnancy_history', 'PREGNANCY_NO', 1),
+  (1, 'breastfeeding_history', 'BREASTFED_NO', 1),
+  (1, 'breastfeeding_history', 'BREASTFED_NA', 1),
+  (1, 'breastfeeding_history', 'BREASTFED_YES_GT_6MO', -1),
+  (1, 'alcohol_use', 'ALCOHOL_WEEKLY', 1),
+  (1, 'alcohol_use', 'ALCOHOL_DAILY', 2),
+  (1, 'smoking_status', 'SMOKING_OCCASIONALLY', 1),
+  (1, 'smoking_status', 'SMOKING_REGULARLY', 2),
+  (1, 'hrt_use', 'HRT_YES_LT_5Y', 1),
+  (1, 'hrt_use', 'HRT_YES_GT_5Y', 2),
+  (1, 'oral_contraceptives_use', 'OC_YES_LT_5Y', 1),
+  (1, 'oral_contraceptives_use', 'OC_YES_GT_5Y', 2),
+  (1, 'family_history', 'YES_FIRST_DEGREE', 5),
+  (1, 'personal_history_biopsy', 'YES_ATYPICAL_HYPERPLASIA', 4),
+  (1, 'age_group', 'AGE_50_PLUS', 4)
+ON CONFLICT (version, question, answer) DO NOTHING;
@@ -0,0 +1,33 @@
+-- Migration: Add menstrual history (period_logs) and per-user cycle statistics (cycle_stats)
+-- This script is idempotent and safe to re-run.
+
+-- 1) Append-only period history, one row per logged period start
+CREATE TABLE IF NOT EXISTS public.period_logs (
+  id serial PRIMARY KEY,
+  user_id integer NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  start_date date NOT NULL,
+  end_date date NULL,
+  created_at timestamp NOT NULL DEFAULT now(),
+  CONSTRAINT uq_period_logs_user_id_start_date UNIQUE (user_id, start_date)
+);
+
+CREATE INDEX IF NOT EXISTS ix_period_logs_id ON public.period_logs (id);
+CREATE INDEX IF NOT EXISTS ix_period_logs_user_id ON public.period_logs (user_id);
+
+-- 2) Running cycle-length statistics, updated incrementally on every insert
+CREATE TABLE IF NOT EXISTS public.cycle_stats (
+  user_id integer PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+  cycle_count integer NOT NULL DEFAULT 0,
+  last_period_start_date date NULL,
+  mean_cycle_length double precision NULL,
+  m2 double precision NOT NULL DEFAULT 0,
+  regularity_score double precision NULL,
+  updated_at timestamp NOT NULL DEFAULT now()
+);
+
+-- 3) Optional: seed history from the single date currently stored on profiles
+-- INSERT INTO public.period_logs (user_id, start_date, end_date)
+-- SELECT user_id, last_period_start_date, last_period_end_date
+-- FROM public.profiles
+-- WHERE last_period_start_date IS NOT NULL
+-- ON CONFLICT (user_id, start_date) DO NOTHING;
@@ -0,0 +1,28 @@
+-- Migration: Add risk_assessments (append-only MCQ assessment history) and
+-- risk_rescore_jobs (checkpoints of the rescoring job per rule version)
+-- This script is idempotent and safe to re-run.
+
+CREATE TABLE IF NOT EXISTS public.risk_assessments (
+  id serial PRIMARY KEY,
+  user_id integer NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+  answer_codes bytea NULL,
+  extra_answers jsonb NULL,
+  score integer NOT NULL,
+  risk_level varchar NOT NULL,
+  rules_version integer NOT NULL,
+  source varchar NOT NULL DEFAULT 'SUBMISSION',
+  created_at timestamp NOT NULL DEFAULT now()
+);
+
+-- History of one user, newest last
+CREATE INDEX IF NOT EXISTS ix_risk_assessments_user_id_created_at
+  ON public.risk_assessments (user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS public.risk_rescore_jobs (
+  rules_version integer PRIMARY KEY,
+  last_profile_id integer NOT NULL DEFAULT 0,
+  processed integer NOT NULL DEFAULT 0,
+  changed integer NOT NULL DEFAULT 0,
+  started_at timestamp NOT NULL DEFAULT now(),
+  finished_at timestamp NULL
+);
@@ -1 +1,6 @@
-# Models package 
\ No newline at end of file
+# Models package: importing it registers every table on Base.metadata
+# (Alembic autogenerate and the foreign key index check rely on this)
+from db.models import (  # noqa: F401
+    user, profile, otp, period_log, cycle_prediction, cycle_phase_span,
+    risk_rule, risk_assessment, idempotency_key, mcq_answer_code
+)
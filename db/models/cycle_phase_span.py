@@ -0,0 +1,35 @@
+"""
+Cycle phase span model for She&Soul FastAPI application
+"""
+
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, func, literal_column
+from core.database import Base
+
+class CyclePhaseSpan(Base):
+    """
+    Materialized phase interval for a user (one row per phase run).
+    Date-range lookups go through a GiST index on
+    daterange(start_date, end_date, '[]'), see PhaseSpanService.
+    """
+    __tablename__ = "cycle_phase_spans"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    phase = Column(String, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    
+    def __repr__(self):
+        return f"<CyclePhaseSpan(user_id={self.user_id}, phase='{self.phase}', {self.start_date}..{self.end_date})>"
+
+def span_range(start_date, end_date):
+    """Inclusive daterange expression matching the GiST index definition"""
+    return func.daterange(start_date, end_date, literal_column("'[]'"))
+
+# GiST over (phase, daterange) needs the btree_gist extension; PostgreSQL only
+Index(
+    "ix_cycle_phase_spans_phase_span",
+    CyclePhaseSpan.phase,
+    span_range(CyclePhaseSpan.start_date, CyclePhaseSpan.end_date),
+    postgresql_using="gist"
+).ddl_if(dialect="postgresql")
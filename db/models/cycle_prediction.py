@@ -0,0 +1,24 @@
+"""
+Precomputed cycle prediction model for She&Soul FastAPI application
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from core.database import Base
+
+class CyclePrediction(Base):
+    """Next-cycle prediction per user, refreshed in bulk for reminders and analytics"""
+    __tablename__ = "cycle_predictions"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    next_period_start_date = Column(Date, nullable=False, index=True)
+    next_period_end_date = Column(Date, nullable=False)
+    next_ovulation_date = Column(Date, nullable=False)
+    next_fertile_window_start_date = Column(Date, nullable=False)
+    next_fertile_window_end_date = Column(Date, nullable=False)
+    
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<CyclePrediction(user_id={self.user_id}, next_period_start_date='{self.next_period_start_date}')>"
@@ -0,0 +1,23 @@
+"""
+Idempotency key model for She&Soul FastAPI application
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from core.database import Base
+
+class IdempotencyKey(Base):
+    """First response recorded for an Idempotency-Key (status_code is null while in flight)"""
+    __tablename__ = "idempotency_keys"
+    
+    # SHA-256 of method, path, caller and client key
+    key = Column(String(64), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response_headers = Column(JSONB)
+    response_body = Column(LargeBinary)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.key}', status_code={self.status_code})>"
@@ -0,0 +1,23 @@
+"""
+MCQ answer code model for She&Soul FastAPI application
+"""
+
+from sqlalchemy import Column, SmallInteger, String, UniqueConstraint
+from core.database import Base
+
+class McqAnswerCode(Base):
+    """
+    Append-only code of one MCQ answer; profiles store one such code per
+    question in risk_assessment_mcq_codes (see services/mcq_codec.py)
+    """
+    __tablename__ = "mcq_answer_codes"
+    __table_args__ = (
+        UniqueConstraint("question", "answer", name="uq_mcq_answer_codes_question_answer"),
+    )
+
+    question = Column(String, primary_key=True)
+    code = Column(SmallInteger, primary_key=True, autoincrement=False)
+    answer = Column(String, nullable=False)
+
+    def __repr__(self):
+        return f"<McqAnswerCode({self.question}={self.answer}, code={self.code})>"
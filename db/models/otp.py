@@ -2,15 +2,19 @@
 OTP model for She&Soul FastAPI application
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
 from core.database import Base
 
 class Otp(Base):
     """OTP model for email verification"""
     __tablename__ = "otps"
+    __table_args__ = (
+        # Lookups filter by email and take the newest code first
+        Index("ix_otps_email_created_at", "email", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, nullable=False, index=True)
+    email = Column(String, nullable=False)
     otp_code = Column(String, nullable=False)
     used = Column(Boolean, default=False)
     expires_at = Column(DateTime, nullable=False)
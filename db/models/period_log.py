@@ -0,0 +1,47 @@
+"""
+Menstrual history models for She&Soul FastAPI application
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, Float, ForeignKey, UniqueConstraint
+from core.database import Base
+
+class PeriodLog(Base):
+    """One logged period per row (append-only menstrual history)"""
+    __tablename__ = "period_logs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "start_date", name="uq_period_logs_user_id_start_date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<PeriodLog(id={self.id}, user_id={self.user_id}, start_date='{self.start_date}')>"
+
+class CycleStats(Base):
+    """
+    Running cycle-length statistics per user, maintained incrementally
+    (Welford) on every period log insert so predictions never rescan history
+    """
+    __tablename__ = "cycle_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Number of cycle lengths folded into the statistics
+    cycle_count = Column(Integer, nullable=False, default=0)
+    last_period_start_date = Column(Date)
+    
+    mean_cycle_length = Column(Float)
+    # Sum of squared deviations from the mean
+    m2 = Column(Float, nullable=False, default=0.0)
+    # 1 / (1 + standard deviation in days): 1.0 means perfectly regular
+    regularity_score = Column(Float)
+    
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<CycleStats(user_id={self.user_id}, cycle_count={self.cycle_count}, mean={self.mean_cycle_length})>"
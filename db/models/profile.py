@@ -2,7 +2,7 @@
 Profile model for She&Soul FastAPI application
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, Date, Float, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, Date, Float, ForeignKey, Enum, Text, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 import enum
@@ -37,8 +37,8 @@ class Profile(Base):
     referral_code = Column(String, unique=True)
     referred_code = Column(String)
     
-    # Foreign key to user
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Foreign key to user (one profile per user; every AppService lookup filters on it)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
     
     # Service preferences
     preferred_service_type = Column(Enum(UserServiceType))
@@ -53,7 +53,10 @@ class Profile(Base):
     device_token = Column(Text)
     language_code = Column(String)
     
-    # Risk assessment data (JSONB for PostgreSQL)
+    # Risk assessment data: one code per question (mcq_answer_codes, see
+    # services/mcq_codec.py); answers to unknown questions and free text are
+    # kept verbatim in the JSONB column
+    risk_assessment_mcq_codes = Column(LargeBinary)
     risk_assessment_mcq_data = Column(JSONB)
     breast_cancer_risk_level = Column(String)
     
@@ -0,0 +1,47 @@
+"""
+Risk assessment history models for She&Soul FastAPI application
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from core.database import Base
+
+class RiskAssessment(Base):
+    """
+    One scored MCQ assessment per row (append-only). Submissions and
+    rescoring runs both append; profiles keep the latest level.
+    """
+    __tablename__ = "risk_assessments"
+    __table_args__ = (
+        Index("ix_risk_assessments_user_id_created_at", "user_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Same encoding as profiles.risk_assessment_mcq_codes / _data
+    answer_codes = Column(LargeBinary)
+    extra_answers = Column(JSONB)
+    score = Column(Integer, nullable=False)
+    risk_level = Column(String, nullable=False)
+    rules_version = Column(Integer, nullable=False)
+    source = Column(String, nullable=False, default="SUBMISSION")
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<RiskAssessment(id={self.id}, user_id={self.user_id}, risk_level='{self.risk_level}', rules_version={self.rules_version})>"
+
+class RiskRescoreJob(Base):
+    """Checkpoint of the rescoring run for one rule version"""
+    __tablename__ = "risk_rescore_jobs"
+    
+    rules_version = Column(Integer, primary_key=True)
+    # Keyset position: profiles are rescored in profiles.id order
+    last_profile_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<RiskRescoreJob(rules_version={self.rules_version}, processed={self.processed}, finished_at='{self.finished_at}')>"
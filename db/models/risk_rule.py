@@ -0,0 +1,22 @@
+"""
+MCQ risk scoring rule model for She&Soul FastAPI application
+"""
+
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from core.database import Base
+
+class McqScoringRule(Base):
+    """One weighted (question, answer) pair of a versioned MCQ scoring rule set"""
+    __tablename__ = "mcq_scoring_rules"
+    __table_args__ = (
+        UniqueConstraint("version", "question", "answer", name="uq_mcq_scoring_rules_version_question_answer"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, index=True)
+    question = Column(String, nullable=False)
+    answer = Column(String, nullable=False)
+    weight = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<McqScoringRule(version={self.version}, {self.question}={self.answer}, weight={self.weight})>"
@@ -0,0 +1,87 @@
+"""
+Hot-path queries for She&Soul FastAPI application
+The lookups issued on most requests, built once at import time with bound
+parameters instead of a fresh select() per call, and loading only the
+columns their callers use. Unloaded columns raise on access (load_only with
+raiseload) rather than lazy-loading, which an AsyncSession cannot do; in
+particular the JSONB/binary risk assessment and medical summary columns are
+never fetched by these queries but can still be assigned.
+"""
+
+from typing import Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from db.models.user import User
+from db.models.profile import Profile
+
+# Authenticated user (get_current_user, email verification): everything but the hash
+USER_BY_EMAIL = (
+    select(User)
+    .options(load_only(User.id, User.email, User.is_email_verified, raiseload=True))
+    .where(User.email == bindparam("email"))
+)
+
+# Login: the hash is needed to verify the password
+USER_CREDENTIALS_BY_EMAIL = (
+    select(User)
+    .options(load_only(User.id, User.email, User.password, User.is_email_verified, raiseload=True))
+    .where(User.email == bindparam("email"))
+)
+
+USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+
+# Profile entity for updates; the large JSONB/binary columns are not loaded
+PROFILE_FOR_UPDATE_BY_USER_ID = (
+    select(Profile)
+    .options(load_only(
+        Profile.id, Profile.user_id, Profile.name, Profile.user_type, Profile.referral_code,
+        Profile.referred_code, Profile.language_code, Profile.breast_cancer_risk_level,
+        raiseload=True
+    ))
+    .where(Profile.user_id == bindparam("user_id"))
+)
+
+PROFILE_ID_BY_USER_ID = select(Profile.id).where(Profile.user_id == bindparam("user_id"))
+
+PROFILE_ID_BY_REFERRAL_CODE = select(Profile.id).where(Profile.referral_code == bindparam("referral_code"))
+
+# Partner view of the referring user
+PROFILE_NAME_BY_REFERRAL_CODE = (
+    select(Profile.user_id, Profile.name)
+    .where(Profile.referral_code == bindparam("referral_code"))
+)
+
+
+async def user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """User without the password hash"""
+    return await db.scalar(USER_BY_EMAIL, {"email": email})
+
+
+async def user_credentials_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """User with the password hash, for login"""
+    return await db.scalar(USER_CREDENTIALS_BY_EMAIL, {"email": email})
+
+
+async def user_id_by_email(db: AsyncSession, email: str) -> Optional[int]:
+    return await db.scalar(USER_ID_BY_EMAIL, {"email": email})
+
+
+async def profile_for_update(db: AsyncSession, user_id: int) -> Optional[Profile]:
+    """Profile entity to modify; blob columns are assignable but not loaded"""
+    return await db.scalar(PROFILE_FOR_UPDATE_BY_USER_ID, {"user_id": user_id})
+
+
+async def profile_id_by_user_id(db: AsyncSession, user_id: int) -> Optional[int]:
+    return await db.scalar(PROFILE_ID_BY_USER_ID, {"user_id": user_id})
+
+
+async def profile_id_by_referral_code(db: AsyncSession, referral_code: str) -> Optional[int]:
+    return await db.scalar(PROFILE_ID_BY_REFERRAL_CODE, {"referral_code": referral_code})
+
+
+async def profile_name_by_referral_code(db: AsyncSession, referral_code: str):
+    """(user_id, name) row of the profile owning a referral code, or None"""
+    return (await db.execute(PROFILE_NAME_BY_REFERRAL_CODE, {"referral_code": referral_code})).first()
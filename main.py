@@ -4,17 +4,25 @@ Cursor Auto Mode Active — Running on OpenAI GPT-4
 She&Soul FastAPI Backend - Migrated from Java Spring Boot
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
+import hmac
 import logging
 from loguru import logger
 import sys
+from typing import Optional
 
 from core.config import settings
-from core.database import engine, Base, test_db_connection, check_db_health
+from core.database import engine, replica_engine, pool_config, Base, test_db_connection, check_db_health
+from core.db_optimization import DATABASE_OPTIMIZATION_CONFIG, format_pool_report
+from core.idempotency import AccessTokenRedactor, IdempotencyMiddleware, create_idempotency_store
+from core.pool_warmup import PoolWarmer
+from core.metrics import CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from core.query_log import QueryStatsMiddleware
 from api.routes import auth, app as app_router, chat, article, dashboard, pcos, report
 from core.security import get_current_user
 
@@ -23,21 +31,41 @@ logging.basicConfig(level=logging.INFO)
 logger.remove()
 logger.add(sys.stdout, level=logging.INFO, format="{time} | {level} | {message}")
 
+# Open each pool's connections after startup without delaying it
+warmup_connections = min(settings.DB_WARMUP_CONNECTIONS or pool_config["pool_size"], pool_config["pool_size"])
+pool_warmers = [
+    PoolWarmer(
+        pool_engine, name, warmup_connections,
+        max_retries=DATABASE_OPTIMIZATION_CONFIG["max_retries"],
+        retry_delay=DATABASE_OPTIMIZATION_CONFIG["retry_delay"]
+    )
+    for name, pool_engine in (("primary", engine), ("replica", replica_engine))
+    if pool_engine is not None
+]
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan events - emergency fast startup mode"""
+    """Application lifespan events - fast startup, pool warmed in the background"""
     # Startup
     logger.info("Starting She&Soul FastAPI application...")
-    logger.info("EMERGENCY MODE: Skipping database connection test for fast startup")
+    logger.info(format_pool_report(pool_config))
+    if settings.DB_WARMUP_ENABLED:
+        for warmer in pool_warmers:
+            warmer.start()
+        logger.info(f"Warming database pool(s) in the background ({warmup_connections} connection(s) each)")
     logger.info("Application startup complete")
     yield
     
     # Shutdown
     logger.info("Shutting down She&Soul FastAPI application...")
+    for warmer in pool_warmers:
+        await warmer.stop()
     
     # Close database engine
     try:
         await engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
@@ -52,6 +80,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Replay responses of retried writes that carry an Idempotency-Key header.
+# Added first so CORS wraps it: replays and its own 409/422 responses get
+# the same Access-Control-* headers as a fresh response. Signup responses
+# are stored without their token; a replay gets a freshly issued one.
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=create_idempotency_store(),
+    paths=["/api/signup", "/api/profile", "/api/mcq-risk-assessment"],
+    redactors={"/api/signup": AccessTokenRedactor()}
+)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -67,6 +106,17 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure based on your deployment environment
 )
 
+# Per-request statement counts; N+1 warnings and Server-Timing in debug mode
+app.add_middleware(
+    QueryStatsMiddleware,
+    detect_repeats=settings.DEBUG,
+    repeat_threshold=settings.N_PLUS_ONE_THRESHOLD
+)
+
+# Time every request by route template (outermost, so it sees the full latency)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(auth.router, prefix="/api", tags=["Authentication"])
 app.include_router(app_router.router, prefix="/api", tags=["App"])
@@ -113,6 +163,27 @@ async def database_health():
             "timestamp": "2025-08-03T06:50:00Z"
         }
 
+@app.get("/health/ready")
+async def readiness():
+    """Readiness for the load balancer: 503 until the database pool is warm"""
+    pools = {warmer.name: warmer.status() for warmer in pool_warmers}
+    if not settings.DB_WARMUP_ENABLED or all(warmer.ready for warmer in pool_warmers):
+        return {"status": "ready", "pools": pools}
+
+    # Retry a warm-up that gave up, so readiness recovers once the database does
+    for warmer in pool_warmers:
+        warmer.start()
+    return JSONResponse(status_code=503, content={"status": "not_ready", "pools": pools})
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(default=None)):
+    """Pool, statement and request metrics in the Prometheus text format, for holders of METRICS_TOKEN"""
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    return Response(content=metrics_registry.render(), media_type=CONTENT_TYPE)
+
 @app.get("/protected")
 async def protected_route(current_user = Depends(get_current_user)):
     """Protected route example"""
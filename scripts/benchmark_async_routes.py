@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the async request path
+Serves the same profile read from two in-process apps at a fixed pool size
+of 5 connections: sync `def` routes on a sync Session (run in the threadpool)
+and async routes on an AsyncSession. Each request authenticates the user and
+reads the profile, and every query pays a simulated network round trip via
+a pg_sleep() function registered on the SQLite connection. Every tenth
+request goes to a route that needs no database, to show whether requests
+waiting for a pooled connection hold up unrelated work:
+python -m scripts.benchmark_async_routes [requests] [concurrency] [latency_ms]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.database import Base
+from db.models.user import User
+from db.models.profile import Profile, UserType
+
+POOL_SIZE = 5
+USERS = 100
+# Every PING_EVERY-th request skips the database
+PING_EVERY = 10
+
+def register_latency(engine, latency_seconds: float) -> None:
+    """Make every query sleep like a round trip to a remote server"""
+    @event.listens_for(engine, "connect")
+    def add_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("pg_sleep", 1, lambda seconds: time.sleep(seconds) or 0)
+
+def profile_query(user_id: int, latency_seconds: float):
+    return (
+        select(Profile.id, Profile.name, Profile.user_type, func.pg_sleep(latency_seconds))
+        .where(Profile.user_id == user_id)
+    )
+
+def user_query(user_id: int, latency_seconds: float):
+    return select(User.id, func.pg_sleep(latency_seconds)).where(User.id == user_id)
+
+def seed(path: str) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def set_wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(engine, tables=[User.__table__, Profile.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "password": "hashed", "is_email_verified": True}
+            for i in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Profile), [
+            {"user_id": i, "name": f"User {i}", "user_type": UserType.USER}
+            for i in range(1, USERS + 1)
+        ])
+    engine.dispose()
+
+def threadpool_app(path: str, latency_seconds: float):
+    """Previous design: sync handlers and a sync Session per request"""
+    engine = create_engine(
+        f"sqlite:///{path}", pool_size=POOL_SIZE, max_overflow=0,
+        connect_args={"check_same_thread": False}
+    )
+    register_latency(engine, latency_seconds)
+    session_maker = sessionmaker(bind=engine)
+
+    def get_db():
+        with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.get("/profile/{user_id}")
+    def get_profile(user_id: int, db: Session = Depends(get_db)):
+        db.execute(user_query(user_id, latency_seconds)).first()
+        row = db.execute(profile_query(user_id, latency_seconds)).first()
+        return {"id": row.id, "name": row.name}
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    return app, engine.dispose
+
+def async_app(path: str, latency_seconds: float):
+    """Current design: async handlers on an AsyncSession"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=POOL_SIZE, max_overflow=0)
+    register_latency(engine.sync_engine, latency_seconds)
+    session_maker = async_sessionmaker(engine)
+
+    async def get_db():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.get("/profile/{user_id}")
+    async def get_profile(user_id: int, db: AsyncSession = Depends(get_db)):
+        (await db.execute(user_query(user_id, latency_seconds))).first()
+        row = (await db.execute(profile_query(user_id, latency_seconds))).first()
+        return {"id": row.id, "name": row.name}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app, engine.dispose
+
+async def load(app, requests: int, concurrency: int):
+    """Fire requests with at most `concurrency` in flight; return latencies per route and peak thread count"""
+    latencies = {"profile": [], "ping": []}
+    peak_threads = threading.active_count()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(client, i):
+        nonlocal peak_threads
+        route = "ping" if i % PING_EVERY == PING_EVERY - 1 else "profile"
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("/ping" if route == "ping" else f"/profile/{i % USERS + 1}")
+            latencies[route].append(time.perf_counter() - started)
+            peak_threads = max(peak_threads, threading.active_count())
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await one(client, 0)  # warm the pool
+        latencies["profile"].clear()
+        started = time.perf_counter()
+        await asyncio.gather(*[one(client, i) for i in range(requests)])
+        elapsed = time.perf_counter() - started
+    return elapsed, {route: sorted(values) for route, values in latencies.items()}, peak_threads
+
+def percentile(values, fraction: float) -> float:
+    return values[min(int(len(values) * fraction), len(values) - 1)] * 1000
+
+def measure(build, path: str, label: str, requests: int, concurrency: int, latency_seconds: float) -> float:
+    app, dispose = build(path, latency_seconds)
+    elapsed, latencies, peak_threads = asyncio.run(load(app, requests, concurrency))
+    if asyncio.iscoroutinefunction(dispose):
+        asyncio.run(dispose())
+    else:
+        dispose()
+    profile, ping = latencies["profile"], latencies["ping"]
+    print(
+        f"{label:<11} {requests / elapsed:7,.0f} req/s  "
+        f"profile p50 {percentile(profile, 0.5):7.1f} ms  p99 {percentile(profile, 0.99):7.1f} ms  "
+        f"ping p50 {percentile(ping, 0.5):7.1f} ms  "
+        f"peak threads {peak_threads}"
+    )
+    return requests / elapsed
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    latency_seconds = (float(sys.argv[3]) if len(sys.argv) > 3 else 10.0) / 1000
+
+    print(f"{requests} requests, {concurrency} concurrent, pool size {POOL_SIZE}, "
+          f"{latency_seconds * 1000:.1f} ms per query")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        seed(path)
+        before = measure(threadpool_app, path, "threadpool", requests, concurrency, latency_seconds)
+        after = measure(async_app, path, "async", requests, concurrency, latency_seconds)
+    print(f"Throughput ratio: {after / before:.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
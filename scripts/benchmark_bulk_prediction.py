@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the bulk cycle prediction engine
+Measures the prediction step alone (predict_chunk) on one million synthetic
+profiles on a single core and compares it with the per-user prediction
+path; the one-minute budget applies to this step only. It then times the
+full run() pipeline (streaming read, prediction and upsert) on
+PIPELINE_PROFILES profiles in an in-memory SQLite database, which shows
+the database share but not PostgreSQL network or WAL costs.
+Run from the project root: python -m scripts.benchmark_bulk_prediction
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from db.models.user import User
+from db.models.profile import Profile, UserType
+from db.models.period_log import CycleStats
+from db.models.cycle_prediction import CyclePrediction
+from services.bulk_prediction_service import BulkPredictionService
+from services.cycle_prediction import compute_cycle_prediction
+
+PROFILES = 1_000_000
+PIPELINE_PROFILES = 100_000
+CHUNK_SIZE = BulkPredictionService.DEFAULT_CHUNK_SIZE
+PER_USER_SAMPLE = 20_000
+
+def synthetic_rows(count: int, seed: int = 7):
+    """Rows shaped like the streamed (user_id, last, cycle, period, count, mean) columns"""
+    rng = np.random.default_rng(seed)
+    base = date(2025, 1, 1)
+    offsets = rng.integers(0, 365, count)
+    cycles = rng.integers(21, 36, count)
+    periods = rng.integers(3, 8, count)
+    observed = rng.integers(0, 12, count)
+    means = cycles + rng.normal(0, 1.5, count)
+    return [
+        (user_id, base + timedelta(days=int(offset)), int(cycle), int(period), int(seen), float(mean))
+        for user_id, offset, cycle, period, seen, mean
+        in zip(range(1, count + 1), offsets, cycles, periods, observed, means)
+    ]
+
+def seed(engine, rows) -> None:
+    """Users, profiles and cycle stats holding the synthetic rows"""
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Profile.__table__, CycleStats.__table__, CyclePrediction.__table__
+    ])
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "email": f"user{user_id}@example.com", "password": "hashed"}
+            for user_id, *_ in rows
+        ])
+        conn.execute(insert(Profile), [
+            {
+                "user_id": user_id, "name": f"User {user_id}", "user_type": UserType.USER,
+                "last_period_start_date": last, "cycle_length": cycle, "period_length": period
+            }
+            for user_id, last, cycle, period, _, _ in rows
+        ])
+        conn.execute(insert(CycleStats), [
+            {"user_id": user_id, "cycle_count": seen, "mean_cycle_length": mean, "m2": 0.0}
+            for user_id, _, _, _, seen, mean in rows if seen
+        ])
+
+def time_pipeline(rows, service: BulkPredictionService) -> float:
+    """Seconds for one full run() over rows, excluding the seeding"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    seed(engine, rows)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        service.run(conn)
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed
+
+def main():
+    rows = synthetic_rows(PROFILES)
+    service = BulkPredictionService(chunk_size=CHUNK_SIZE)
+
+    started = time.perf_counter()
+    written = 0
+    for offset in range(0, len(rows), CHUNK_SIZE):
+        written += len(service.predict_chunk(rows[offset:offset + CHUNK_SIZE]))
+    bulk_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _, last, cycle, period, _, _ in rows[:PER_USER_SAMPLE]:
+        compute_cycle_prediction(last, cycle, period)
+    per_user_seconds = (time.perf_counter() - started) * PROFILES / PER_USER_SAMPLE
+
+    pipeline_seconds = time_pipeline(rows[:PIPELINE_PROFILES], service)
+
+    print(f"Profiles:              {written:,}")
+    print(f"Prediction step:       {bulk_seconds:.2f}s ({written / bulk_seconds:,.0f} profiles/s)")
+    print(f"Per-user (projected):  {per_user_seconds:.2f}s, excluding the per-user query")
+    print(f"Full run, SQLite:      {pipeline_seconds:.2f}s for {PIPELINE_PROFILES:,} profiles "
+          f"({PIPELINE_PROFILES / pipeline_seconds:,.0f} profiles/s, read + predict + upsert)")
+    return 0 if bulk_seconds < 60 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
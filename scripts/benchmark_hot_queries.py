@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the hot-path query repository
+Times the three hottest lookups against an in-memory SQLite database whose
+profiles carry realistic medical summary and MCQ answer blobs, comparing a
+full-entity select() built on every call with the prebuilt load_only
+statements in db/repository.py. SQLite round trips are negligible, so the
+difference is ORM work: statement construction, row hydration and decoding
+the JSON columns nobody reads:
+python -m scripts.benchmark_hot_queries [iterations]
+"""
+
+import sys
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from db.models.user import User
+from db.models.profile import Profile, UserType
+from db.repository import PROFILE_FOR_UPDATE_BY_USER_ID, PROFILE_ID_BY_REFERRAL_CODE, USER_BY_EMAIL
+
+USERS = 200
+MEDICAL_SUMMARY = {
+    "conditions": [{"name": f"condition {i}", "since": "2021-01-01", "notes": "x" * 80} for i in range(20)],
+    "medications": [{"name": f"medication {i}", "dose": "10 mg"} for i in range(10)],
+}
+MCQ_DATA = {f"question_{i}": "free text answer " * 5 for i in range(30)}
+
+def seed(engine) -> None:
+    Base.metadata.create_all(engine, tables=[User.__table__, Profile.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "password": "hashed", "is_email_verified": True}
+            for i in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Profile), [
+            {
+                "user_id": i, "name": f"User {i}", "user_type": UserType.USER, "referral_code": f"CODE{i:04d}",
+                "medical_summary": MEDICAL_SUMMARY, "risk_assessment_mcq_data": MCQ_DATA
+            }
+            for i in range(1, USERS + 1)
+        ])
+
+def before(session: Session, i: int) -> None:
+    """Fresh full-entity selects, as the services built them"""
+    session.scalar(select(User).where(User.email == f"user{i}@example.com"))
+    session.scalar(select(Profile).where(Profile.user_id == i))
+    session.scalar(select(Profile.id).where(Profile.referral_code == f"CODE{i:04d}"))
+
+def after(session: Session, i: int) -> None:
+    """Prebuilt statements with load_only projections"""
+    session.scalar(USER_BY_EMAIL, {"email": f"user{i}@example.com"})
+    session.scalar(PROFILE_FOR_UPDATE_BY_USER_ID, {"user_id": i})
+    session.scalar(PROFILE_ID_BY_REFERRAL_CODE, {"referral_code": f"CODE{i:04d}"})
+
+def measure(engine, lookups, iterations: int) -> float:
+    """Microseconds per request-worth of lookups; a fresh session per request as in get_db"""
+    for i in range(1, USERS + 1):
+        with Session(engine) as session:
+            lookups(session, i)
+    started = time.perf_counter()
+    for n in range(iterations):
+        with Session(engine) as session:
+            lookups(session, n % USERS + 1)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    seed(engine)
+
+    print(f"{iterations} requests x 3 lookups")
+    full = measure(engine, before, iterations)
+    projected = measure(engine, after, iterations)
+    print(f"fresh select(), all columns   {full:8.1f} us/request")
+    print(f"prebuilt, load_only           {projected:8.1f} us/request")
+    print(f"ORM overhead saved: {full - projected:.1f} us/request ({full / projected:.2f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
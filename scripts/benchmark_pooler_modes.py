@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for pooler-aware statement modes
+Runs the profile lookup issued on most requests through engines configured
+the way core/database.py builds them:
+- direct: session mode, prepared statements cached per connection
+- pooled: transaction mode, no named prepared statement reuse, compiled SQL cache on
+- pooled, no SQL cache: transaction mode with query_cache_size=0
+Against PostgreSQL the first two compare asyncpg's statement cache with the
+pooler-safe setting; the third shows what the client-side compiled cache
+saves. Without a URL a temporary SQLite file is used, where only the
+compiled cache differs. Point it at a scratch database; the benchmark
+creates and drops its own tables:
+python -m scripts.benchmark_pooler_modes [queries] [database_url]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import Base
+from core.db_optimization import driver_url, engine_options, resolve_pool_config
+from db.models.user import User
+from db.models.profile import Profile, UserType
+
+USERS = 100
+TABLES = [User.__table__, Profile.__table__]
+MODES = [
+    ("direct", "session", None),
+    ("pooled", "transaction", None),
+    ("pooled, no SQL cache", "transaction", 0),
+]
+
+def profile_lookup(user_id: int):
+    return (
+        select(User.id, User.email, User.is_email_verified, Profile.name, Profile.user_type, Profile.language_code)
+        .join(Profile, Profile.user_id == User.id)
+        .where(User.id == user_id, User.is_email_verified.is_(True))
+    )
+
+def build_engine(url: str, pool_mode: str, query_cache_size):
+    config = resolve_pool_config("production", overrides={"query_cache_size": query_cache_size}, pool_mode=pool_mode)
+    return create_async_engine(driver_url(url), **engine_options(config, make_url(url).get_backend_name()))
+
+async def seed(url: str) -> None:
+    engine = build_engine(url, "session", None)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+        await conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "password": "hashed", "is_email_verified": True}
+            for i in range(1, USERS + 1)
+        ])
+        await conn.execute(insert(Profile), [
+            {"user_id": i, "name": f"User {i}", "user_type": UserType.USER}
+            for i in range(1, USERS + 1)
+        ])
+    await engine.dispose()
+
+async def drop(url: str) -> None:
+    engine = build_engine(url, "session", None)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all, tables=TABLES)
+    await engine.dispose()
+
+async def measure(url: str, label: str, pool_mode: str, query_cache_size, queries: int) -> float:
+    """Mean microseconds per lookup, one transaction per lookup as in a request"""
+    engine = build_engine(url, pool_mode, query_cache_size)
+    async with engine.connect() as conn:
+        await conn.execute(profile_lookup(1))  # connect and warm caches
+        await conn.commit()
+        started = time.perf_counter()
+        for i in range(queries):
+            (await conn.execute(profile_lookup(i % USERS + 1))).first()
+            await conn.commit()
+        elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    per_query = elapsed / queries * 1_000_000
+    print(f"{label:<22} {per_query:8.1f} us/query  {queries / elapsed:9,.0f} queries/s")
+    return per_query
+
+async def run(url: str, queries: int) -> None:
+    await seed(url)
+    try:
+        results = {label: await measure(url, label, mode, cache, queries) for label, mode, cache in MODES}
+    finally:
+        await drop(url)
+    print(f"Pooled vs direct: {results['pooled'] / results['direct']:.2f}x time per query; "
+          f"compiled SQL cache saves {results['pooled, no SQL cache'] - results['pooled']:.1f} us/query")
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    url = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = url or f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"
+        print(f"{queries} lookups on {make_url(url).get_backend_name()}")
+        asyncio.run(run(url, queries))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the probabilistic cycle prediction
+Measures the per-request fit of a full history window (excluding the
+period_logs query) and fails if it does not stay under one millisecond:
+python -m scripts.benchmark_probabilistic_prediction
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from services.cycle_prediction import HISTORY_WINDOW_CYCLES, predict_cycle_interval
+
+ITERATIONS = 20_000
+BUDGET_SECONDS = 0.001
+
+def main():
+    rng = np.random.default_rng(11)
+    lengths = rng.integers(24, 35, HISTORY_WINDOW_CYCLES)
+    starts = np.datetime64("2024-01-01") + np.concatenate(([0], np.cumsum(lengths))).astype("timedelta64[D]")
+
+    for _ in range(1_000):
+        predict_cycle_interval(starts, 28, 0.9)
+
+    samples = np.empty(ITERATIONS)
+    for i in range(ITERATIONS):
+        started = time.perf_counter()
+        predict_cycle_interval(starts, 28, 0.9)
+        samples[i] = time.perf_counter() - started
+
+    p50, p99 = np.percentile(samples, [50, 99]) * 1e6
+    print(f"History window:  {HISTORY_WINDOW_CYCLES} cycles")
+    print(f"Per request:     p50 {p50:.0f}us, p99 {p99:.0f}us (budget {BUDGET_SECONDS * 1e6:.0f}us)")
+    return 0 if p99 / 1e6 < BUDGET_SECONDS else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the compiled MCQ risk scoring
+Compares the compiled rule lookup with the original if-chain on random
+answer sets and fails if the lookup disagrees with it or is more than
+MAX_SLOWDOWN slower (the rules are data now, not code, at if-chain speed):
+python -m scripts.benchmark_risk_scoring
+"""
+
+import random
+import sys
+import time
+
+from services.risk_scoring_service import CompiledRuleSet, DEFAULT_RULES, DEFAULT_RULES_VERSION
+from tests.risk_reference import if_chain_score
+
+ANSWER_SETS = 200_000
+MAX_SLOWDOWN = 1.2
+
+def main():
+    rng = random.Random(5)
+    choices = {}
+    for question, answer, _ in DEFAULT_RULES:
+        choices.setdefault(question, ["OTHER"]).append(answer)
+    answer_sets = [
+        {question: rng.choice(options) for question, options in choices.items()}
+        for _ in range(ANSWER_SETS)
+    ]
+    rules = CompiledRuleSet(DEFAULT_RULES_VERSION, DEFAULT_RULES)
+
+    started = time.perf_counter()
+    baseline = [if_chain_score(answers) for answers in answer_sets]
+    baseline_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = [rules.score(answers) for answers in answer_sets]
+    compiled_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rules.assess_many(answer_sets)
+    batch_elapsed = time.perf_counter() - started
+
+    if compiled != baseline:
+        print("Compiled rules disagree with the if-chain")
+        return 1
+
+    print(f"Answer sets:  {ANSWER_SETS}")
+    print(f"If-chain:     {ANSWER_SETS / baseline_elapsed:,.0f} sets/s")
+    print(f"Compiled:     {ANSWER_SETS / compiled_elapsed:,.0f} sets/s")
+    print(f"Batch:        {ANSWER_SETS / batch_elapsed:,.0f} sets/s (score + level)")
+    return 0 if compiled_elapsed < baseline_elapsed * MAX_SLOWDOWN else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
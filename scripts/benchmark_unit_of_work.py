@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the one-commit-per-request unit of work
+Replays the signup write pattern (user row + OTP row) against a file-backed
+SQLite database in WAL mode with synchronous=FULL, so every commit pays a
+WAL fsync. Compares the old commit / refresh / commit sequence with a single
+unit-of-work commit:
+python -m scripts.benchmark_unit_of_work [signups]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base, unit_of_work
+from db.models.user import User
+from db.models.otp import Otp
+from db.models.profile import Profile  # noqa: F401  (User.profile relationship)
+
+def make_engine(path: str):
+    """File-backed SQLite engine with a durable WAL"""
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=FULL")
+
+    Base.metadata.create_all(engine, tables=[User.__table__, Otp.__table__])
+    return engine
+
+def otp_for(email: str) -> Otp:
+    now = datetime.utcnow()
+    return Otp(email=email, otp_code="123456", created_at=now, expires_at=now + timedelta(minutes=10), used=False)
+
+def commit_per_step(session, email: str) -> None:
+    """Previous register_user: commit, refresh, then store_otp commits again"""
+    user = User(email=email, password="hashed", is_email_verified=False)
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    session.add(otp_for(user.email))
+    session.commit()
+
+def single_commit(session, email: str) -> None:
+    """Unit of work: flush for the id, commit once"""
+    with unit_of_work(session):
+        user = User(email=email, password="hashed", is_email_verified=False)
+        session.add(user)
+        session.flush()
+        session.add(otp_for(user.email))
+
+def measure(flow, signups: int, label: str):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(os.path.join(directory, "bench.db"))
+        counts = {"statements": 0, "commits": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(*args):
+            counts["statements"] += 1
+
+        @event.listens_for(engine, "commit")
+        def count_commit(conn):
+            counts["commits"] += 1
+
+        session = sessionmaker(bind=engine)()
+        started = time.perf_counter()
+        for i in range(signups):
+            flow(session, f"{label}{i}@example.com")
+        elapsed = time.perf_counter() - started
+        session.close()
+        engine.dispose()
+
+    print(
+        f"{label:<16} {signups / elapsed:8,.0f} signups/s  "
+        f"{counts['commits'] / signups:.1f} commits, {counts['statements'] / signups:.1f} statements per signup"
+    )
+    return elapsed
+
+def main():
+    signups = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    before = measure(commit_per_step, signups, "commit-per-step")
+    after = measure(single_commit, signups, "unit-of-work")
+    print(f"Speedup: {before / after:.2f}x")
+    return 0 if after < before else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+CI check: every foreign key column has an index
+Checks the model metadata by default, or the live schema of a database
+(reflected) when a URL is given. Exits 1 and lists the offenders otherwise:
+python -m scripts.check_fk_indexes [database_url]
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import Base
+from core.db_optimization import driver_url
+from db.index_check import unindexed_foreign_keys
+import db.models  # noqa: F401  (registers every table)
+
+async def reflect_async(url: str) -> MetaData:
+    metadata = MetaData()
+    engine = create_async_engine(driver_url(url))
+    try:
+        async with engine.connect() as conn:
+            await conn.run_sync(metadata.reflect)
+    finally:
+        await engine.dispose()
+    return metadata
+
+def reflect(url: str) -> MetaData:
+    """Schema of a live database, sync or async driver"""
+    if make_url(url).get_dialect().is_async:
+        return asyncio.run(reflect_async(url))
+
+    metadata = MetaData()
+    engine = create_engine(driver_url(url))
+    try:
+        metadata.reflect(engine)
+    finally:
+        engine.dispose()
+    return metadata
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else None
+    metadata = reflect(url) if url else Base.metadata
+
+    missing = unindexed_foreign_keys(metadata)
+    for table, columns in missing:
+        print(f"Foreign key without an index: {table}({', '.join(columns)})")
+    if missing:
+        return 1
+    print(f"All foreign keys indexed ({len(metadata.tables)} tables)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Move stored MCQ answers to the compact encoding
+Encodes every answer kept in risk_assessment_mcq_data (profiles that have
+no codes yet, and extras of encoded profiles), registering codes for
+answers seen for the first time. Only answers to unknown questions and
+free text stay in the JSONB column. Resumable and safe to re-run:
+python -m scripts.encode_mcq_answers [chunk_size]
+"""
+
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection
+
+from core.database import engine
+from db.models.profile import Profile
+from services.mcq_codec import codebook
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+def encode_chunks(conn: Connection, chunk_size: int) -> int:
+    """Encode profiles in primary-key order, one UPDATE batch per chunk"""
+    profiles = Profile.__table__
+    statement = (
+        update(profiles)
+        .where(profiles.c.id == bindparam("profile_id"))
+        .values(
+            risk_assessment_mcq_codes=bindparam("codes"),
+            risk_assessment_mcq_data=bindparam("extras")
+        )
+    )
+
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute(
+            select(profiles.c.id, profiles.c.risk_assessment_mcq_codes, profiles.c.risk_assessment_mcq_data)
+            .where(profiles.c.id > last_id, profiles.c.risk_assessment_mcq_data.is_not(None))
+            .order_by(profiles.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return total
+
+        # Registers new answers and loads the codes other workers added
+        codebook.add_codes(conn, codebook.uncoded(
+            pair for row in rows for pair in row.risk_assessment_mcq_data.items()
+        ))
+
+        params = []
+        for profile_id, codes, extras in rows:
+            codes, extras = codebook.encode(codebook.decode(codes, extras))
+            params.append({"profile_id": profile_id, "codes": codes, "extras": extras})
+        conn.execute(statement, params)
+        conn.commit()
+
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info(f"Encoded MCQ answers: {total} profiles")
+
+async def encode_all(chunk_size: int):
+    """Run the encoder on a sync connection of the async engine"""
+    try:
+        async with engine.connect() as conn:
+            total = await conn.run_sync(encode_chunks, chunk_size)
+        logger.info(f"Encoded MCQ answers for {total} profiles")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    chunk = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CHUNK_SIZE
+    asyncio.run(encode_all(chunk))
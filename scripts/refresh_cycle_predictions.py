@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Recompute cycle_predictions for every profile
+Run nightly (or after bulk imports) to feed reminders and analytics:
+python -m scripts.refresh_cycle_predictions [chunk_size]
+"""
+
+import asyncio
+import logging
+import sys
+
+from core.database import engine
+from services.bulk_prediction_service import BulkPredictionService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def refresh_predictions(chunk_size: int):
+    """Stream all profiles through the bulk prediction engine"""
+    service = BulkPredictionService(chunk_size=chunk_size)
+    try:
+        async with engine.begin() as conn:
+            total = await conn.run_sync(service.run)
+        logger.info(f"Refreshed {total} cycle predictions")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    chunk = int(sys.argv[1]) if len(sys.argv) > 1 else BulkPredictionService.DEFAULT_CHUNK_SIZE
+    asyncio.run(refresh_predictions(chunk))
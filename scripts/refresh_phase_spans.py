@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Nightly rollover of cycle_phase_spans
+Drops expired spans and rebuilds every user's phase horizon from today:
+python -m scripts.refresh_phase_spans [chunk_size]
+"""
+
+import asyncio
+import logging
+import sys
+
+from core.database import engine
+from services.phase_span_service import PhaseSpanService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def refresh_spans(chunk_size: int):
+    """Stream all profiles through the phase span refresh"""
+    service = PhaseSpanService()
+    try:
+        async with engine.begin() as conn:
+            total = await conn.run_sync(lambda sync_conn: service.refresh_all(sync_conn, chunk_size=chunk_size))
+        logger.info(f"Refreshed phase spans for {total} profiles")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    chunk = int(sys.argv[1]) if len(sys.argv) > 1 else PhaseSpanService.DEFAULT_CHUNK_SIZE
+    asyncio.run(refresh_spans(chunk))
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Rescore every profile's latest MCQ assessment with the current rules
+Run after publishing a new mcq_scoring_rules version; an interrupted run
+resumes from its checkpoint, and running it again after a finished run
+rescores submissions that were scored with the previous version:
+python -m scripts.rescore_risk_assessments [chunk_size]
+"""
+
+import asyncio
+import logging
+import sys
+
+from core.database import engine
+from services.risk_rescoring_service import RiskRescoringService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def rescore(chunk_size: int):
+    """Run the rescoring job on a sync connection of the async engine"""
+    service = RiskRescoringService(chunk_size=chunk_size)
+    try:
+        async with engine.connect() as conn:
+            job = await conn.run_sync(service.run)
+        logger.info(f"Rules version {job['rules_version']}: {job['processed']} rescored, {job['changed']} changed")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    chunk = int(sys.argv[1]) if len(sys.argv) > 1 else RiskRescoringService.DEFAULT_CHUNK_SIZE
+    asyncio.run(rescore(chunk))
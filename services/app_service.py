@@ -3,63 +3,101 @@ App service for She&Soul FastAPI application
 Based on Java implementation
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, date, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
 from db.models.user import User
 from db.models.profile import Profile, UserType, UserServiceType
+from db.models.period_log import PeriodLog
+from db.models.risk_assessment import RiskAssessment
 from api.schemas.auth import SignUpRequest
 from api.schemas.profile import (
-    ProfileRequest, ProfileResponse, ProfileServiceDto, 
-    MenstrualTrackingDto, CyclePredictionDto, PartnerDataDto
+    ProfileRequest, ProfileResponse, ProfileServiceDto, ProfileBasicUpdate, ProfileBasicDto,
+    MenstrualTrackingDto, CyclePredictionDto, PartnerDataDto,
+    CycleForecastDto, CycleCalendarDto, ProbabilisticCyclePredictionDto
 )
-from core.security import get_password_hash
+from api.schemas.risk import McqAssessmentDto, McqBatchResponse, McqRiskResultDto
+from core.database import release_connection, run_after_commit
+from db.repository import (
+    profile_for_update, profile_id_by_referral_code, profile_id_by_user_id, profile_name_by_referral_code,
+    user_by_email, user_credentials_by_email, user_id_by_email
+)
+from core.security import get_password_hash, verify_password
 from services.otp_service import OtpGenerationService
 from services.email_service import EmailService
 from services.referral_service import ReferralCodeService
+from services.cycle_stats_service import CycleStatsService
+from services.phase_span_service import PhaseSpanService
+from services.profile_cache import profile_cache
+from services.risk_scoring_service import risk_scoring_service
+from services.mcq_codec import encode_new_answers, decode_stored_answers
+from services.risk_rescoring_service import SOURCE_SUBMISSION
+from services.cycle_prediction import (
+    CachedPrediction, prediction_cache, forecast_cycles, phase_calendar,
+    predict_cycle_interval, HISTORY_WINDOW_CYCLES
+)
+
+logger = logging.getLogger(__name__)
 
 class AppService:
-    """Service class for application business logic - based on Java implementation"""
+    """
+    Service class for application business logic - based on Java implementation
+    Methods stage and flush changes only; the request's unit of work commits.
+    Everything runs on the request's AsyncSession; CPU-bound password
+    hashing and blocking SMTP calls are moved off the event loop.
+    """
+    
+    MAX_CALENDAR_DAYS = 366
     
     def __init__(self):
         self.otp_service = OtpGenerationService()
         self.email_service = EmailService()
         self.referral_service = ReferralCodeService()
+        self.cycle_stats_service = CycleStatsService()
+        self.phase_span_service = PhaseSpanService()
+        self.profile_cache = profile_cache
+        self.prediction_cache = prediction_cache
+        self.risk_scoring_service = risk_scoring_service
     
-    def register_user(self, db: Session, request: SignUpRequest) -> User:
+    async def register_user(self, db: AsyncSession, request: SignUpRequest) -> User:
         """
         Register a new user (simplified like Java implementation)
         Only requires email and password
         """
         # Check if user already exists
-        existing_user = db.query(User).filter(User.email == request.email).first()
+        existing_user = await user_id_by_email(db, request.email)
         
         if existing_user:
             raise ValueError("Email already in use")
         
+        # Hashing takes a few hundred ms; don't hold a pooled connection meanwhile
+        await release_connection(db)
+        
         # Create new user
         new_user = User(
             email=request.email,
-            password=get_password_hash(request.password),
+            password=await asyncio.to_thread(get_password_hash, request.password),
             is_email_verified=False
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.flush()
         
         # TODO: Add OTP email sending back after basic signup works
         otp = self.otp_service.generate_otp()
-        self.otp_service.store_otp(db, new_user.email, otp)
-        self.email_service.send_otp_email(new_user.email, otp)
+        await self.otp_service.store_otp(db, new_user.email, otp)
+        self._send_otp_after_commit(db, new_user.email, otp)
         
         return new_user
     
-    def verify_email(self, db: Session, email: str, submitted_otp: str) -> None:
+    async def verify_email(self, db: AsyncSession, email: str, submitted_otp: str) -> None:
         """Verify user email with OTP"""
         # Find user
-        user = db.query(User).filter(User.email == email).first()
+        user = await user_by_email(db, email)
         
         if not user:
             raise ValueError(f"User not found with email: {email}")
@@ -68,19 +106,18 @@ class AppService:
             raise ValueError("Email is already verified.")
         
         # Validate OTP
-        valid_otp = self.otp_service.is_otp_valid(db, email, submitted_otp)
+        valid_otp = await self.otp_service.is_otp_valid(db, email, submitted_otp)
         if not valid_otp:
             raise ValueError("Invalid or expired OTP.")
         
         # Mark email as verified and OTP as used
         user.is_email_verified = True
-        self.otp_service.mark_otp_as_used(db, valid_otp)
-        db.commit()
+        await self.otp_service.mark_otp_as_used(db, valid_otp)
     
-    def resend_otp(self, db: Session, email: str) -> None:
+    async def resend_otp(self, db: AsyncSession, email: str) -> None:
         """Resend OTP to user email"""
         # Find user
-        user = db.query(User).filter(User.email == email).first()
+        user = await user_by_email(db, email)
         
         if not user:
             raise ValueError(f"User not found with email: {email}")
@@ -90,15 +127,35 @@ class AppService:
         
         # Generate and send new OTP
         otp = self.otp_service.generate_otp()
-        self.otp_service.store_otp(db, user.email, otp)
-        self.email_service.send_otp_email(user.email, otp)
+        await self.otp_service.store_otp(db, user.email, otp)
+        self._send_otp_after_commit(db, user.email, otp)
+    
+    def _send_otp_after_commit(self, db: AsyncSession, email: str, otp: str) -> None:
+        """Hand the OTP email to the default executor once the transaction commits"""
+        loop = asyncio.get_running_loop()
+
+        def send():
+            future = loop.run_in_executor(None, self.email_service.send_otp_email, email, otp)
+            future.add_done_callback(lambda done: self._log_otp_send(done, email))
+
+        run_after_commit(db, send)
     
-    def create_profile(self, db: Session, request: ProfileRequest, user: User) -> ProfileResponse:
+    @staticmethod
+    def _log_otp_send(future: asyncio.Future, email: str) -> None:
+        """Log an OTP email that failed; nobody awaits the send"""
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.error(f"Sending the OTP email to {email} raised", exc_info=future.exception())
+        elif future.result() is False:
+            logger.error(f"Sending the OTP email to {email} failed")
+    
+    async def create_profile(self, db: AsyncSession, request: ProfileRequest, user: User) -> ProfileResponse:
         """
         Create user profile (separate from signup like Java implementation)
         """
         # Check if user already has profile
-        existing_profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+        existing_profile = await profile_id_by_user_id(db, user.id)
         
         if existing_profile:
             raise ValueError("User already has a profile.")
@@ -118,14 +175,14 @@ class AppService:
             profile.preferred_service_type = request.preferred_service_type
             
             db.add(profile)
-            db.flush()  # Get profile ID
+            await db.flush()  # Get profile ID
             
             # Generate referral code
             new_code = self.referral_service.generate_code(profile.id)
             
             # Ensure referral code is unique
             while True:
-                existing_code = db.query(Profile).filter(Profile.referral_code == new_code).first()
+                existing_code = await profile_id_by_referral_code(db, new_code)
                 if not existing_code:
                     break
                 new_code = self.referral_service.generate_random_code()
@@ -137,15 +194,15 @@ class AppService:
                 raise ValueError("Referral code is required for partner use.")
             
             # Validate referral code
-            referred_user_profile = db.query(Profile).filter(Profile.referral_code == request.referred_by_code).first()
+            referred_user_profile = await profile_id_by_referral_code(db, request.referred_by_code)
             if not referred_user_profile:
                 raise ValueError(f"Invalid referral code: {request.referred_by_code}")
             
             profile.referred_code = request.referred_by_code
             db.add(profile)
         
-        db.commit()
-        db.refresh(profile)
+        await db.flush()
+        self._invalidate_profile(db, user.id)
         
         return ProfileResponse(
             id=profile.id,
@@ -156,133 +213,224 @@ class AppService:
             referral_code=profile.referral_code
         )
     
-    def login_user(self, db: Session, email: str, password: str) -> User:
+    async def login_user(self, db: AsyncSession, email: str, password: str) -> User:
         """Login user with email and password"""
-        from core.security import verify_password
-        
-        user = db.query(User).filter(User.email == email).first()
+        user = await user_credentials_by_email(db, email)
         
         if not user:
             raise ValueError("Invalid email or password")
         
-        if not verify_password(password, user.password):
+        await release_connection(db)
+        if not await asyncio.to_thread(verify_password, password, user.password):
             raise ValueError("Invalid email or password")
         
         return user
     
-    def get_user_by_id(self, db: Session, user_id: int) -> User:
+    async def get_user_by_id(self, db: AsyncSession, user_id: int) -> User:
         """Get user by ID"""
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         
         if not user:
             raise ValueError(f"User not found with ID: {user_id}")
         
         return user
     
-    def update_user_service(self, db: Session, user_id: int, service_dto: ProfileServiceDto) -> ProfileServiceDto:
+    async def update_user_service(self, db: AsyncSession, user_id: int, service_dto: ProfileServiceDto) -> ProfileServiceDto:
         """Update user service preferences"""
-        profile = db.query(Profile).filter(Profile.user_id == user_id).first()
-        
-        if not profile:
+        row = (await db.execute(
+            update(Profile)
+            .where(Profile.user_id == user_id)
+            .values(preferred_service_type=service_dto.preferred_service_type)
+            .returning(Profile.preferred_service_type)
+        )).first()
+        
+        if not row:
             raise ValueError(f"Profile not found for user ID: {user_id}")
         
-        profile.preferred_service_type = service_dto.preferred_service_type
-        db.commit()
+        self._invalidate_profile(db, user_id)
+        
+        return ProfileServiceDto(preferred_service_type=row.preferred_service_type)
+    
+    async def patch_profile(self, db: AsyncSession, user_id: int, patch: ProfileBasicUpdate) -> ProfileBasicDto:
+        """
+        Write only the basic fields present in the request with one
+        UPDATE ... RETURNING; null is ignored except for nick_name
+        """
+        values = {
+            field: value
+            for field, value in patch.model_dump(exclude_unset=True).items()
+            if value is not None or field == "nick_name"
+        }
+        columns = [getattr(Profile, field) for field in ProfileBasicDto.model_fields]
+        
+        if values:
+            row = (await db.execute(
+                update(Profile).where(Profile.user_id == user_id).values(**values).returning(*columns)
+            )).first()
+        else:
+            row = (await db.execute(select(*columns).where(Profile.user_id == user_id))).first()
+        
+        if not row:
+            raise ValueError(f"Profile not found for user ID: {user_id}")
         
-        return ProfileServiceDto(preferred_service_type=profile.preferred_service_type)
+        if values:
+            self._invalidate_profile(db, user_id)
+        return ProfileBasicDto(**row._mapping)
     
-    def update_menstrual_data(self, db: Session, user_id: int, update_dto: MenstrualTrackingDto) -> MenstrualTrackingDto:
+    async def update_menstrual_data(self, db: AsyncSession, user_id: int, update_dto: MenstrualTrackingDto) -> MenstrualTrackingDto:
         """Update menstrual tracking data"""
-        profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+        # Update only the provided menstrual data and read back the prediction inputs
+        values = {
+            field: value
+            for field, value in update_dto.model_dump().items()
+            if value
+        }
+        inputs = (Profile.last_period_start_date, Profile.cycle_length, Profile.period_length)
+        if values:
+            statement = update(Profile).where(Profile.user_id == user_id).values(**values).returning(*inputs)
+        else:
+            statement = select(*inputs).where(Profile.user_id == user_id)
+        row = (await db.execute(statement)).first()
         
-        if not profile:
+        if not row:
             raise ValueError(f"Profile not found for user ID: {user_id}")
         
-        # Update menstrual data
         if update_dto.last_period_start_date:
-            profile.last_period_start_date = update_dto.last_period_start_date
-        if update_dto.last_period_end_date:
-            profile.last_period_end_date = update_dto.last_period_end_date
-        if update_dto.period_length:
-            profile.period_length = update_dto.period_length
-        if update_dto.cycle_length:
-            profile.cycle_length = update_dto.cycle_length
-        
-        db.commit()
+            await self.cycle_stats_service.record_period(
+                db, user_id, update_dto.last_period_start_date, update_dto.last_period_end_date
+            )
+        
+        last_period_start_date, entered_cycle_length, period_length = row
+        if last_period_start_date and entered_cycle_length and period_length:
+            stats = await self.cycle_stats_service.get_stats(db, user_id)
+            cycle_length = (
+                stats and self.cycle_stats_service.estimated_cycle_length(stats.cycle_count, stats.mean_cycle_length)
+            ) or entered_cycle_length
+            await self.phase_span_service.refresh_user(
+                db, user_id, last_period_start_date, cycle_length, period_length
+            )
+        
+        self._invalidate_profile(db, user_id)
         return update_dto
     
-    def predict_next_cycle(self, db: Session, user_id: int) -> CyclePredictionDto:
+    async def predict_next_cycle(self, db: AsyncSession, user_id: int) -> CyclePredictionDto:
         """Predict next menstrual cycle"""
-        profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+        return (await self._get_cached_prediction(db, user_id)).prediction
+    
+    async def get_cycle_prediction_as_text(self, db: AsyncSession, user_id: int) -> str:
+        """Get cycle prediction as formatted text"""
+        try:
+            return (await self._get_cached_prediction(db, user_id)).text
+        except Exception:
+            return "The user has not provided enough information to generate a cycle prediction. Please ask them to complete their menstrual cycle setup."
+    
+    async def predict_next_cycle_probabilistic(self, db: AsyncSession, user_id: int, confidence: float) -> ProbabilisticCyclePredictionDto:
+        """Predict next cycle as date intervals fitted to the logged history"""
+        last_period_date, cycle_length, _ = await self._get_prediction_inputs(db, user_id)
+        
+        logged_starts = (await db.scalars(
+            select(PeriodLog.start_date)
+            .where(PeriodLog.user_id == user_id)
+            .order_by(PeriodLog.start_date.desc())
+            .limit(HISTORY_WINDOW_CYCLES + 1)
+        )).all()
+        
+        starts = sorted(set(logged_starts) | {last_period_date})[-(HISTORY_WINDOW_CYCLES + 1):]
+        return predict_cycle_interval(np.array(starts, dtype="datetime64[D]"), cycle_length, confidence)
+    
+    async def forecast_cycles(self, db: AsyncSession, user_id: int, cycles: int) -> CycleForecastDto:
+        """Predict the next N menstrual cycles"""
+        last_period_date, cycle_length, period_length = await self._get_prediction_inputs(db, user_id)
+        return CycleForecastDto(
+            cycles=forecast_cycles(last_period_date, cycle_length, period_length, cycles)
+        )
+    
+    async def get_cycle_calendar(self, db: AsyncSession, user_id: int, start_date: date, end_date: date) -> CycleCalendarDto:
+        """Get the per-day phase calendar for a date range"""
+        if end_date < start_date:
+            raise ValueError("Calendar end date must not be before its start date.")
+        if (end_date - start_date).days >= self.MAX_CALENDAR_DAYS:
+            raise ValueError(f"Calendar range cannot exceed {self.MAX_CALENDAR_DAYS} days.")
+        
+        last_period_date, cycle_length, period_length = await self._get_prediction_inputs(db, user_id)
+        return phase_calendar(last_period_date, cycle_length, period_length, start_date, end_date)
+    
+    async def _get_cached_prediction(self, db: AsyncSession, user_id: int) -> CachedPrediction:
+        """Look up the prediction inputs for a user and memoize the result"""
+        return self.prediction_cache.get(*await self._get_prediction_inputs(db, user_id))
+    
+    async def _get_prediction_inputs(self, db: AsyncSession, user_id: int) -> Tuple[date, int, int]:
+        """Return (last_period_start_date, cycle_length, period_length) for a user"""
+        profile = await self.profile_cache.get(db, user_id)
         
         if not profile:
             raise ValueError(f"Profile not found for user ID: {user_id}")
         
         last_period_date = profile.last_period_start_date
-        cycle_length = profile.cycle_length
+        cycle_length = self.cycle_stats_service.estimated_cycle_length(
+            profile.cycle_count, profile.mean_cycle_length
+        ) or profile.cycle_length
         period_length = profile.period_length
         
         if not last_period_date or not cycle_length or not period_length:
             raise ValueError("Insufficient data to predict next cycle.")
         
-        # Calculate predictions (same logic as Java)
-        next_period_start_date = last_period_date + timedelta(days=cycle_length)
-        following_period_start_date = next_period_start_date + timedelta(days=cycle_length)
-        next_ovulation_date = following_period_start_date - timedelta(days=14)
-        
-        return CyclePredictionDto(
-            next_period_start_date=next_period_start_date,
-            next_period_end_date=next_period_start_date + timedelta(days=period_length - 1),
-            next_follicular_start_date=next_period_start_date,
-            next_follicular_end_date=next_ovulation_date,
-            next_ovulation_date=next_ovulation_date,
-            next_ovulation_end_date=next_ovulation_date + timedelta(days=1),
-            next_luteal_start_date=next_ovulation_date + timedelta(days=1),
-            next_luteal_end_date=next_ovulation_date + timedelta(days=14),
-            next_fertile_window_start_date=next_ovulation_date - timedelta(days=5),
-            next_fertile_window_end_date=next_ovulation_date + timedelta(days=1)
-        )
+        return last_period_date, cycle_length, period_length
     
-    def get_cycle_prediction_as_text(self, db: Session, user_id: int) -> str:
-        """Get cycle prediction as formatted text"""
-        try:
-            prediction = self.predict_next_cycle(db, user_id)
-            
-            return (
-                f"The user's next period is predicted to start on {prediction.next_period_start_date.strftime('%B %d, %Y')} "
-                f"and end on {prediction.next_period_end_date.strftime('%B %d, %Y')}. "
-                f"Their most fertile window is predicted to be between "
-                f"{prediction.next_fertile_window_start_date.strftime('%B %d, %Y')} and "
-                f"{prediction.next_fertile_window_end_date.strftime('%B %d, %Y')}."
-            )
-        except Exception:
-            return "The user has not provided enough information to generate a cycle prediction. Please ask them to complete their menstrual cycle setup."
+    def _invalidate_profile(self, db: AsyncSession, user_id: int) -> None:
+        """Drop the cached profile snapshot once the request's transaction commits"""
+        run_after_commit(db, lambda: self.profile_cache.invalidate(user_id))
     
-    def find_profile_by_user_id(self, db: Session, user_id: int) -> Profile:
-        """Find profile by user ID"""
-        profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+    async def find_profile_by_user_id(self, db: AsyncSession, user_id: int) -> Profile:
+        """Find profile by user ID (for updates; see db/repository.py for the loaded columns)"""
+        profile = await profile_for_update(db, user_id)
         
         if not profile:
             raise ValueError(f"Profile not found for user ID: {user_id}")
         
         return profile
-    
-    def update_user_language(self, db: Session, user_id: int, language_code: str) -> Profile:
+
+    async def get_profile_response(self, db: AsyncSession, user_id: int) -> ProfileResponse:
+        """
+        Get profile response for a user in a single statement.
+        Joins users and profiles and selects only the response columns,
+        so no ORM entity or lazy User load is involved.
+        """
+        row = (await db.execute(
+            select(
+                Profile.id,
+                Profile.user_id,
+                Profile.name,
+                User.email,
+                Profile.user_type,
+                Profile.referral_code
+            )
+            .join(User, User.id == Profile.user_id)
+            .where(Profile.user_id == user_id)
+        )).first()
+
+        if not row:
+            raise ValueError(f"Profile not found for user ID: {user_id}")
+
+        return ProfileResponse(**row._mapping)
+
+    async def update_user_language(self, db: AsyncSession, user_id: int, language_code: str) -> Profile:
         """Update user language preference"""
-        profile = self.find_profile_by_user_id(db, user_id)
+        profile = await self.find_profile_by_user_id(db, user_id)
         profile.language_code = language_code
-        db.commit()
+        await db.flush()
+        self._invalidate_profile(db, user_id)
         return profile
     
-    def save_profile(self, db: Session, profile: Profile) -> Profile:
+    async def save_profile(self, db: AsyncSession, profile: Profile) -> Profile:
         """Save profile"""
-        db.commit()
-        db.refresh(profile)
+        await db.flush()
+        self._invalidate_profile(db, profile.user_id)
         return profile
     
-    def get_partner_data(self, db: Session, user_id: int) -> PartnerDataDto:
+    async def get_partner_data(self, db: AsyncSession, user_id: int) -> PartnerDataDto:
         """Get partner data for the logged-in partner"""
-        partner_profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+        partner_profile = await self.profile_cache.get(db, user_id)
         
         if not partner_profile or partner_profile.user_type != UserType.PARTNER:
             raise ValueError(f"No partner profile found for user ID: {user_id}")
@@ -292,80 +440,65 @@ class AppService:
             raise ValueError("Partner profile does not have a referral code.")
         
         # Find the user profile with this referral code
-        user_profile = db.query(Profile).filter(Profile.referral_code == referral_code).first()
+        user_profile = await profile_name_by_referral_code(db, referral_code)
         
         if not user_profile:
             raise ValueError(f"No user profile found for referral code: {referral_code}")
         
         # Get cycle prediction for the linked user
-        cycle_prediction = self.predict_next_cycle(db, user_profile.user_id)
+        cycle_prediction = await self.predict_next_cycle(db, user_profile.user_id)
         
         return PartnerDataDto(
             name=user_profile.name,
             cycle_prediction=cycle_prediction
         )
     
-    def process_mcq_risk_assessment(self, db: Session, user_id: int, answers: Dict[str, str]) -> str:
+    async def process_mcq_risk_assessment(self, db: AsyncSession, user_id: int, answers: Dict[str, str]) -> str:
         """Process MCQ risk assessment and return risk level"""
-        profile = self.find_profile_by_user_id(db, user_id)
+        profile = await self.find_profile_by_user_id(db, user_id)
         
-        score = self._calculate_risk_score_from_mcq(answers)
+        rules = await self.risk_scoring_service.get_current_rules(db)
+        score, risk_level = rules.assess(answers)
+        codes, extras = await encode_new_answers(db, answers)
         
-        if score >= 10:
-            risk_level = "High Risk"
-        elif score >= 5:
-            risk_level = "Moderate Risk"
-        else:
-            risk_level = "Low Risk"
-        
-        profile.risk_assessment_mcq_data = answers
+        profile.risk_assessment_mcq_codes, profile.risk_assessment_mcq_data = codes, extras
         profile.breast_cancer_risk_level = risk_level
-        
-        db.commit()
+        db.add(RiskAssessment(
+            user_id=user_id,
+            answer_codes=codes,
+            extra_answers=extras,
+            score=score,
+            risk_level=risk_level,
+            rules_version=rules.version,
+            source=SOURCE_SUBMISSION
+        ))
+        
+        await db.flush()
+        self._invalidate_profile(db, user_id)
         return risk_level
     
-    def _calculate_risk_score_from_mcq(self, answers: Dict[str, str]) -> int:
-        """Calculate risk score from MCQ answers (same logic as Java)"""
-        score = 0
-        
-        # Menstrual & Reproductive History
-        if answers.get("menstruation_start_age") == "MENSTRUATION_START_LT_12":
-            score += 1
-        if answers.get("menopause_status") == "MENOPAUSE_YES_GT_55":
-            score += 2
-        if answers.get("pregnancy_history") == "PREGNANCY_NO":
-            score += 1  # Nulliparity
-        if answers.get("breastfeeding_history") == "BREASTFED_NO":
-            score += 1
-        if answers.get("breastfeeding_history") == "BREASTFED_NA":
-            score += 1  # Same as no
-        if answers.get("breastfeeding_history") == "BREASTFED_YES_GT_6MO":
-            score -= 1  # Protective factor
-        
-        # Lifestyle & Hormonal Factors
-        if answers.get("alcohol_use") == "ALCOHOL_WEEKLY":
-            score += 1
-        if answers.get("alcohol_use") == "ALCOHOL_DAILY":
-            score += 2
-        if answers.get("smoking_status") == "SMOKING_OCCASIONALLY":
-            score += 1
-        if answers.get("smoking_status") == "SMOKING_REGULARLY":
-            score += 2
-        if answers.get("hrt_use") == "HRT_YES_LT_5Y":
-            score += 1
-        if answers.get("hrt_use") == "HRT_YES_GT_5Y":
-            score += 2
-        if answers.get("oral_contraceptives_use") == "OC_YES_LT_5Y":
-            score += 1
-        if answers.get("oral_contraceptives_use") == "OC_YES_GT_5Y":
-            score += 2
-        
-        # High-impact factors
-        if answers.get("family_history") == "YES_FIRST_DEGREE":
-            score += 5
-        if answers.get("personal_history_biopsy") == "YES_ATYPICAL_HYPERPLASIA":
-            score += 4
-        if answers.get("age_group") == "AGE_50_PLUS":
-            score += 4
-        
-        return max(0, score)  # Ensure score doesn't go below 0
\ No newline at end of file
+    async def get_mcq_risk_assessment(self, db: AsyncSession, user_id: int) -> McqAssessmentDto:
+        """Get the stored MCQ answers and risk level"""
+        row = (await db.execute(
+            select(
+                Profile.risk_assessment_mcq_codes,
+                Profile.risk_assessment_mcq_data,
+                Profile.breast_cancer_risk_level
+            ).where(Profile.user_id == user_id)
+        )).first()
+        if not row:
+            raise ValueError(f"Profile not found for user ID: {user_id}")
+        
+        codes, extras, risk_level = row
+        return McqAssessmentDto(answers=await decode_stored_answers(db, codes, extras), risk_level=risk_level)
+    
+    async def score_mcq_batch(self, db: AsyncSession, answer_sets: List[Dict[str, str]]) -> McqBatchResponse:
+        """Score many MCQ answer sets without storing them"""
+        rules = await self.risk_scoring_service.get_rules(db)
+        return McqBatchResponse(
+            rules_version=rules.version,
+            results=[
+                McqRiskResultDto(score=score, risk_level=risk_level)
+                for score, risk_level in rules.assess_many(answer_sets)
+            ]
+        )
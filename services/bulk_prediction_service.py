@@ -0,0 +1,129 @@
+"""
+Bulk cycle prediction service for She&Soul FastAPI application
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects import postgresql, sqlite
+
+from db.models.profile import Profile
+from db.models.period_log import CycleStats
+from db.models.cycle_prediction import CyclePrediction
+from services.cycle_prediction import predict_arrays
+from services.cycle_stats_service import CycleStatsService
+
+logger = logging.getLogger(__name__)
+
+def cycle_inputs_query():
+    """Prediction inputs for every profile with complete cycle data"""
+    return (
+        select(
+            Profile.user_id,
+            Profile.last_period_start_date,
+            Profile.cycle_length,
+            Profile.period_length,
+            CycleStats.cycle_count,
+            CycleStats.mean_cycle_length
+        )
+        .outerjoin(CycleStats, CycleStats.user_id == Profile.user_id)
+        .where(
+            Profile.last_period_start_date.is_not(None),
+            Profile.cycle_length.is_not(None),
+            Profile.period_length.is_not(None)
+        )
+        .order_by(Profile.user_id)
+    )
+
+
+def effective_cycle_lengths(cycle_lengths: Sequence, counts: Sequence, means: Sequence) -> np.ndarray:
+    """Estimated cycle length where enough cycles are logged, else the entered one"""
+    entered = np.array(cycle_lengths, dtype=np.int64)
+    observed = np.array([0 if c is None else c for c in counts], dtype=np.int64)
+    mean = np.array([np.nan if m is None else m for m in means], dtype=np.float64)
+    use_estimate = (observed >= CycleStatsService.MIN_CYCLES_FOR_ESTIMATE) & ~np.isnan(mean)
+    return np.where(use_estimate, np.rint(np.nan_to_num(mean)), entered).astype(np.int64)
+
+
+PREDICTION_COLUMNS = [
+    "next_period_start_date",
+    "next_period_end_date",
+    "next_ovulation_date",
+    "next_fertile_window_start_date",
+    "next_fertile_window_end_date",
+]
+
+
+class BulkPredictionService:
+    """
+    Recomputes cycle_predictions for every profile with cycle data.
+    Profiles are streamed through a server-side cursor in chunks, each chunk
+    is predicted with NumPy datetime64 arithmetic and upserted with one
+    executemany of an INSERT ... ON CONFLICT statement.
+    """
+
+    DEFAULT_CHUNK_SIZE = 10000
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def run(self, conn: Connection) -> int:
+        """Refresh predictions for all profiles and return how many were written"""
+        started = time.perf_counter()
+        total = 0
+
+        result = conn.execution_options(stream_results=True, yield_per=self.chunk_size).execute(
+            cycle_inputs_query()
+        )
+
+        for rows in result.partitions():
+            records = self.predict_chunk(rows)
+            self._upsert(conn, records)
+            total += len(records)
+            logger.info(f"Bulk prediction progress: {total} profiles")
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Bulk prediction finished: {total} profiles in {elapsed:.1f}s")
+        return total
+
+    def predict_chunk(self, rows: Sequence) -> List[Dict]:
+        """Predict one chunk of (user_id, last_start, cycle, period, count, mean) rows"""
+        if not rows:
+            return []
+
+        user_ids, last_dates, cycle_lengths, period_lengths, counts, means = zip(*rows)
+
+        predicted = predict_arrays(
+            np.array(last_dates, dtype="datetime64[D]"),
+            effective_cycle_lengths(cycle_lengths, counts, means),
+            np.array(period_lengths, dtype=np.int64)
+        )
+
+        computed_at = datetime.utcnow()
+        columns = [predicted[name].tolist() for name in PREDICTION_COLUMNS]
+        return [
+            dict(zip(PREDICTION_COLUMNS, values), user_id=user_id, computed_at=computed_at)
+            for user_id, values in zip(user_ids, zip(*columns))
+        ]
+
+    def _upsert(self, conn: Connection, records: List[Dict]) -> None:
+        """
+        Insert or update a chunk of predictions: one INSERT ... ON CONFLICT
+        run as an executemany over the chunk, which the driver batches
+        instead of issuing a round trip per row
+        """
+        if not records:
+            return
+
+        insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+        stmt = insert(CyclePrediction)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CyclePrediction.user_id],
+            set_={name: stmt.excluded[name] for name in PREDICTION_COLUMNS + ["computed_at"]}
+        )
+        conn.execute(stmt, records)
@@ -0,0 +1,261 @@
+"""
+Cycle prediction for She&Soul FastAPI application
+Based on Java implementation
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from api.schemas.profile import (
+    CyclePredictionDto, CycleCalendarDto, CyclePhase, PhaseRunDto,
+    DateIntervalDto, ProbabilisticCyclePredictionDto
+)
+from core.cache import TTLCache
+from core.config import settings
+from services.cycle_stats_service import CycleStatsService
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Fixed luteal phase length used by the prediction (same as Java)
+LUTEAL_DAYS = 14
+FERTILE_DAYS_BEFORE_OVULATION = 5
+
+# Probabilistic prediction: cycles older than this many cycles weigh half as much
+CYCLE_WEIGHT_HALF_LIFE = 6
+# Spread assumed until two cycles are logged, and the floor for fitted spreads
+PRIOR_CYCLE_STD_DAYS = 3.0
+MIN_CYCLE_STD_DAYS = 1.0
+# Most recent cycles fitted per request
+HISTORY_WINDOW_CYCLES = 12
+
+# Phase codes used by the vectorized calendar, in CyclePhase order
+PHASES = list(CyclePhase)
+PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+
+
+def compute_cycle_prediction(last_period_date: date, cycle_length: int, period_length: int) -> CyclePredictionDto:
+    """Predict the next cycle from its three inputs (same logic as Java)"""
+    next_period_start_date = last_period_date + timedelta(days=cycle_length)
+    following_period_start_date = next_period_start_date + timedelta(days=cycle_length)
+    next_ovulation_date = following_period_start_date - timedelta(days=14)
+
+    return CyclePredictionDto(
+        next_period_start_date=next_period_start_date,
+        next_period_end_date=next_period_start_date + timedelta(days=period_length - 1),
+        next_follicular_start_date=next_period_start_date,
+        next_follicular_end_date=next_ovulation_date,
+        next_ovulation_date=next_ovulation_date,
+        next_ovulation_end_date=next_ovulation_date + timedelta(days=1),
+        next_luteal_start_date=next_ovulation_date + timedelta(days=1),
+        next_luteal_end_date=next_ovulation_date + timedelta(days=14),
+        next_fertile_window_start_date=next_ovulation_date - timedelta(days=5),
+        next_fertile_window_end_date=next_ovulation_date + timedelta(days=1)
+    )
+
+
+def format_cycle_prediction(prediction: CyclePredictionDto) -> str:
+    """Render a cycle prediction as text for the assistant"""
+    return (
+        f"The user's next period is predicted to start on {prediction.next_period_start_date.strftime('%B %d, %Y')} "
+        f"and end on {prediction.next_period_end_date.strftime('%B %d, %Y')}. "
+        f"Their most fertile window is predicted to be between "
+        f"{prediction.next_fertile_window_start_date.strftime('%B %d, %Y')} and "
+        f"{prediction.next_fertile_window_end_date.strftime('%B %d, %Y')}."
+    )
+
+
+def forecast_cycles(last_period_date: date, cycle_length: int, period_length: int,
+                    cycles: int) -> List[CyclePredictionDto]:
+    """
+    Predict the next `cycles` cycles in one vectorized pass.
+    The first entry equals compute_cycle_prediction() for the same inputs.
+    """
+    starts = np.datetime64(last_period_date, "D") + cycle_length * np.arange(1, cycles + 1)
+    ovulations = starts + (cycle_length - LUTEAL_DAYS)
+
+    columns = zip(
+        starts.tolist(),
+        (starts + (period_length - 1)).tolist(),
+        ovulations.tolist(),
+        (ovulations + 1).tolist(),
+        (ovulations + LUTEAL_DAYS).tolist(),
+        (ovulations - FERTILE_DAYS_BEFORE_OVULATION).tolist()
+    )
+
+    return [
+        CyclePredictionDto(
+            next_period_start_date=start,
+            next_period_end_date=period_end,
+            next_follicular_start_date=start,
+            next_follicular_end_date=ovulation,
+            next_ovulation_date=ovulation,
+            next_ovulation_end_date=ovulation_end,
+            next_luteal_start_date=ovulation_end,
+            next_luteal_end_date=luteal_end,
+            next_fertile_window_start_date=fertile_start,
+            next_fertile_window_end_date=ovulation_end
+        )
+        for start, period_end, ovulation, ovulation_end, luteal_end, fertile_start in columns
+    ]
+
+
+def predict_arrays(last_period_dates: np.ndarray, cycle_lengths: np.ndarray,
+                   period_lengths: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Next-cycle prediction for many users at once.
+    Takes datetime64[D] start dates and integer lengths of equal shape and
+    returns datetime64[D] arrays keyed like CyclePrediction columns.
+    """
+    next_period_start = last_period_dates + cycle_lengths
+    next_ovulation = next_period_start + (cycle_lengths - LUTEAL_DAYS)
+
+    return {
+        "next_period_start_date": next_period_start,
+        "next_period_end_date": next_period_start + (period_lengths - 1),
+        "next_ovulation_date": next_ovulation,
+        "next_fertile_window_start_date": next_ovulation - FERTILE_DAYS_BEFORE_OVULATION,
+        "next_fertile_window_end_date": next_ovulation + 1
+    }
+
+
+def phase_codes(last_period_date: date, cycle_length: int, period_length: int,
+                start_date: date, end_date: date) -> np.ndarray:
+    """
+    Phase code (index into PHASES) for every day in [start_date, end_date].
+    Days are placed by their offset inside the cycle; the period wins over
+    every other phase and ovulation wins over the fertile window.
+    """
+    days = np.arange(
+        np.datetime64(start_date, "D"),
+        np.datetime64(end_date, "D") + 1
+    )
+    day_in_cycle = (days - np.datetime64(last_period_date, "D")).astype(np.int64) % cycle_length
+    ovulation_day = cycle_length - LUTEAL_DAYS
+
+    return np.select(
+        [
+            day_in_cycle < period_length,
+            (day_in_cycle >= ovulation_day) & (day_in_cycle <= ovulation_day + 1),
+            (day_in_cycle >= ovulation_day - FERTILE_DAYS_BEFORE_OVULATION) & (day_in_cycle < ovulation_day),
+            day_in_cycle > ovulation_day + 1
+        ],
+        [
+            PHASE_CODES[CyclePhase.PERIOD],
+            PHASE_CODES[CyclePhase.OVULATION],
+            PHASE_CODES[CyclePhase.FERTILE],
+            PHASE_CODES[CyclePhase.LUTEAL]
+        ],
+        default=PHASE_CODES[CyclePhase.FOLLICULAR]
+    )
+
+
+def phase_calendar(last_period_date: date, cycle_length: int, period_length: int,
+                   start_date: date, end_date: date) -> CycleCalendarDto:
+    """Per-day phase calendar for a date range, run-length encoded"""
+    codes = phase_codes(last_period_date, cycle_length, period_length, start_date, end_date)
+
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+    run_lengths = np.diff(np.append(run_starts, len(codes)))
+
+    runs = [
+        PhaseRunDto(
+            phase=PHASES[codes[offset]],
+            start_date=start_date + timedelta(days=int(offset)),
+            days=int(length)
+        )
+        for offset, length in zip(run_starts, run_lengths)
+    ]
+    return CycleCalendarDto(start_date=start_date, end_date=end_date, runs=runs)
+
+
+def predict_cycle_interval(period_start_dates: np.ndarray, fallback_cycle_length: int,
+                           confidence: float) -> ProbabilisticCyclePredictionDto:
+    """
+    Fit the user's cycle-length distribution from logged period starts
+    (datetime64[D], ascending) and return date intervals at `confidence`.
+    Recent cycles weigh more; with fewer than two logged cycles the
+    entered cycle length and a prior spread are used instead.
+    """
+    lengths = np.diff(period_start_dates).astype(np.int64)
+    lengths = lengths[
+        (lengths >= CycleStatsService.MIN_CYCLE_DAYS) & (lengths <= CycleStatsService.MAX_CYCLE_DAYS)
+    ]
+
+    if len(lengths) >= 2:
+        ages = np.arange(len(lengths) - 1, -1, -1)
+        weights = 0.5 ** (ages / CYCLE_WEIGHT_HALF_LIFE)
+        mean = float(np.average(lengths, weights=weights))
+        variance = float(np.average((lengths - mean) ** 2, weights=weights))
+        std = max(np.sqrt(variance * len(lengths) / (len(lengths) - 1)), MIN_CYCLE_STD_DAYS)
+    else:
+        mean = float(lengths[0]) if len(lengths) else float(fallback_cycle_length)
+        std = PRIOR_CYCLE_STD_DAYS
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    last_period_date = period_start_dates[-1]
+
+    # Next period is one cycle away; the predicted ovulation belongs to the
+    # following cycle (same convention as compute_cycle_prediction), so its
+    # uncertainty spans two cycle lengths.
+    centers = last_period_date + np.rint(np.array([mean, 2 * mean - LUTEAL_DAYS])).astype(np.int64)
+    spreads = np.ceil(z * std * np.sqrt([1.0, 2.0])).astype(np.int64)
+    earliest = (centers - spreads).tolist()
+    latest = (centers + spreads).tolist()
+    centers = centers.tolist()
+
+    return ProbabilisticCyclePredictionDto(
+        confidence=confidence,
+        cycles_observed=len(lengths),
+        mean_cycle_length=round(mean, 2),
+        cycle_length_std=round(float(std), 2),
+        next_period_start=DateIntervalDto(earliest=earliest[0], most_likely=centers[0], latest=latest[0]),
+        next_ovulation=DateIntervalDto(earliest=earliest[1], most_likely=centers[1], latest=latest[1]),
+        fertile_window_start_date=earliest[1] - timedelta(days=FERTILE_DAYS_BEFORE_OVULATION),
+        fertile_window_end_date=latest[1] + timedelta(days=1)
+    )
+
+
+@dataclass(frozen=True)
+class CachedPrediction:
+    """Prediction DTO together with its text rendering"""
+    prediction: CyclePredictionDto
+    text: str
+
+
+class CyclePredictionCache:
+    """
+    Memoizes predictions by (last_period_start_date, cycle_length,
+    period_length) plus the current UTC date, so entries roll over daily
+    and users sharing the same inputs share one entry.
+    """
+
+    def __init__(self, max_entries: int):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=SECONDS_PER_DAY)
+
+    def get(self, last_period_date: date, cycle_length: int, period_length: int,
+            today: Optional[date] = None) -> CachedPrediction:
+        """Return the cached prediction for these inputs, computing it on a miss"""
+        key = (last_period_date, cycle_length, period_length, today or datetime.utcnow().date())
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        prediction = compute_cycle_prediction(last_period_date, cycle_length, period_length)
+        cached = CachedPrediction(prediction=prediction, text=format_cycle_prediction(prediction))
+        self._cache.set(key, cached)
+        return cached
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics of the underlying cache"""
+        return self._cache.stats()
+
+    def clear(self) -> None:
+        """Forget every cached prediction"""
+        self._cache.clear()
+
+
+prediction_cache = CyclePredictionCache(max_entries=settings.PREDICTION_CACHE_MAX_ENTRIES)
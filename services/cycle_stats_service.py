@@ -0,0 +1,114 @@
+"""
+Cycle statistics service for She&Soul FastAPI application
+"""
+
+import math
+from datetime import date
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from db.models.period_log import PeriodLog, CycleStats
+
+class CycleStatsService:
+    """Records period history and keeps per-user cycle-length statistics current"""
+
+    # Gaps outside this range are skipped periods or typos, not cycle lengths
+    MIN_CYCLE_DAYS = 15
+    MAX_CYCLE_DAYS = 90
+
+    # Observed cycles needed before the estimate replaces the user-entered length
+    MIN_CYCLES_FOR_ESTIMATE = 2
+
+    async def record_period(self, db: AsyncSession, user_id: int, start_date: date, end_date: Optional[date] = None) -> CycleStats:
+        """
+        Log a period start and fold the new cycle length into the stats row.
+        Appending a newer start is O(1); back-filling an older one rebuilds
+        the stats from history. Changes are flushed, not committed.
+        """
+        existing = await db.scalar(
+            select(PeriodLog).where(
+                PeriodLog.user_id == user_id,
+                PeriodLog.start_date == start_date
+            )
+        )
+
+        if existing:
+            if end_date:
+                existing.end_date = end_date
+            return await self.get_stats(db, user_id) or await self._rebuild(db, user_id)
+
+        db.add(PeriodLog(user_id=user_id, start_date=start_date, end_date=end_date))
+
+        stats = await self.get_stats(db, user_id)
+        if stats is None:
+            stats = CycleStats(user_id=user_id, cycle_count=0, m2=0.0)
+            db.add(stats)
+
+        if stats.last_period_start_date is None:
+            stats.last_period_start_date = start_date
+        elif start_date > stats.last_period_start_date:
+            self._add_cycle(stats, (start_date - stats.last_period_start_date).days)
+            stats.last_period_start_date = start_date
+        else:
+            await db.flush()
+            return await self._rebuild(db, user_id)
+
+        await db.flush()
+        return stats
+
+    async def get_stats(self, db: AsyncSession, user_id: int) -> Optional[CycleStats]:
+        """Get the stats row for a user"""
+        return await db.get(CycleStats, user_id)
+
+    def estimated_cycle_length(self, cycle_count: Optional[int], mean_cycle_length: Optional[float]) -> Optional[int]:
+        """Rounded mean cycle length once enough cycles have been observed"""
+        if not cycle_count or cycle_count < self.MIN_CYCLES_FOR_ESTIMATE or mean_cycle_length is None:
+            return None
+        return int(round(mean_cycle_length))
+
+    def _add_cycle(self, stats: CycleStats, cycle_length: int) -> None:
+        """Welford update of count, mean and M2 with one cycle length"""
+        if not self.MIN_CYCLE_DAYS <= cycle_length <= self.MAX_CYCLE_DAYS:
+            return
+
+        count = stats.cycle_count + 1
+        mean = stats.mean_cycle_length or 0.0
+        delta = cycle_length - mean
+        mean += delta / count
+
+        stats.cycle_count = count
+        stats.mean_cycle_length = mean
+        stats.m2 = stats.m2 + delta * (cycle_length - mean)
+        stats.regularity_score = self._regularity(count, stats.m2)
+
+    async def _rebuild(self, db: AsyncSession, user_id: int) -> CycleStats:
+        """Recompute the stats row from the full history"""
+        starts = (await db.scalars(
+            select(PeriodLog.start_date)
+            .where(PeriodLog.user_id == user_id)
+            .order_by(PeriodLog.start_date)
+        )).all()
+
+        stats = await self.get_stats(db, user_id)
+        if stats is None:
+            stats = CycleStats(user_id=user_id)
+            db.add(stats)
+
+        stats.cycle_count = 0
+        stats.mean_cycle_length = None
+        stats.m2 = 0.0
+        stats.regularity_score = None
+        stats.last_period_start_date = starts[-1] if starts else None
+
+        for previous, current in zip(starts, starts[1:]):
+            self._add_cycle(stats, (current - previous).days)
+
+        await db.flush()
+        return stats
+
+    @staticmethod
+    def _regularity(count: int, m2: float) -> Optional[float]:
+        """1 / (1 + sample standard deviation), undefined below two cycles"""
+        if count < 2:
+            return None
+        return 1.0 / (1.0 + math.sqrt(m2 / (count - 1)))
@@ -0,0 +1,231 @@
+"""
+Compact MCQ answer encoding for She&Soul FastAPI application
+Answers are stored as one code byte per question, in QUESTIONS order.
+Codes live in the append-only mcq_answer_codes table: any answer a client
+sends for a known question gets the next free code of that question the
+first time it is seen, so stored rows normally carry no JSONB extras and
+analytics can join the codes back to their answers.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models.mcq_answer_code import McqAnswerCode
+from services.risk_scoring_service import CompiledRuleSet
+
+# Code 0 means "not answered". These codes were assigned before the
+# mcq_answer_codes table existed (the migration seeds them); never reorder
+# or remove an entry. New questions are appended here, new answers only go
+# to the table.
+MCQ_VOCABULARY: Dict[str, Tuple[str, ...]] = {
+    "menstruation_start_age": ("MENSTRUATION_START_LT_12",),
+    "menopause_status": ("MENOPAUSE_YES_GT_55",),
+    "pregnancy_history": ("PREGNANCY_NO",),
+    "breastfeeding_history": ("BREASTFED_NO", "BREASTFED_NA", "BREASTFED_YES_GT_6MO"),
+    "alcohol_use": ("ALCOHOL_WEEKLY", "ALCOHOL_DAILY"),
+    "smoking_status": ("SMOKING_OCCASIONALLY", "SMOKING_REGULARLY"),
+    "hrt_use": ("HRT_YES_LT_5Y", "HRT_YES_GT_5Y"),
+    "oral_contraceptives_use": ("OC_YES_LT_5Y", "OC_YES_GT_5Y"),
+    "family_history": ("YES_FIRST_DEGREE",),
+    "personal_history_biopsy": ("YES_ATYPICAL_HYPERPLASIA",),
+    "age_group": ("AGE_50_PLUS",),
+}
+
+QUESTIONS: List[str] = list(MCQ_VOCABULARY)
+QUESTION_INDEX: Dict[str, int] = {question: i for i, question in enumerate(QUESTIONS)}
+
+# Codes are stored in one byte
+MAX_CODE = 255
+# Longer answers are free text rather than a choice; they stay in the extras
+MAX_ANSWER_LENGTH = 64
+ADD_CODE_ATTEMPTS = 3
+
+
+class AnswerCodebook:
+    """
+    Per-worker copy of mcq_answer_codes. Codes are never reassigned, so a
+    stale copy is only incomplete: add_codes() registers answers seen for
+    the first time and load() picks up codes added by other workers.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def _set(self, rows: Iterable[Tuple[str, int, str]]) -> None:
+        codes: Dict[str, Dict[str, int]] = {question: {} for question in QUESTIONS}
+        answers: Dict[str, Dict[int, str]] = {question: {} for question in QUESTIONS}
+        seeded = [
+            (question, code, answer)
+            for question, choices in MCQ_VOCABULARY.items()
+            for code, answer in enumerate(choices, start=1)
+        ]
+        for question, code, answer in seeded + list(rows):
+            if question in codes:
+                codes[question][answer] = code
+                answers[question][code] = answer
+        # One assignment, so readers never see half of a reload
+        self._maps = (codes, answers)
+
+    def code(self, question: str, answer: str) -> Optional[int]:
+        return self._maps[0].get(question, {}).get(answer)
+
+    def uncoded(self, pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """(question, answer) pairs of known questions whose answer has no code yet"""
+        return [
+            (question, answer) for question, answer in pairs
+            if question in QUESTION_INDEX and isinstance(answer, str)
+            and len(answer) <= MAX_ANSWER_LENGTH and self.code(question, answer) is None
+        ]
+
+    def has_unknown_codes(self, codes: Optional[bytes]) -> bool:
+        """True when codes contain a code added after this copy was loaded"""
+        answers = self._maps[1]
+        return bool(codes) and any(code and code not in answers[question] for question, code in zip(QUESTIONS, codes))
+
+    def encode(self, answers: Dict[str, str]) -> Tuple[bytes, Optional[Dict[str, str]]]:
+        """
+        Encode answers as one byte per question in QUESTIONS order.
+        Answers without a code are returned as extras so nothing the client
+        sent is lost; extras is None when every answer was encoded.
+        """
+        known = self._maps[0]
+        codes = bytearray(len(QUESTIONS))
+        extras = {}
+        for question, answer in answers.items():
+            code = known.get(question, {}).get(answer)
+            if code is None:
+                extras[question] = answer
+            else:
+                codes[QUESTION_INDEX[question]] = code
+        return bytes(codes), extras or None
+
+    def decode(self, codes: Optional[bytes], extras: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Rebuild the answers dict from stored codes and extras (KeyError for an unknown code)"""
+        known = self._maps[1]
+        answers = {}
+        if codes:
+            for question, code in zip(QUESTIONS, codes):
+                if code:
+                    answers[question] = known[question][code]
+        if extras:
+            answers.update(extras)
+        return answers
+
+    def reset(self) -> None:
+        """Forget loaded codes, keeping the built-in ones"""
+        self._set([])
+
+    def load(self, conn) -> None:
+        """Reload every code from the table (Connection or Session)"""
+        self._set(conn.execute(select(McqAnswerCode.question, McqAnswerCode.code, McqAnswerCode.answer)).all())
+
+    def add_codes(self, conn: Connection, pairs: Sequence[Tuple[str, str]]) -> None:
+        """
+        Give each (question, answer) pair the next free code of its question,
+        commit and reload (also when pairs is empty). Workers racing for the same code conflict on the
+        primary key and retry with the next one; a question that ran out of
+        codes keeps its new answers in the extras.
+        """
+        insert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+        pending = list(dict.fromkeys(pairs))
+        for _ in range(ADD_CODE_ATTEMPTS):
+            for question, answer in pending:
+                # The floor keeps codes clear of the built-in ones on an unseeded table
+                last_code = func.coalesce(func.max(McqAnswerCode.code), len(MCQ_VOCABULARY[question]))
+                conn.execute(
+                    insert(McqAnswerCode)
+                    .from_select(
+                        ["question", "code", "answer"],
+                        select(literal(question), last_code + 1, literal(answer))
+                        .where(McqAnswerCode.question == question)
+                        .having(last_code < MAX_CODE)
+                    )
+                    .on_conflict_do_nothing()
+                )
+                conn.commit()
+            self.load(conn)
+            conn.commit()
+            pending = [(question, answer) for question, answer in pending if self.code(question, answer) is None]
+            if not pending:
+                return
+
+
+codebook = AnswerCodebook()
+
+
+def encode_answers(answers: Dict[str, str]) -> Tuple[bytes, Optional[Dict[str, str]]]:
+    """Encode with the codes known to this worker (see AnswerCodebook.encode)"""
+    return codebook.encode(answers)
+
+
+def decode_answers(codes: Optional[bytes], extras: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Decode with the codes known to this worker (see AnswerCodebook.decode)"""
+    return codebook.decode(codes, extras)
+
+
+async def encode_new_answers(db: AsyncSession, answers: Dict[str, str]) -> Tuple[bytes, Optional[Dict[str, str]]]:
+    """
+    Encode answers, first registering codes for answers seen for the first
+    time. Codes are committed on their own connection, so they stay valid
+    even if the caller's transaction rolls back.
+    """
+    pairs = codebook.uncoded(answers.items())
+    if pairs:
+        async with db.bind.connect() as conn:
+            await conn.run_sync(codebook.add_codes, pairs)
+    return codebook.encode(answers)
+
+
+async def decode_stored_answers(db: AsyncSession, codes: Optional[bytes],
+                                extras: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Decode stored answers, reloading the codebook if another worker added their codes"""
+    if codebook.has_unknown_codes(codes):
+        await db.run_sync(codebook.load)
+    return codebook.decode(codes, extras)
+
+
+def code_matrix(rows: Sequence[Optional[bytes]]) -> np.ndarray:
+    """Stack encoded rows into an (n, len(QUESTIONS)) uint8 matrix; short or missing rows are zero-padded"""
+    matrix = np.zeros((len(rows), len(QUESTIONS)), dtype=np.uint8)
+    for i, codes in enumerate(rows):
+        if codes:
+            matrix[i, :len(codes)] = np.frombuffer(codes, dtype=np.uint8)
+    return matrix
+
+
+def weight_table(rules: CompiledRuleSet) -> np.ndarray:
+    """
+    Per-question weight table indexed by answer code, for vectorized scoring.
+    Rule answers without a code can only occur in the extras and are left
+    out; score those with extras_score().
+    """
+    table = np.zeros((len(QUESTIONS), MAX_CODE + 1), dtype=np.int64)
+    for question, weights in rules.weights.items():
+        for answer, weight in weights.items():
+            code = codebook.code(question, answer)
+            if code is not None:
+                table[QUESTION_INDEX[question], code] = weight
+    return table
+
+
+def extras_score(rules: CompiledRuleSet, extras: Optional[Dict[str, str]]) -> int:
+    """Unclamped weight of the answers kept in the extras (0 for most rows)"""
+    if not extras:
+        return 0
+    return sum(rules.weights.get(question, {}).get(answer, 0) for question, answer in extras.items())
+
+
+def score_matrix(codes: np.ndarray, table: np.ndarray, extra: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Risk scores for every row of a code matrix (same result as
+    CompiledRuleSet.score); extra adds each row's extras_score()
+    """
+    scores = table[np.arange(len(QUESTIONS)), codes].sum(axis=1)
+    if extra is not None:
+        scores = scores + np.asarray(extra, dtype=np.int64)
+    return np.maximum(scores, 0)
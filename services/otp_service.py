@@ -6,12 +6,12 @@ Based on Java implementation
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
 from db.models.otp import Otp
 
 class OtpGenerationService:
-    """Service for generating and managing OTPs"""
+    """Service for generating and managing OTPs (changes are flushed; the caller commits)"""
     
     OTP_LENGTH = 6
     OTP_EXPIRY_MINUTES = 10
@@ -23,7 +23,7 @@ class OtpGenerationService:
         """Generate a 6-digit OTP"""
         return str(secrets.randbelow(900000) + 100000)
     
-    def store_otp(self, db: Session, email: str, otp: str) -> None:
+    async def store_otp(self, db: AsyncSession, email: str, otp: str) -> None:
         """Store OTP in database with expiration time"""
         otp_entity = Otp(
             email=email,
@@ -34,45 +34,43 @@ class OtpGenerationService:
         )
         
         db.add(otp_entity)
-        db.commit()
+        await db.flush()
     
-    def get_latest_otp(self, db: Session, email: str) -> Optional[str]:
+    async def get_latest_otp(self, db: AsyncSession, email: str) -> Optional[str]:
         """Get the latest valid OTP for an email"""
         now = datetime.utcnow()
         
-        otp_entity = db.query(Otp).filter(
-            Otp.email == email,
-            Otp.expires_at > now,
-            Otp.used == False
-        ).order_by(Otp.created_at.desc()).first()
-        
-        return otp_entity.otp_code if otp_entity else None
+        return await db.scalar(
+            select(Otp.otp_code).where(
+                Otp.email == email,
+                Otp.expires_at > now,
+                Otp.used == False
+            ).order_by(Otp.created_at.desc()).limit(1)
+        )
     
-    def is_otp_valid(self, db: Session, email: str, otp_code: str) -> Optional[Otp]:
+    async def is_otp_valid(self, db: AsyncSession, email: str, otp_code: str) -> Optional[Otp]:
         """Check if the provided OTP is valid and return it if found"""
         now = datetime.utcnow()
         
-        otp_entity = db.query(Otp).filter(
-            Otp.email == email,
-            Otp.otp_code == otp_code,
-            Otp.expires_at > now,
-            Otp.used == False
-        ).first()
-        
-        return otp_entity
+        return await db.scalar(
+            select(Otp).where(
+                Otp.email == email,
+                Otp.otp_code == otp_code,
+                Otp.expires_at > now,
+                Otp.used == False
+            ).limit(1)
+        )
     
-    def mark_otp_as_used(self, db: Session, otp: Otp) -> None:
+    async def mark_otp_as_used(self, db: AsyncSession, otp: Otp) -> None:
         """Mark a specific OTP as used"""
         otp.used = True
-        db.commit()
+        await db.flush()
     
-    def clear_otps(self, db: Session, email: str) -> None:
+    async def clear_otps(self, db: AsyncSession, email: str) -> None:
         """Clear all OTPs for an email"""
-        db.query(Otp).filter(Otp.email == email).delete()
-        db.commit()
+        await db.execute(delete(Otp).where(Otp.email == email))
     
-    def cleanup_expired_otps(self, db: Session) -> None:
+    async def cleanup_expired_otps(self, db: AsyncSession) -> None:
         """Clean up expired OTPs"""
         now = datetime.utcnow()
-        db.query(Otp).filter(Otp.expires_at <= now).delete()
-        db.commit()
+        await db.execute(delete(Otp).where(Otp.expires_at <= now))
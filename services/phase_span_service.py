@@ -0,0 +1,110 @@
+"""
+Cycle phase span service for She&Soul FastAPI application
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.profile import CyclePhase
+from db.models.cycle_phase_span import CyclePhaseSpan, span_range
+from services.bulk_prediction_service import cycle_inputs_query, effective_cycle_lengths
+from services.cycle_prediction import phase_calendar
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseSpanService:
+    """
+    Maintains cycle_phase_spans, the materialized per-user phase intervals
+    that back "who is in phase X on date D" queries. A user's spans are
+    rebuilt whenever their menstrual data changes; refresh_all() runs
+    nightly to roll every horizon forward.
+    """
+
+    # Days of future phases materialized per user (about four cycles)
+    HORIZON_DAYS = 120
+    DEFAULT_CHUNK_SIZE = 5000
+
+    def spans_for(self, user_id: int, last_period_date: date, cycle_length: int, period_length: int,
+                  today: date) -> List[Dict]:
+        """Phase spans covering [today, today + HORIZON_DAYS) for one user"""
+        calendar = phase_calendar(
+            last_period_date, cycle_length, period_length,
+            today, today + timedelta(days=self.HORIZON_DAYS - 1)
+        )
+        return [
+            {
+                "user_id": user_id,
+                "phase": run.phase.value,
+                "start_date": run.start_date,
+                "end_date": run.start_date + timedelta(days=run.days - 1)
+            }
+            for run in calendar.runs
+        ]
+
+    async def refresh_user(self, db: AsyncSession, user_id: int, last_period_date: date, cycle_length: int,
+                           period_length: int, today: Optional[date] = None) -> None:
+        """Replace one user's spans after their menstrual data changed"""
+        today = today or datetime.utcnow().date()
+        await db.execute(delete(CyclePhaseSpan).where(CyclePhaseSpan.user_id == user_id))
+        await db.execute(
+            insert(CyclePhaseSpan),
+            self.spans_for(user_id, last_period_date, cycle_length, period_length, today)
+        )
+
+    def refresh_all(self, conn: Connection, today: Optional[date] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Nightly rollover: rebuild every user's spans from today onwards"""
+        today = today or datetime.utcnow().date()
+        started = time.perf_counter()
+        total = 0
+
+        conn.execute(delete(CyclePhaseSpan).where(CyclePhaseSpan.end_date < today))
+
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+            cycle_inputs_query()
+        )
+        for rows in result.partitions():
+            self._refresh_chunk(conn, rows, today)
+            total += len(rows)
+            logger.info(f"Phase span refresh progress: {total} profiles")
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Phase span refresh finished: {total} profiles in {elapsed:.1f}s")
+        return total
+
+    async def users_in_phase(self, db: AsyncSession, phase: CyclePhase, on_date: date) -> List[int]:
+        """User IDs whose materialized phase on the given date is `phase`"""
+        query = select(CyclePhaseSpan.user_id).where(CyclePhaseSpan.phase == phase.value)
+
+        if db.get_bind().dialect.name == "postgresql":
+            # Same expression as the GiST index so the planner can use it
+            query = query.where(
+                span_range(CyclePhaseSpan.start_date, CyclePhaseSpan.end_date).op("@>")(on_date)
+            )
+        else:
+            query = query.where(
+                CyclePhaseSpan.start_date <= on_date,
+                CyclePhaseSpan.end_date >= on_date
+            )
+
+        return list(await db.scalars(query))
+
+    def _refresh_chunk(self, conn: Connection, rows: Sequence, today: date) -> None:
+        """Delete and re-insert spans for one streamed chunk of profiles"""
+        user_ids, last_dates, cycle_lengths, period_lengths, counts, means = zip(*rows)
+        cycles = effective_cycle_lengths(cycle_lengths, counts, means).tolist()
+
+        spans = []
+        for user_id, last_date, cycle_length, period_length in zip(user_ids, last_dates, cycles, period_lengths):
+            spans.extend(self.spans_for(user_id, last_date, cycle_length, period_length, today))
+
+        conn.execute(delete(CyclePhaseSpan).where(CyclePhaseSpan.user_id.in_(user_ids)))
+        if spans:
+            conn.execute(insert(CyclePhaseSpan), spans)
@@ -0,0 +1,105 @@
+"""
+Profile snapshot cache for She&Soul FastAPI application
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from core.cache import TTLCache
+from core.config import settings
+from db.models.profile import Profile, UserType, UserServiceType
+from db.models.period_log import CycleStats
+
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """Immutable copy of the profile columns read by the hot paths"""
+    id: int
+    user_id: int
+    name: str
+    nick_name: Optional[str]
+    user_type: UserType
+    referral_code: Optional[str]
+    referred_code: Optional[str]
+    preferred_service_type: Optional[UserServiceType]
+    period_length: Optional[int]
+    cycle_length: Optional[int]
+    last_period_start_date: Optional[date]
+    last_period_end_date: Optional[date]
+    language_code: Optional[str]
+    # Precomputed from period_logs (see CycleStatsService)
+    cycle_count: Optional[int] = None
+    mean_cycle_length: Optional[float] = None
+
+
+STATS_FIELDS = ("cycle_count", "mean_cycle_length")
+
+SNAPSHOT_COLUMNS = [
+    getattr(CycleStats if name in STATS_FIELDS else Profile, name)
+    for name in ProfileSnapshot.__dataclass_fields__
+]
+
+
+class ProfileCache:
+    """
+    Read-through cache of profile snapshots keyed by user_id.
+    Snapshots are detached from any session, so they are safe to share
+    between requests; writers must call invalidate() after committing.
+    Each invalidate() bumps the user's generation, and a load only fills
+    the cache if the generation is unchanged since it started, so a read
+    that raced a write cannot put the old row back.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._generations: Dict[int, int] = {}
+        # Bumped when the generations are dropped, which keeps them bounded
+        self._epoch = 0
+
+    def _generation(self, user_id: int) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(user_id, 0)
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[ProfileSnapshot]:
+        """Return the profile snapshot for a user, loading it on a miss"""
+        snapshot = self._cache.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        generation = self._generation(user_id)
+
+        row = (await db.execute(
+            select(*SNAPSHOT_COLUMNS)
+            .outerjoin(CycleStats, CycleStats.user_id == Profile.user_id)
+            .where(Profile.user_id == user_id)
+        )).first()
+        if not row:
+            return None
+
+        snapshot = ProfileSnapshot(**row._mapping)
+        if self._generation(user_id) == generation:
+            self._cache.set(user_id, snapshot)
+        return snapshot
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget the cached snapshot for a user and discard loads already in flight"""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        if len(self._generations) > self.max_entries:
+            self._generations.clear()
+            self._epoch += 1
+        self._cache.invalidate(user_id)
+
+    def clear(self) -> None:
+        """Forget every cached snapshot"""
+        self._generations.clear()
+        self._epoch += 1
+        self._cache.clear()
+
+
+profile_cache = ProfileCache(
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,236 @@
+"""
+Risk rescoring service for She&Soul FastAPI application
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, insert, or_, select, update
+from sqlalchemy.engine import Connection
+
+from db.models.profile import Profile
+from db.models.risk_assessment import RiskAssessment, RiskRescoreJob
+from services.mcq_codec import codebook, code_matrix, extras_score, score_matrix, weight_table
+from services.risk_scoring_service import CompiledRuleSet, risk_scoring_service
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SUBMISSION = "SUBMISSION"
+SOURCE_RESCORE = "RESCORE"
+
+
+class RiskRescoringService:
+    """
+    Rescores every profile's latest MCQ answers with the current rule
+    version. Profiles are walked in keyset-paginated chunks; each chunk
+    updates the changed risk levels, appends their history rows and
+    advances the risk_rescore_jobs checkpoint in one transaction, so an
+    interrupted run resumes where it stopped. Profiles submitted with an
+    older rule version since the run started are rescored on every call.
+    """
+
+    DEFAULT_CHUNK_SIZE = 5000
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def run(self, conn: Connection, rules: Optional[CompiledRuleSet] = None) -> Dict[str, Any]:
+        """
+        Rescore all profiles (or resume the unfinished run), then every
+        profile submitted since the run started with older rules, and
+        return the job state. Workers cache rules for up to
+        RiskScoringService.RELOAD_SECONDS, so a submission can be scored
+        with the old version after the cursor passed its profile; the
+        sweep runs on every call, including after the job finished.
+        """
+        rules = rules or risk_scoring_service.load_rules(conn)
+        job = self._start_job(conn, rules.version)
+
+        # Scored answers get codes before the table is built, so an answer
+        # coded later during the run is unscored and weighs 0 in the table
+        codebook.load(conn)
+        codebook.add_codes(conn, codebook.uncoded(
+            (question, answer) for question, weights in rules.weights.items() for answer in weights
+        ))
+        table = weight_table(rules)
+
+        started = time.perf_counter()
+        if job["finished_at"] is None:
+            processed = 0
+            for rows in self._chunks(conn, job["last_profile_id"]):
+                changed = self._rescore_chunk(conn, rows, rules, table)
+                job["last_profile_id"] = rows[-1].id
+                job["processed"] += len(rows)
+                job["changed"] += changed
+                self._save_job(conn, job)
+                conn.commit()
+
+                processed += len(rows)
+                rate = processed / max(time.perf_counter() - started, 1e-9)
+                logger.info(
+                    f"Risk rescoring progress: {job['processed']} profiles, "
+                    f"{job['changed']} changed, {rate:.0f} profiles/s"
+                )
+            job["finished_at"] = datetime.utcnow()
+
+        stale = (
+            select(RiskAssessment.user_id)
+            .where(
+                RiskAssessment.source == SOURCE_SUBMISSION,
+                RiskAssessment.rules_version < rules.version,
+                RiskAssessment.created_at >= job["started_at"]
+            )
+        )
+        swept = 0
+        for rows in self._chunks(conn, 0, Profile.user_id.in_(stale)):
+            swept += len(rows)
+            job["changed"] += self._rescore_chunk(conn, rows, rules, table)
+            self._save_job(conn, job)
+            conn.commit()
+
+        self._save_job(conn, job)
+        conn.commit()
+        logger.info(
+            f"Risk rescoring finished for rules version {rules.version}: "
+            f"{job['processed']} profiles, {swept} submitted with older rules, "
+            f"{job['changed']} changed in {time.perf_counter() - started:.1f}s"
+        )
+        return job
+
+    def _chunks(self, conn: Connection, after_id: int, *conditions) -> Iterator[Sequence]:
+        """Profiles with MCQ answers in keyset-paginated chunks of (id, user_id, codes, extras, level) rows"""
+        while True:
+            rows = conn.execute(
+                select(
+                    Profile.id,
+                    Profile.user_id,
+                    Profile.risk_assessment_mcq_codes,
+                    Profile.risk_assessment_mcq_data,
+                    Profile.breast_cancer_risk_level
+                )
+                .where(
+                    Profile.id > after_id,
+                    or_(
+                        Profile.risk_assessment_mcq_codes.is_not(None),
+                        Profile.risk_assessment_mcq_data.is_not(None)
+                    ),
+                    *conditions
+                )
+                .order_by(Profile.id)
+                .limit(self.chunk_size)
+            ).all()
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1].id
+
+    def score_rows(self, rows: Sequence, rules: CompiledRuleSet, table: np.ndarray) -> List[int]:
+        """
+        Scores for (id, user_id, codes, extras, level) rows, all vectorized:
+        a question is either coded or kept in the extras, so the weight of
+        the extras (nonzero only when they hold a scored answer) is added
+        to the row's table score before clamping
+        """
+        matrix = code_matrix([row.risk_assessment_mcq_codes for row in rows])
+        extra = [extras_score(rules, row.risk_assessment_mcq_data) for row in rows]
+        return score_matrix(matrix, table, extra).tolist()
+
+    def _rescore_chunk(self, conn: Connection, rows: Sequence, rules: CompiledRuleSet, table: np.ndarray) -> int:
+        """
+        Update levels that changed and append their history rows. A profile
+        whose level or codes changed since the chunk was read (a submission
+        landed in between) is skipped: its new answers were scored by the
+        submission, and the stale-rules sweep covers older versions.
+        """
+        now = datetime.utcnow()
+        changed = []
+        for row, score in zip(rows, self.score_rows(rows, rules, table)):
+            risk_level = rules.risk_level(score)
+            if risk_level != row.breast_cancer_risk_level:
+                changed.append((row, score, risk_level))
+        if not changed:
+            return 0
+
+        profiles = Profile.__table__
+        # Lock the rows (PostgreSQL) so they cannot change between this check and the UPDATE
+        current = {
+            profile_id: (level, codes)
+            for profile_id, level, codes in conn.execute(
+                select(profiles.c.id, profiles.c.breast_cancer_risk_level, profiles.c.risk_assessment_mcq_codes)
+                .where(profiles.c.id.in_([row.id for row, _, _ in changed]))
+                .with_for_update()
+            )
+        }
+
+        updates = []
+        history = []
+        for row, score, risk_level in changed:
+            if current.get(row.id) != (row.breast_cancer_risk_level, row.risk_assessment_mcq_codes):
+                continue
+            updates.append({
+                "profile_id": row.id,
+                "old_level": row.breast_cancer_risk_level,
+                "old_codes": row.risk_assessment_mcq_codes,
+                "risk_level": risk_level
+            })
+            history.append({
+                "user_id": row.user_id,
+                "answer_codes": row.risk_assessment_mcq_codes,
+                "extra_answers": row.risk_assessment_mcq_data,
+                "score": score,
+                "risk_level": risk_level,
+                "rules_version": rules.version,
+                "source": SOURCE_RESCORE,
+                "created_at": now
+            })
+
+        if updates:
+            # Guarded as well, for databases without row locks
+            conn.execute(
+                update(profiles)
+                .where(
+                    profiles.c.id == bindparam("profile_id"),
+                    profiles.c.breast_cancer_risk_level.is_not_distinct_from(bindparam("old_level")),
+                    profiles.c.risk_assessment_mcq_codes.is_not_distinct_from(bindparam("old_codes"))
+                )
+                .values(breast_cancer_risk_level=bindparam("risk_level")),
+                updates
+            )
+            conn.execute(insert(RiskAssessment), history)
+        return len(updates)
+
+    def _start_job(self, conn: Connection, rules_version: int) -> Dict[str, Any]:
+        """Load the checkpoint for this rule version, creating it on the first run"""
+        row = conn.execute(
+            select(RiskRescoreJob.__table__).where(RiskRescoreJob.rules_version == rules_version)
+        ).first()
+        if row:
+            return dict(row._mapping)
+
+        job = {
+            "rules_version": rules_version,
+            "last_profile_id": 0,
+            "processed": 0,
+            "changed": 0,
+            "started_at": datetime.utcnow(),
+            "finished_at": None
+        }
+        conn.execute(insert(RiskRescoreJob), job)
+        conn.commit()
+        return job
+
+    def _save_job(self, conn: Connection, job: Dict[str, Any]) -> None:
+        """Persist the checkpoint"""
+        conn.execute(
+            update(RiskRescoreJob)
+            .where(RiskRescoreJob.rules_version == job["rules_version"])
+            .values(
+                last_profile_id=job["last_profile_id"],
+                processed=job["processed"],
+                changed=job["changed"],
+                finished_at=job["finished_at"]
+            )
+        )
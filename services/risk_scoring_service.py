@@ -0,0 +1,145 @@
+"""
+MCQ risk scoring service for She&Soul FastAPI application
+Rules mirror the Java implementation and are versioned in mcq_scoring_rules
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from db.models.risk_rule import McqScoringRule
+
+# Version 1 is the Java rule set; the migration seeds it into mcq_scoring_rules
+DEFAULT_RULES_VERSION = 1
+DEFAULT_RULES: List[Tuple[str, str, int]] = [
+    # Menstrual & Reproductive History
+    ("menstruation_start_age", "MENSTRUATION_START_LT_12", 1),
+    ("menopause_status", "MENOPAUSE_YES_GT_55", 2),
+    ("pregnancy_history", "PREGNANCY_NO", 1),  # Nulliparity
+    ("breastfeeding_history", "BREASTFED_NO", 1),
+    ("breastfeeding_history", "BREASTFED_NA", 1),  # Same as no
+    ("breastfeeding_history", "BREASTFED_YES_GT_6MO", -1),  # Protective factor
+    # Lifestyle & Hormonal Factors
+    ("alcohol_use", "ALCOHOL_WEEKLY", 1),
+    ("alcohol_use", "ALCOHOL_DAILY", 2),
+    ("smoking_status", "SMOKING_OCCASIONALLY", 1),
+    ("smoking_status", "SMOKING_REGULARLY", 2),
+    ("hrt_use", "HRT_YES_LT_5Y", 1),
+    ("hrt_use", "HRT_YES_GT_5Y", 2),
+    ("oral_contraceptives_use", "OC_YES_LT_5Y", 1),
+    ("oral_contraceptives_use", "OC_YES_GT_5Y", 2),
+    # High-impact factors
+    ("family_history", "YES_FIRST_DEGREE", 5),
+    ("personal_history_biopsy", "YES_ATYPICAL_HYPERPLASIA", 4),
+    ("age_group", "AGE_50_PLUS", 4),
+]
+
+HIGH_RISK_SCORE = 10
+MODERATE_RISK_SCORE = 5
+
+class CompiledRuleSet:
+    """
+    Rule rows folded into a per-question lookup at load time.
+    Scoring reads each question's answer once and looks up its weight,
+    so a request does no per-rule comparisons.
+    """
+    
+    def __init__(self, version: int, rules: Iterable[Tuple[str, str, int]]):
+        self.version = version
+        self.weights: Dict[str, Dict[str, int]] = {}
+        for question, answer, weight in rules:
+            answers = self.weights.setdefault(str(question), {})
+            answers[str(answer)] = answers.get(str(answer), 0) + int(weight)
+        self._lookups = tuple((question, answers.get) for question, answers in self.weights.items())
+    
+    def score(self, answers: Dict[str, str]) -> int:
+        """Sum of the weights of the scored answers (never below 0)"""
+        get = answers.get
+        score = 0
+        for question, weight in self._lookups:
+            score += weight(get(question), 0)
+        return score if score > 0 else 0
+    
+    @staticmethod
+    def risk_level(score: int) -> str:
+        """Map a score to its risk level"""
+        if score >= HIGH_RISK_SCORE:
+            return "High Risk"
+        if score >= MODERATE_RISK_SCORE:
+            return "Moderate Risk"
+        return "Low Risk"
+    
+    def assess(self, answers: Dict[str, str]) -> Tuple[int, str]:
+        """Score and risk level for one answer set"""
+        score = self.score(answers)
+        return score, self.risk_level(score)
+    
+    def assess_many(self, answer_sets: Iterable[Dict[str, str]]) -> List[Tuple[int, str]]:
+        """Score and risk level for many answer sets"""
+        scores = [self.score(answers) for answers in answer_sets]
+        return [(score, self.risk_level(score)) for score in scores]
+
+class RiskScoringService:
+    """Loads the latest rule version from the database and keeps it compiled per worker"""
+    
+    RELOAD_SECONDS = 300
+    
+    def __init__(self):
+        self._rules = CompiledRuleSet(DEFAULT_RULES_VERSION, DEFAULT_RULES)
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._reload_lock = asyncio.Lock()
+    
+    @property
+    def rules(self) -> CompiledRuleSet:
+        """Currently compiled rule set (defaults until first load)"""
+        return self._rules
+    
+    async def get_rules(self, db: AsyncSession) -> CompiledRuleSet:
+        """Compiled rule set, reloaded from the database every RELOAD_SECONDS"""
+        if self._is_stale():
+            async with self._reload_lock:
+                if self._is_stale():
+                    rules = await db.run_sync(self.load_rules)
+                    with self._lock:
+                        self._rules = rules
+                        self._loaded_at = time.monotonic()
+        return self._rules
+    
+    async def get_current_rules(self, db: AsyncSession) -> CompiledRuleSet:
+        """
+        get_rules(), reloading at once when a newer version was published.
+        Costs one indexed query; use it where the result is stored.
+        """
+        latest = await db.scalar(select(func.max(McqScoringRule.version)))
+        if latest is not None and latest != self._rules.version:
+            with self._lock:
+                self._loaded_at = None
+        return await self.get_rules(db)
+    
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.RELOAD_SECONDS
+    
+    def load_rules(self, db: Session, version: Optional[int] = None) -> CompiledRuleSet:
+        """Compile a rule version (latest by default); falls back to the built-in rules"""
+        if version is None:
+            version = db.execute(select(func.max(McqScoringRule.version))).scalar()
+        if version is None:
+            return CompiledRuleSet(DEFAULT_RULES_VERSION, DEFAULT_RULES)
+        
+        rows = db.execute(
+            select(McqScoringRule.question, McqScoringRule.answer, McqScoringRule.weight)
+            .where(McqScoringRule.version == version)
+        ).all()
+        return CompiledRuleSet(version, rows)
+    
+    def reset(self) -> None:
+        """Forget the loaded rules so the next call reloads them"""
+        with self._lock:
+            self._rules = CompiledRuleSet(DEFAULT_RULES_VERSION, DEFAULT_RULES)
+            self._loaded_at = None
+
+risk_scoring_service = RiskScoringService()
@@ -0,0 +1,134 @@
+"""
+Shared fixtures for She&Soul tests
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import core.database
+from core.database import Base, get_db
+from core.db_retry import RetryingAsyncSession
+from db.models.user import User
+from db.models.profile import Profile, UserType
+from db.models.otp import Otp
+from db.models.period_log import PeriodLog, CycleStats
+from db.models.cycle_prediction import CyclePrediction
+from db.models.cycle_phase_span import CyclePhaseSpan
+from db.models.risk_rule import McqScoringRule
+from db.models.risk_assessment import RiskAssessment, RiskRescoreJob
+from db.models.mcq_answer_code import McqAnswerCode
+from services.profile_cache import profile_cache
+from services.cycle_prediction import prediction_cache
+from services.risk_scoring_service import risk_scoring_service
+from services.mcq_codec import codebook
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Per-worker caches must not leak between tests"""
+    profile_cache.clear()
+    prediction_cache.clear()
+    risk_scoring_service.reset()
+    codebook.reset()
+    yield
+    profile_cache.clear()
+    prediction_cache.clear()
+    risk_scoring_service.reset()
+    codebook.reset()
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    """SQLite file shared by the sync (batch jobs) and async (request) engines"""
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def db_engine(database_path):
+    """Sync SQLite engine with the application schema"""
+    engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    """Sync database session, used for test data and batch jobs"""
+    session = sessionmaker(bind=db_engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest_asyncio.fixture
+async def async_db_engine(db_engine, database_path):
+    """aiosqlite engine on the same database, as used by the request path"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_db(async_db_engine):
+    """Async session like the one get_db hands to routes"""
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def request_session(async_db_engine, monkeypatch):
+    """Run a block as one request: get_db commits on success and rolls back on error"""
+    monkeypatch.setattr(core.database, "async_session_maker", async_sessionmaker(
+        async_db_engine, class_=RetryingAsyncSession, expire_on_commit=False
+    ))
+
+    @asynccontextmanager
+    async def run():
+        dependency = get_db()
+        session = await anext(dependency)
+        try:
+            yield session
+        except Exception as e:
+            await dependency.athrow(e)
+        else:
+            await anext(dependency, None)
+
+    return run
+
+
+@pytest.fixture
+def statements(async_db_engine):
+    """Collect every SQL statement the request path sends to the database"""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(async_db_engine.sync_engine, "before_cursor_execute", record)
+    yield captured
+    event.remove(async_db_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def user_with_profile(db):
+    """A verified user with a USER profile"""
+    user = User(email="jane@example.com", password="hashed", is_email_verified=True)
+    db.add(user)
+    db.flush()
+
+    profile = Profile(
+        user_id=user.id,
+        name="Jane",
+        user_type=UserType.USER,
+        referral_code="ABCD1234"
+    )
+    db.add(profile)
+    db.commit()
+    return user, profile
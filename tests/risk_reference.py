@@ -0,0 +1,67 @@
+"""
+Reference MCQ risk scoring shared by the tests and
+scripts/benchmark_risk_scoring.py
+"""
+
+import random
+
+from services.risk_scoring_service import DEFAULT_RULES
+
+
+def if_chain_score(answers):
+    """The original Java-derived if-chain, kept as the scoring reference"""
+    score = 0
+    if answers.get("menstruation_start_age") == "MENSTRUATION_START_LT_12":
+        score += 1
+    if answers.get("menopause_status") == "MENOPAUSE_YES_GT_55":
+        score += 2
+    if answers.get("pregnancy_history") == "PREGNANCY_NO":
+        score += 1
+    if answers.get("breastfeeding_history") == "BREASTFED_NO":
+        score += 1
+    if answers.get("breastfeeding_history") == "BREASTFED_NA":
+        score += 1
+    if answers.get("breastfeeding_history") == "BREASTFED_YES_GT_6MO":
+        score -= 1
+    if answers.get("alcohol_use") == "ALCOHOL_WEEKLY":
+        score += 1
+    if answers.get("alcohol_use") == "ALCOHOL_DAILY":
+        score += 2
+    if answers.get("smoking_status") == "SMOKING_OCCASIONALLY":
+        score += 1
+    if answers.get("smoking_status") == "SMOKING_REGULARLY":
+        score += 2
+    if answers.get("hrt_use") == "HRT_YES_LT_5Y":
+        score += 1
+    if answers.get("hrt_use") == "HRT_YES_GT_5Y":
+        score += 2
+    if answers.get("oral_contraceptives_use") == "OC_YES_LT_5Y":
+        score += 1
+    if answers.get("oral_contraceptives_use") == "OC_YES_GT_5Y":
+        score += 2
+    if answers.get("family_history") == "YES_FIRST_DEGREE":
+        score += 5
+    if answers.get("personal_history_biopsy") == "YES_ATYPICAL_HYPERPLASIA":
+        score += 4
+    if answers.get("age_group") == "AGE_50_PLUS":
+        score += 4
+    return max(0, score)
+
+
+def random_answer_sets(count, seed=7):
+    """Answer sets mixing scored, unscored and missing answers"""
+    rng = random.Random(seed)
+    choices = {}
+    for question, answer, _ in DEFAULT_RULES:
+        choices.setdefault(question, [None, "OTHER"]).append(answer)
+    choices["unrelated_question"] = [None, "ANYTHING"]
+
+    answer_sets = []
+    for _ in range(count):
+        answers = {}
+        for question, options in choices.items():
+            answer = rng.choice(options)
+            if answer is not None:
+                answers[question] = answer
+        answer_sets.append(answers)
+    return answer_sets
@@ -0,0 +1,59 @@
+"""
+Tests for the bulk cycle prediction engine
+"""
+
+from datetime import date
+
+from sqlalchemy import select
+
+from db.models.user import User
+from db.models.profile import Profile, UserType
+from db.models.period_log import CycleStats
+from db.models.cycle_prediction import CyclePrediction
+from services.bulk_prediction_service import BulkPredictionService
+from services.cycle_prediction import compute_cycle_prediction
+
+
+def add_profile(db, email, last_start, cycle_length, period_length):
+    """Create a user with a profile carrying cycle data"""
+    user = User(email=email, password="hashed")
+    db.add(user)
+    db.flush()
+    db.add(Profile(
+        user_id=user.id,
+        name=email,
+        user_type=UserType.USER,
+        last_period_start_date=last_start,
+        cycle_length=cycle_length,
+        period_length=period_length
+    ))
+    return user
+
+
+def test_bulk_run_matches_single_prediction_and_upserts(db, db_engine):
+    """Chunked bulk run agrees with the per-user prediction and is re-runnable"""
+    users = [
+        add_profile(db, "a@example.com", date(2025, 1, 1), 28, 5),
+        add_profile(db, "b@example.com", date(2025, 2, 10), 32, 4),
+        add_profile(db, "c@example.com", date(2025, 3, 5), 25, 6),
+    ]
+    add_profile(db, "d@example.com", None, 28, 5)
+    db.add(CycleStats(user_id=users[2].id, cycle_count=3, mean_cycle_length=26.6, m2=1.0))
+    db.commit()
+
+    service = BulkPredictionService(chunk_size=2)
+    with db_engine.begin() as conn:
+        assert service.run(conn) == 3
+    with db_engine.begin() as conn:
+        assert service.run(conn) == 3
+
+    rows = {row.user_id: row for row in db.execute(select(CyclePrediction)).scalars()}
+    assert set(rows) == {user.id for user in users}
+
+    expected = compute_cycle_prediction(date(2025, 2, 10), 32, 4)
+    assert rows[users[1].id].next_period_start_date == expected.next_period_start_date
+    assert rows[users[1].id].next_ovulation_date == expected.next_ovulation_date
+    assert rows[users[1].id].next_fertile_window_end_date == expected.next_fertile_window_end_date
+
+    estimated = compute_cycle_prediction(date(2025, 3, 5), 27, 6)
+    assert rows[users[2].id].next_period_start_date == estimated.next_period_start_date
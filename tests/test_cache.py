@@ -0,0 +1,117 @@
+"""
+Tests for in-process caches
+"""
+
+from datetime import date
+
+import pytest
+
+from api.schemas.profile import MenstrualTrackingDto
+from core.cache import TTLCache
+from services.app_service import AppService
+
+app_service = AppService()
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    """Entries disappear once their TTL has elapsed"""
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The least recently read entry is evicted first"""
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_profile_snapshot_served_from_cache(async_db, statements, user_with_profile):
+    """Second read of a profile snapshot does not hit the database"""
+    user, _ = user_with_profile
+    statements.clear()
+
+    first = await app_service.profile_cache.get(async_db, user.id)
+    second = await app_service.profile_cache.get(async_db, user.id)
+
+    assert first is second
+    assert first.name == "Jane"
+    assert len(statements) == 1
+
+
+class InterruptedSession:
+    """Session that runs a callback after a query returns, like a write landing mid-read"""
+
+    def __init__(self, db, callback):
+        self.db = db
+        self.callback = callback
+
+    async def execute(self, statement):
+        result = await self.db.execute(statement)
+        self.callback()
+        return result
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_cached(async_db, statements, user_with_profile):
+    """A snapshot read before an invalidate() is returned but not cached"""
+    user, _ = user_with_profile
+    cache = app_service.profile_cache
+
+    snapshot = await cache.get(InterruptedSession(async_db, lambda: cache.invalidate(user.id)), user.id)
+    assert snapshot.name == "Jane"
+
+    statements.clear()
+    await cache.get(async_db, user.id)
+    await cache.get(async_db, user.id)
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_profile_snapshot(request_session, statements, user_with_profile):
+    """AppService writes drop the cached snapshot"""
+    user, _ = user_with_profile
+    async with request_session() as db:
+        await app_service.profile_cache.get(db, user.id)
+
+    async with request_session() as db:
+        await app_service.update_menstrual_data(db, user.id, MenstrualTrackingDto(
+            period_length=5,
+            cycle_length=28,
+            last_period_start_date=date(2025, 1, 1)
+        ))
+
+    async with request_session() as db:
+        statements.clear()
+        prediction = await app_service.predict_next_cycle(db, user.id)
+        assert prediction.next_period_start_date == date(2025, 1, 29)
+        assert len(statements) == 1
+
+        statements.clear()
+        await app_service.predict_next_cycle(db, user.id)
+        assert statements == []
@@ -0,0 +1,103 @@
+"""
+Tests for cycle prediction
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from api.schemas.profile import CyclePhase
+from services.cycle_prediction import (
+    CyclePredictionCache, compute_cycle_prediction, forecast_cycles, phase_calendar,
+    predict_cycle_interval
+)
+
+
+def test_compute_cycle_prediction_matches_java_logic():
+    """Phase dates follow the fixed 14-day luteal arithmetic"""
+    prediction = compute_cycle_prediction(date(2025, 1, 1), 28, 5)
+
+    assert prediction.next_period_start_date == date(2025, 1, 29)
+    assert prediction.next_period_end_date == date(2025, 2, 2)
+    assert prediction.next_ovulation_date == date(2025, 2, 12)
+    assert prediction.next_ovulation_end_date == date(2025, 2, 13)
+    assert prediction.next_luteal_end_date == date(2025, 2, 26)
+    assert prediction.next_fertile_window_start_date == date(2025, 2, 7)
+    assert prediction.next_fertile_window_end_date == date(2025, 2, 13)
+
+
+def test_prediction_cache_keys_on_inputs_and_day():
+    """Same inputs on the same day hit; a new day or new inputs miss"""
+    cache = CyclePredictionCache(max_entries=100)
+    day = date(2025, 1, 10)
+
+    first = cache.get(date(2025, 1, 1), 28, 5, today=day)
+    second = cache.get(date(2025, 1, 1), 28, 5, today=day)
+    cache.get(date(2025, 1, 1), 30, 5, today=day)
+    cache.get(date(2025, 1, 1), 28, 5, today=date(2025, 1, 11))
+
+    assert first is second
+    assert first.text.startswith("The user's next period is predicted to start on January 29, 2025")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+def test_forecast_first_cycle_matches_single_prediction():
+    """Vectorized forecast agrees with the scalar prediction"""
+    cycles = forecast_cycles(date(2025, 1, 1), 30, 4, 3)
+
+    assert cycles[0] == compute_cycle_prediction(date(2025, 1, 1), 30, 4)
+    assert [c.next_period_start_date for c in cycles] == [
+        date(2025, 1, 31), date(2025, 3, 2), date(2025, 4, 1)
+    ]
+
+
+def test_phase_calendar_run_length_encodes_one_cycle():
+    """A full 28-day cycle encodes to its five phase runs"""
+    calendar = phase_calendar(date(2025, 1, 1), 28, 5, date(2025, 1, 1), date(2025, 1, 28))
+
+    assert [(run.phase, run.days) for run in calendar.runs] == [
+        (CyclePhase.PERIOD, 5),
+        (CyclePhase.FOLLICULAR, 4),
+        (CyclePhase.FERTILE, 5),
+        (CyclePhase.OVULATION, 2),
+        (CyclePhase.LUTEAL, 12)
+    ]
+    assert sum(run.days for run in calendar.runs) == 28
+    assert calendar.runs[3].start_date == date(2025, 1, 15)
+
+
+def test_interval_prediction_regular_history_is_tight():
+    """A perfectly regular history yields the floor spread around the mean"""
+    starts = np.array([date(2025, 1, 1) + timedelta(days=28 * i) for i in range(7)], dtype="datetime64[D]")
+    prediction = predict_cycle_interval(starts, 30, 0.9)
+
+    assert prediction.cycles_observed == 6
+    assert prediction.mean_cycle_length == 28
+    assert prediction.cycle_length_std == 1.0
+    assert prediction.next_period_start.most_likely == date(2025, 7, 16)
+    assert prediction.next_period_start.earliest == date(2025, 7, 14)
+    assert prediction.next_period_start.latest == date(2025, 7, 18)
+
+
+def test_interval_prediction_widens_for_irregular_cycles():
+    """Irregular cycles and higher confidence both widen the interval"""
+    lengths = [24, 35, 27, 33, 26, 31]
+    starts = np.cumsum([0] + lengths).astype("timedelta64[D]") + np.datetime64("2025-01-01")
+    narrow = predict_cycle_interval(starts, 28, 0.8)
+    wide = predict_cycle_interval(starts, 28, 0.95)
+
+    narrow_days = (narrow.next_period_start.latest - narrow.next_period_start.earliest).days
+    wide_days = (wide.next_period_start.latest - wide.next_period_start.earliest).days
+    assert 4 < narrow_days < wide_days
+    assert wide.next_ovulation.latest - wide.next_ovulation.earliest > wide.next_period_start.latest - wide.next_period_start.earliest
+
+
+def test_interval_prediction_falls_back_without_history():
+    """Without logged cycles the entered length and prior spread are used"""
+    prediction = predict_cycle_interval(np.array(["2025-01-01"], dtype="datetime64[D]"), 30, 0.9)
+
+    assert prediction.cycles_observed == 0
+    assert prediction.next_period_start.most_likely == date(2025, 1, 31)
+    assert prediction.cycle_length_std == 3.0
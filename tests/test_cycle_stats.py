@@ -0,0 +1,66 @@
+"""
+Tests for the incremental cycle-length estimator
+"""
+
+from datetime import date
+
+import pytest
+
+from api.schemas.profile import MenstrualTrackingDto
+from services.app_service import AppService
+from services.cycle_stats_service import CycleStatsService
+
+app_service = AppService()
+stats_service = CycleStatsService()
+
+
+@pytest.mark.asyncio
+async def test_incremental_stats_match_full_history(async_db, user_with_profile):
+    """Welford updates agree with mean and variance over all cycles"""
+    user, _ = user_with_profile
+    starts = [date(2025, 1, 1), date(2025, 1, 29), date(2025, 2, 28), date(2025, 3, 27)]
+    for start in starts:
+        stats = await stats_service.record_period(async_db, user.id, start)
+
+    assert stats.cycle_count == 3
+    assert stats.mean_cycle_length == pytest.approx((28 + 30 + 27) / 3)
+    assert stats.m2 == pytest.approx(sum((x - 85 / 3) ** 2 for x in (28, 30, 27)))
+    assert 0 < stats.regularity_score < 1
+
+
+@pytest.mark.asyncio
+async def test_backfilled_period_rebuilds_stats(async_db, user_with_profile):
+    """Logging an older period recomputes the stats from history"""
+    user, _ = user_with_profile
+    await stats_service.record_period(async_db, user.id, date(2025, 2, 28))
+    await stats_service.record_period(async_db, user.id, date(2025, 1, 1))
+    stats = await stats_service.record_period(async_db, user.id, date(2025, 1, 29))
+
+    assert stats.cycle_count == 2
+    assert stats.mean_cycle_length == pytest.approx(29)
+    assert stats.last_period_start_date == date(2025, 2, 28)
+
+
+@pytest.mark.asyncio
+async def test_outlier_gap_is_not_a_cycle(async_db, user_with_profile):
+    """A skipped period does not distort the mean"""
+    user, _ = user_with_profile
+    await stats_service.record_period(async_db, user.id, date(2025, 1, 1))
+    stats = await stats_service.record_period(async_db, user.id, date(2025, 6, 1))
+
+    assert stats.cycle_count == 0
+    assert stats.last_period_start_date == date(2025, 6, 1)
+
+
+@pytest.mark.asyncio
+async def test_prediction_uses_estimated_cycle_length(async_db, user_with_profile):
+    """Once two cycles are logged the estimate replaces the entered length"""
+    user, _ = user_with_profile
+    await app_service.update_menstrual_data(async_db, user.id, MenstrualTrackingDto(
+        period_length=5, cycle_length=28, last_period_start_date=date(2025, 1, 1)
+    ))
+    for start in (date(2025, 1, 31), date(2025, 3, 2)):
+        await app_service.update_menstrual_data(async_db, user.id, MenstrualTrackingDto(last_period_start_date=start))
+
+    prediction = await app_service.predict_next_cycle(async_db, user.id)
+    assert prediction.next_period_start_date == date(2025, 4, 1)
@@ -0,0 +1,118 @@
+"""
+Tests for retrying transient database connection errors
+"""
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from core.db_retry import RETRY_BUDGET, RetryPolicy, RetryingAsyncSession, is_retryable
+from db.models.profile import Profile
+from db.models.user import User
+
+
+class PgError(Exception):
+    def __init__(self, sqlstate):
+        super().__init__(f"sqlstate {sqlstate}")
+        self.sqlstate = sqlstate
+
+
+def wrapped(orig, invalidated=False):
+    return OperationalError("SELECT 1", {}, orig, connection_invalidated=invalidated)
+
+
+@pytest.fixture
+def faults(async_db_engine):
+    """Fail the next `count` statements of a kind as if the pooler dropped the connection"""
+    pending = {"count": 0, "prefix": "SELECT"}
+
+    def fail(conn, cursor, statement, parameters, context, executemany):
+        if pending["count"] and statement.lstrip().upper().startswith(pending["prefix"]):
+            pending["count"] -= 1
+            raise wrapped(PgError("08006"), invalidated=True)
+
+    event.listen(async_db_engine.sync_engine, "before_cursor_execute", fail)
+    yield pending
+    event.remove(async_db_engine.sync_engine, "before_cursor_execute", fail)
+
+
+@pytest.fixture
+def delays():
+    return []
+
+
+@pytest.fixture
+def session_factory(async_db_engine, delays):
+    def build(**policy):
+        async def sleep(seconds):
+            delays.append(seconds)
+        return RetryingAsyncSession(
+            async_db_engine, expire_on_commit=False, retry_policy=RetryPolicy(**policy), sleep=sleep
+        )
+    return build
+
+
+def test_errors_are_classified():
+    """Connection failures are retryable; timeouts and statement errors are fatal"""
+    assert is_retryable(wrapped(PgError("08006")))
+    assert is_retryable(wrapped(PgError("57P01")))
+    assert is_retryable(wrapped(Exception("server closed the connection"), invalidated=True))
+    assert is_retryable(ConnectionRefusedError())
+    assert not is_retryable(TimeoutError())
+    assert not is_retryable(wrapped(PgError("57014")))  # query_canceled
+    assert not is_retryable(IntegrityError("INSERT", {}, PgError("23505")))
+    assert not is_retryable(ValueError())
+
+
+def test_backoff_is_exponential_with_full_jitter():
+    """Delays double per attempt up to the cap and are scaled by the jitter draw"""
+    policy = RetryPolicy(base_delay=0.05, max_delay=0.3)
+
+    assert [policy.delay(attempt, rand=lambda: 1.0) for attempt in (1, 2, 3, 4)] == [0.05, 0.1, 0.2, 0.3]
+    assert policy.delay(3, rand=lambda: 0.5) == 0.1
+    assert policy.delay(1, rand=lambda: 0.0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_read_is_retried_and_loaded_objects_survive(user_with_profile, faults, session_factory, delays):
+    """A dropped connection mid-request is invisible to the route"""
+    user, _ = user_with_profile
+    async with session_factory(max_retries=3, request_budget=3) as session:
+        loaded = await session.get(User, user.id)
+
+        faults["count"] = 2
+        profile = await session.scalar(select(Profile).where(Profile.user_id == user.id))
+
+        assert profile.user_id == user.id
+        assert loaded.email == user.email  # refreshed after the rollback, no lazy load needed
+        assert len(delays) == 2
+        assert session.info[RETRY_BUDGET] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_bounds_retries_per_request(user_with_profile, faults, session_factory, delays):
+    """Once the request's budget is spent the error reaches the route"""
+    user, _ = user_with_profile
+    async with session_factory(max_retries=3, request_budget=2) as session:
+        faults["count"] = 1
+        await session.get(User, user.id)
+
+        faults["count"] = 5
+        with pytest.raises(OperationalError):
+            await session.execute(select(Profile).where(Profile.user_id == user.id))
+    assert len(delays) == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_are_not_retried(user_with_profile, faults, session_factory, delays):
+    """After the transaction wrote, a dropped connection lost the write; it must fail"""
+    user, _ = user_with_profile
+    async with session_factory() as session:
+        loaded = await session.get(User, user.id)
+        loaded.is_email_verified = False
+        await session.flush()
+
+        faults["count"] = 1
+        with pytest.raises(OperationalError):
+            await session.scalar(select(Profile).where(Profile.user_id == user.id))
+    assert delays == []
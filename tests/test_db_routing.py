@@ -0,0 +1,110 @@
+"""
+Tests for primary/replica session routing
+"""
+
+import time
+from datetime import timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import core.database
+from core.database import get_db
+from core.db_routing import SessionRouter, replica_read
+from core.security import create_access_token
+from db.models.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest_asyncio.fixture
+async def routed_app(async_db_engine, tmp_path, monkeypatch, clock):
+    """App whose routes report which database served them"""
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(core.database, "async_session_maker", async_sessionmaker(async_db_engine, expire_on_commit=False))
+    monkeypatch.setattr(core.database, "replica_session_maker", async_sessionmaker(replica_engine, expire_on_commit=False))
+    monkeypatch.setattr(core.database, "session_router", SessionRouter(
+        replica_enabled=True, sticky_seconds=5.0, identify=core.database._token_claims, clock=clock
+    ))
+
+    app = FastAPI()
+
+    def served_by(db: AsyncSession) -> str:
+        return "replica" if db.bind is replica_engine else "primary"
+
+    @app.get("/marked")
+    @replica_read
+    async def marked(db: AsyncSession = Depends(get_db, scope="function")):
+        return served_by(db)
+
+    @app.get("/unmarked")
+    async def unmarked(db: AsyncSession = Depends(get_db, scope="function")):
+        return served_by(db)
+
+    @app.post("/write")
+    async def write(db: AsyncSession = Depends(get_db, scope="function")):
+        db.add(User(email=f"user{time.perf_counter_ns()}@example.com", password="hashed"))
+        return served_by(db)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    await replica_engine.dispose()
+
+
+def auth(user_id: int) -> dict:
+    token = create_access_token({"sub": user_id}, expires_delta=timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_only_marked_get_routes_use_the_replica(routed_app, clock):
+    """Marked GETs go to the replica; unmarked routes and writes stay on the primary"""
+    clock.now += 60
+    assert (await routed_app.get("/marked")).json() == "replica"
+    assert (await routed_app.get("/marked", headers=auth(1))).json() == "replica"
+    assert (await routed_app.get("/unmarked", headers=auth(1))).json() == "primary"
+    assert (await routed_app.post("/write", headers=auth(1))).json() == "primary"
+
+
+@pytest.mark.asyncio
+async def test_writer_reads_own_writes_from_primary(routed_app, clock):
+    """After a write the caller reads from the primary until the window passes; others are unaffected"""
+    clock.now += 60
+    await routed_app.post("/write", headers=auth(1))
+
+    assert (await routed_app.get("/marked", headers=auth(1))).json() == "primary"
+    assert (await routed_app.get("/marked", headers=auth(2))).json() == "replica"
+
+    clock.now += 6
+    assert (await routed_app.get("/marked", headers=auth(1))).json() == "replica"
+
+
+@pytest.mark.asyncio
+async def test_fresh_token_reads_from_primary(routed_app, clock):
+    """A token issued moments ago (signup or login) is sticky to the primary"""
+    headers = auth(3)
+    assert (await routed_app.get("/marked", headers=headers)).json() == "primary"
+
+    clock.now += 6
+    assert (await routed_app.get("/marked", headers=headers)).json() == "replica"
+
+
+@pytest.mark.asyncio
+async def test_replica_disabled_uses_primary(routed_app):
+    """Without DATABASE_REPLICA_URL every request uses the primary"""
+    core.database.session_router.replica_enabled = False
+    assert (await routed_app.get("/marked")).json() == "primary"
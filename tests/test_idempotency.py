@@ -0,0 +1,194 @@
+"""
+Tests for Idempotency-Key handling
+"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import Base
+from core.security import create_access_token, verify_token
+from core.idempotency import AccessTokenRedactor, IdempotencyMiddleware, InMemoryIdempotencyStore, PostgresIdempotencyStore
+from db.models.idempotency_key import IdempotencyKey
+
+STORE_OPTIONS = dict(ttl_seconds=60, wait_seconds=2, lock_seconds=30)
+
+
+def build_app(store, **options):
+    """App whose /signup counts how often it really runs"""
+    app = FastAPI()
+    calls = []
+
+    @app.post("/signup", status_code=201)
+    async def signup(payload: dict):
+        calls.append(payload)
+        await asyncio.sleep(0.05)
+        if payload.get("fail"):
+            raise HTTPException(status_code=503, detail="SMTP down")
+        return {"user": len(calls)}
+
+    app.add_middleware(IdempotencyMiddleware, store=store, paths=["/signup"], **options)
+    return app, calls
+
+
+async def post(app, body, key="abc", token="Bearer one", origin=None):
+    headers = {"Idempotency-Key": key, "Authorization": token}
+    if origin:
+        headers["Origin"] = origin
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/signup", json=body, headers=headers)
+
+
+def test_retry_replays_first_response():
+    """A retried request gets the stored response without running again"""
+    async def scenario():
+        app, calls = build_app(InMemoryIdempotencyStore(**STORE_OPTIONS))
+        first = await post(app, {"email": "a@example.com"})
+        second = await post(app, {"email": "a@example.com"})
+        other_user = await post(app, {"email": "a@example.com"}, token="Bearer two")
+        return first, second, other_user, calls
+
+    first, second, other_user, calls = asyncio.run(scenario())
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json() == {"user": 1}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert other_user.json() == {"user": 2}
+    assert len(calls) == 2
+
+
+def test_concurrent_duplicates_wait_for_the_first():
+    """Duplicates arriving while the original runs share its response"""
+    async def scenario():
+        app, calls = build_app(InMemoryIdempotencyStore(**STORE_OPTIONS))
+        responses = await asyncio.gather(*[post(app, {"email": "b@example.com"}) for _ in range(5)])
+        return responses, calls
+
+    responses, calls = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert {r.json()["user"] for r in responses} == {1}
+
+
+def test_key_reuse_and_server_errors():
+    """Different bodies are rejected; 5xx responses are not stored"""
+    async def scenario():
+        app, calls = build_app(InMemoryIdempotencyStore(**STORE_OPTIONS))
+        await post(app, {"email": "c@example.com"}, key="k1")
+        conflict = await post(app, {"email": "other@example.com"}, key="k1")
+        failed = await post(app, {"fail": True}, key="k2")
+        retried = await post(app, {"fail": True}, key="k2")
+        return conflict, failed, retried, calls
+
+    conflict, failed, retried, calls = asyncio.run(scenario())
+    assert conflict.status_code == 422
+    assert failed.status_code == retried.status_code == 503
+    assert len(calls) == 3
+
+
+def test_database_store_replays_and_serializes(tmp_path):
+    """The shared table-backed store behaves like the in-memory one"""
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'keys.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[IdempotencyKey.__table__])
+        store = PostgresIdempotencyStore(async_sessionmaker(engine, expire_on_commit=False), **STORE_OPTIONS)
+        store.POLL_SECONDS = 0.01
+
+        app, calls = build_app(store)
+        responses = await asyncio.gather(*[post(app, {"email": "d@example.com"}) for _ in range(3)])
+        replay = await post(app, {"email": "d@example.com"})
+        await engine.dispose()
+        return responses, replay, calls
+
+    responses, replay, calls = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [201, 201, 201]
+    assert replay.json() == {"user": 1}
+    assert replay.headers["content-type"] == "application/json"
+
+
+def test_cors_headers_on_replays_and_errors():
+    """With CORS outside the middleware, browsers can read replays and key errors"""
+    origin = "https://app.example"
+
+    async def scenario():
+        app, calls = build_app(InMemoryIdempotencyStore(ttl_seconds=60, wait_seconds=0.01, lock_seconds=30))
+        app.add_middleware(CORSMiddleware, allow_origins=[origin], allow_credentials=True)
+        first = await post(app, {"email": "e@example.com"}, origin=origin)
+        replay = await post(app, {"email": "e@example.com"}, origin=origin)
+        conflict = await post(app, {"email": "other@example.com"}, origin=origin)
+        running, in_progress = await asyncio.gather(
+            post(app, {"email": "f@example.com"}, key="slow", origin=origin),
+            post(app, {"email": "f@example.com"}, key="slow", origin=origin)
+        )
+        return first, replay, conflict, in_progress
+
+    first, replay, conflict, in_progress = asyncio.run(scenario())
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert (conflict.status_code, in_progress.status_code) == (422, 409)
+    for response in (first, replay, conflict, in_progress):
+        assert response.headers["access-control-allow-origin"] == origin
+
+
+def test_oversized_body_is_rejected_before_buffering():
+    """Bodies past max_body_bytes get 413 and never reach the route or the store"""
+    async def scenario():
+        store = InMemoryIdempotencyStore(**STORE_OPTIONS)
+        app, calls = build_app(store, max_body_bytes=32)
+        response = await post(app, {"email": "a" * 64 + "@example.com"})
+        return response, calls, store
+
+    response, calls, store = asyncio.run(scenario())
+    assert response.status_code == 413
+    assert calls == []
+    assert store._entries == {}
+
+
+def test_application_runs_idempotency_inside_cors():
+    """main registers IdempotencyMiddleware before CORSMiddleware, so CORS wraps it"""
+    from main import app
+
+    layers = [middleware.cls for middleware in app.user_middleware]  # outermost first
+    assert layers.index(CORSMiddleware) < layers.index(IdempotencyMiddleware)
+
+
+def test_signup_is_stored_without_its_access_token():
+    """main covers signup with a token redactor and leaves login out"""
+    from main import app
+
+    options = next(middleware.kwargs for middleware in app.user_middleware if middleware.cls is IdempotencyMiddleware)
+    assert "/api/signup" in options["paths"]
+    assert isinstance(options["redactors"]["/api/signup"], AccessTokenRedactor)
+    assert "/api/login" not in options["paths"]
+
+
+def test_replayed_signup_gets_a_fresh_access_token():
+    """The store keeps only the token's subject; a replay issues a new token for it"""
+    store = InMemoryIdempotencyStore(**STORE_OPTIONS)
+    app = FastAPI()
+    calls = []
+
+    @app.post("/signup", status_code=201)
+    async def signup(payload: dict):
+        calls.append(payload)
+        return {"access_token": create_access_token(data={"sub": payload["email"]}), "token_type": "bearer"}
+
+    app.add_middleware(IdempotencyMiddleware, store=store, paths=["/signup"],
+                       redactors={"/signup": AccessTokenRedactor()})
+
+    async def scenario():
+        first = await post(app, {"email": "a@example.com"})
+        second = await post(app, {"email": "a@example.com"})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert second.headers["idempotent-replayed"] == "true"
+    assert verify_token(first.json()["access_token"])["sub"] == "a@example.com"
+    assert verify_token(second.json()["access_token"])["sub"] == "a@example.com"
+    assert second.json()["token_type"] == "bearer"
+    for stored in store._entries.values():
+        assert first.json()["access_token"].encode() not in stored.response.body
@@ -0,0 +1,98 @@
+"""
+Tests for connection checkout by the per-request session
+"""
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from api.schemas.auth import SignUpRequest
+from core.database import get_db, release_connection
+from core.security import create_access_token, get_current_user
+from db.models.user import User
+from services.app_service import AppService
+
+app_service = AppService()
+
+
+@pytest.fixture
+def checked_out(async_db_engine):
+    """Connections of the request engine checked out right now"""
+    return lambda: async_db_engine.pool.checkedout()
+
+
+@pytest.mark.asyncio
+async def test_connection_is_held_only_while_a_transaction_runs(request_session, checked_out):
+    """No checkout before the first statement, none after the request's commit"""
+    async with request_session() as db:
+        assert checked_out() == 0
+        await db.scalar(select(User.id))
+        assert checked_out() == 1
+    assert checked_out() == 0
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_without_a_connection(request_session, user_with_profile, checked_out, monkeypatch):
+    """Login and signup give the connection back before bcrypt runs"""
+    user, _ = user_with_profile
+    seen = []
+
+    def verify(password, hashed):
+        seen.append(checked_out())
+        return True
+
+    def hash_password(password):
+        seen.append(checked_out())
+        return "hashed"
+
+    monkeypatch.setattr("services.app_service.verify_password", verify)
+    monkeypatch.setattr("services.app_service.get_password_hash", hash_password)
+    monkeypatch.setattr(app_service.email_service, "send_otp_email", lambda email, otp: None)
+
+    async with request_session() as db:
+        logged_in = await app_service.login_user(db, user.email, "secret")
+        assert logged_in.email == user.email  # still loaded after the early release
+
+    async with request_session() as db:
+        created = await app_service.register_user(db, SignUpRequest(email="new@example.com", password="secret123"))
+
+    assert seen == [0, 0]
+    async with request_session() as db:
+        assert (await db.get(User, created.id)).password == "hashed"
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_staged_writes(request_session, user_with_profile):
+    """Once the request wrote, the transaction stays open until the request's commit"""
+    user, _ = user_with_profile
+    async with request_session() as db:
+        loaded = await db.get(User, user.id)
+        loaded.is_email_verified = False
+        await release_connection(db)
+        assert db.in_transaction()
+
+        await db.flush()
+        await release_connection(db)
+        assert db.in_transaction()
+
+    async with request_session() as db:
+        assert not (await db.get(User, user.id)).is_email_verified
+
+
+@pytest.mark.asyncio
+async def test_auth_dependency_and_route_share_one_session(request_session, user_with_profile):
+    """get_current_user loads the user through the same session the route gets"""
+    user, _ = user_with_profile
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db, scope="function")):
+        return {"shared": object_session(current_user) is db.sync_session}
+
+    token = create_access_token({"sub": user.email})
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.json() == {"shared": True}
@@ -4,6 +4,7 @@ Tests for main application endpoints
 
 import pytest
 from fastapi.testclient import TestClient
+from core.config import settings
 from main import app
 
 client = TestClient(app)
@@ -30,4 +31,15 @@ def test_docs_endpoint():
 def test_redoc_endpoint():
     """Test that redoc is accessible"""
     response = client.get("/redoc")
-    assert response.status_code == 200 
\ No newline at end of file
+    assert response.status_code == 200 
+def test_metrics_require_the_token(monkeypatch):
+    """/metrics is off without METRICS_TOKEN and answers 401 to anyone without it"""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "db_statements_per_request" in response.text
@@ -0,0 +1,93 @@
+"""
+Tests for the compact MCQ answer encoding
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from db.models.mcq_answer_code import McqAnswerCode
+from db.models.profile import Profile
+
+from services.app_service import AppService
+from services.mcq_codec import (
+    QUESTIONS, codebook, encode_answers, decode_answers, code_matrix, extras_score, weight_table, score_matrix
+)
+from services.risk_scoring_service import CompiledRuleSet, DEFAULT_RULES, DEFAULT_RULES_VERSION
+from tests.risk_reference import random_answer_sets
+
+app_service = AppService()
+
+
+def test_round_trip_keeps_every_answer():
+    """Known answers become codes, anything else survives as extras"""
+    for answers in random_answer_sets(2000):
+        codes, extras = encode_answers(answers)
+        assert len(codes) == len(QUESTIONS)
+        assert decode_answers(codes, extras) == answers
+
+    codes, extras = encode_answers({"family_history": "YES_FIRST_DEGREE", "age_group": "AGE_40_49"})
+    assert extras == {"age_group": "AGE_40_49"}
+
+
+def test_vectorized_scores_match_compiled_rules():
+    """Scoring the code matrix equals scoring each answer dict"""
+    rules = CompiledRuleSet(DEFAULT_RULES_VERSION, DEFAULT_RULES)
+    answer_sets = random_answer_sets(2000, seed=11)
+    matrix = code_matrix([encode_answers(answers)[0] for answers in answer_sets])
+
+    scores = score_matrix(matrix, weight_table(rules))
+    assert scores.tolist() == [rules.score(answers) for answers in answer_sets]
+    assert matrix.dtype == np.uint8
+
+
+@pytest.mark.asyncio
+async def test_assessment_is_stored_encoded(async_db, user_with_profile):
+    """Submitting answers stores codes and reads back the same answers"""
+    user, _ = user_with_profile
+    answers = {"family_history": "YES_FIRST_DEGREE", "age_group": "AGE_50_PLUS", "notes": "n/a"}
+
+    assert await app_service.process_mcq_risk_assessment(async_db, user.id, answers) == "Moderate Risk"
+    extras = await async_db.scalar(select(Profile.risk_assessment_mcq_data).where(Profile.user_id == user.id))
+    assert extras == {"notes": "n/a"}
+
+    stored = await app_service.get_mcq_risk_assessment(async_db, user.id)
+    assert stored.answers == answers
+    assert stored.risk_level == "Moderate Risk"
+
+
+@pytest.mark.asyncio
+async def test_unscored_answers_get_codes_on_first_sight(async_db, user_with_profile):
+    """A low-risk answer set is stored fully encoded, and other workers can decode it"""
+    user, _ = user_with_profile
+    answers = {question: f"{question.upper()}_OTHER" for question in QUESTIONS}
+
+    assert await app_service.process_mcq_risk_assessment(async_db, user.id, answers) == "Low Risk"
+    await async_db.commit()
+    codes, extras = (await async_db.execute(
+        select(Profile.risk_assessment_mcq_codes, Profile.risk_assessment_mcq_data).where(Profile.user_id == user.id)
+    )).first()
+    assert extras is None
+    assert 0 not in codes
+    assert len((await async_db.execute(select(McqAnswerCode.code))).all()) == len(QUESTIONS)
+
+    codebook.reset()  # a worker that has not seen the new codes yet
+    assert (await app_service.get_mcq_risk_assessment(async_db, user.id)).answers == answers
+
+
+def test_rules_may_score_answers_without_a_code():
+    """New rule answers need no code change: extras carry their weight"""
+    rules = CompiledRuleSet(5, DEFAULT_RULES + [("age_group", "AGE_40_49", 2), ("new_question", "YES", 3)])
+    answer_sets = [
+        {"age_group": "AGE_40_49", "family_history": "YES_FIRST_DEGREE"},
+        {"new_question": "YES", "breastfeeding_history": "BREASTFED_YES_GT_6MO"},
+        {"breastfeeding_history": "BREASTFED_YES_GT_6MO", "notes": "free text"},
+    ]
+    encoded = [encode_answers(answers) for answers in answer_sets]
+
+    scores = score_matrix(
+        code_matrix([codes for codes, _ in encoded]),
+        weight_table(rules),
+        [extras_score(rules, extras) for _, extras in encoded]
+    )
+    assert scores.tolist() == [rules.score(answers) for answers in answer_sets] == [7, 2, 0]
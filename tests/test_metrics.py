@@ -0,0 +1,114 @@
+"""
+Tests for the Prometheus-style metrics
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.metrics import (
+    DB_STATEMENT_DURATION, DB_STATEMENT_ERRORS, HTTP_REQUEST_DURATION, POOL_CHECKOUT_WAIT, POOL_CONNECT_DURATION,
+    Counter, Histogram, MetricsMiddleware, MetricsRegistry, TimedAsyncQueuePool,
+    instrument_engine, registry
+)
+from core.query_log import instrument_statements
+
+
+def test_text_format_has_cumulative_buckets():
+    """Histograms render cumulative buckets, +Inf, sum and count"""
+    local = MetricsRegistry()
+    latency = local.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+    hits = local.register(Counter("hits_total", "Hits", ("route",)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, '/a"b')
+    hits.inc("/a", amount=2)
+
+    lines = local.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a\\"b"} 3.65' in lines
+    assert 'latency_seconds_count{route="/a\\"b"} 4' in lines
+    assert 'hits_total{route="/a"} 2' in lines
+
+
+def test_engine_events_feed_pool_and_statement_metrics(tmp_path):
+    """Statements, errors and checkout waits are recorded per pool"""
+    async def scenario():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}",
+            poolclass=TimedAsyncQueuePool, pool_logging_name="metrics-test", pool_size=2
+        )
+        instrument_engine(engine, "metrics-test")
+        instrument_statements(engine, "metrics-test", slow_query_seconds=60)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("select 2"))
+            try:
+                await conn.execute(text("SELECT * FROM missing_table"))
+            except Exception:
+                pass
+            rendered = registry.render()
+        await engine.dispose()
+        return rendered
+
+    rendered = asyncio.run(scenario())
+
+    assert DB_STATEMENT_DURATION.count("metrics-test", "SELECT") == 2
+    assert DB_STATEMENT_ERRORS.value("metrics-test", "SELECT") == 1
+    assert POOL_CHECKOUT_WAIT.count("metrics-test") >= 1
+    assert 'db_pool_checked_out{pool="metrics-test"} 1' in rendered
+
+
+def test_checkout_wait_excludes_connect_time(tmp_path):
+    """Opening a connection is timed separately from waiting for the pool"""
+    async def scenario():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'connect.db'}",
+            poolclass=TimedAsyncQueuePool, pool_logging_name="connect-test", pool_size=1
+        )
+        instrument_engine(engine, "connect-test")
+
+        @event.listens_for(engine.sync_engine, "do_connect")
+        def slow_connect(dialect, connection_record, cargs, cparams):
+            time.sleep(0.2)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+    assert POOL_CONNECT_DURATION.count("connect-test") == 1
+    assert POOL_CONNECT_DURATION.total("connect-test") >= 0.2
+    assert POOL_CHECKOUT_WAIT.count("connect-test") == 2
+    assert POOL_CHECKOUT_WAIT.total("connect-test") < 0.1
+
+
+def test_requests_are_labelled_by_route_template():
+    """Path parameters do not create new series; unknown paths share one"""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=MetricsMiddleware(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for item_id in (1, 2, 3):
+                await client.get(f"/items/{item_id}")
+            await client.get("/missing")
+
+    before = HTTP_REQUEST_DURATION.count("GET", "unmatched", "404")
+    asyncio.run(scenario())
+
+    assert HTTP_REQUEST_DURATION.count("GET", "/items/{item_id}", "200") == 3
+    assert HTTP_REQUEST_DURATION.count("GET", "unmatched", "404") == before + 1
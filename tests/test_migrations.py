@@ -0,0 +1,67 @@
+"""
+Tests for the Alembic migrations and the foreign key index check
+"""
+
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, Table, create_engine, inspect
+
+from core.database import Base
+from db.index_check import unindexed_foreign_keys
+import db.models  # noqa: F401
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def alembic_config(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "db" / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config, url
+
+
+def test_every_foreign_key_is_indexed():
+    """CI gate: the models declare an index for each foreign key"""
+    assert unindexed_foreign_keys(Base.metadata) == []
+
+
+def test_check_reports_unindexed_foreign_keys():
+    """A foreign key is covered only as the leading column(s) of an index, unique constraint or primary key"""
+    metadata = MetaData()
+    Table("parents", metadata, Column("id", Integer, primary_key=True))
+    Table(
+        "children", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("parent_id", Integer, ForeignKey("parents.id")),
+        Column("other_parent_id", Integer, ForeignKey("parents.id")),
+        Index("ix_children_id_other_parent_id", "id", "other_parent_id"),
+    )
+    Table("details", metadata, Column("parent_id", Integer, ForeignKey("parents.id"), primary_key=True))
+
+    assert unindexed_foreign_keys(metadata) == [("children", ("other_parent_id",)), ("children", ("parent_id",))]
+
+
+def test_migrations_build_the_model_schema(alembic_config):
+    """upgrade head matches the models exactly and downgrades cleanly"""
+    config, url = alembic_config
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+            indexes = {index["name"]: index for index in inspect(conn).get_indexes("profiles")}
+        assert diff == []
+        assert indexes["ix_profiles_user_id"]["unique"]
+
+        command.downgrade(config, "base")
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+    finally:
+        engine.dispose()
@@ -0,0 +1,62 @@
+"""
+Tests for materialized cycle phase spans
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from api.schemas.profile import CyclePhase, MenstrualTrackingDto
+from db.models.user import User
+from db.models.profile import Profile, UserType
+from services.app_service import AppService
+from services.phase_span_service import PhaseSpanService
+
+app_service = AppService()
+span_service = PhaseSpanService()
+
+
+def test_spans_cover_horizon_without_gaps():
+    """Consecutive spans tile the whole horizon"""
+    today = date(2025, 1, 10)
+    spans = span_service.spans_for(1, date(2025, 1, 1), 28, 5, today)
+
+    assert spans[0]["start_date"] == today
+    assert spans[-1]["end_date"] == today + timedelta(days=PhaseSpanService.HORIZON_DAYS - 1)
+    for previous, current in zip(spans, spans[1:]):
+        assert current["start_date"] == previous["end_date"] + timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_menstrual_update_refreshes_spans(async_db, user_with_profile):
+    """Updating menstrual data makes the user findable by phase and date"""
+    user, _ = user_with_profile
+    today = date.today()
+    await app_service.update_menstrual_data(async_db, user.id, MenstrualTrackingDto(
+        period_length=5, cycle_length=28, last_period_start_date=today
+    ))
+
+    assert await span_service.users_in_phase(async_db, CyclePhase.PERIOD, today + timedelta(days=2)) == [user.id]
+    assert await span_service.users_in_phase(async_db, CyclePhase.OVULATION, today + timedelta(days=14)) == [user.id]
+    assert await span_service.users_in_phase(async_db, CyclePhase.LUTEAL, today + timedelta(days=2)) == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_rolls_spans_forward(db, db_engine, async_db):
+    """Nightly refresh drops expired spans and rebuilds from the new day"""
+    user = User(email="roll@example.com", password="hashed")
+    db.add(user)
+    db.flush()
+    db.add(Profile(
+        user_id=user.id, name="Roll", user_type=UserType.USER,
+        last_period_start_date=date(2025, 1, 1), cycle_length=28, period_length=5
+    ))
+    db.commit()
+
+    with db_engine.begin() as conn:
+        assert span_service.refresh_all(conn, today=date(2025, 1, 1), chunk_size=1) == 1
+    with db_engine.begin() as conn:
+        span_service.refresh_all(conn, today=date(2025, 3, 1), chunk_size=1)
+
+    assert await span_service.users_in_phase(async_db, CyclePhase.PERIOD, date(2025, 1, 2)) == []
+    assert await span_service.users_in_phase(async_db, CyclePhase.PERIOD, date(2025, 3, 1)) == [user.id]
@@ -0,0 +1,90 @@
+"""
+Tests for the background pool warm-up and readiness endpoint
+"""
+
+import httpx
+import pytest
+
+import main
+from core.pool_warmup import FAILED, WARM, PoolWarmer
+
+
+class FlakyEngine:
+    """Engine whose first `failures` connects raise, as while the pooler is unreachable"""
+
+    def __init__(self, engine, failures: int):
+        self.engine = engine
+        self.failures = failures
+
+    async def connect(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("pooler unreachable")
+        return await self.engine.connect()
+
+
+@pytest.fixture
+def delays():
+    return []
+
+
+@pytest.fixture
+def record_sleep(delays):
+    async def sleep(seconds):
+        delays.append(seconds)
+    return sleep
+
+
+@pytest.mark.asyncio
+async def test_warmup_opens_pooled_connections(async_db_engine):
+    """The pool holds the requested number of idle connections afterwards"""
+    warmer = PoolWarmer(async_db_engine, "primary", connections=3)
+    assert not warmer.ready
+
+    await warmer.start()
+
+    assert warmer.state == WARM
+    assert async_db_engine.pool.checkedin() == 3
+    assert async_db_engine.pool.checkedout() == 0
+
+
+@pytest.mark.asyncio
+async def test_warmup_retries_with_bounded_attempts(async_db_engine, delays, record_sleep):
+    """Failed attempts back off and are retried; giving up leaves the state failed until restarted"""
+    warmer = PoolWarmer(FlakyEngine(async_db_engine, failures=2), "primary", connections=2,
+                        max_retries=3, retry_delay=0.5, sleep=record_sleep)
+    await warmer.start()
+    assert warmer.state == WARM
+    assert warmer.attempts == 3
+    assert delays == [0.5, 1.0]
+
+    flaky = FlakyEngine(async_db_engine, failures=5)
+    warmer = PoolWarmer(flaky, "replica", connections=1, max_retries=2, sleep=record_sleep)
+    await warmer.start()
+    assert warmer.state == FAILED
+    assert warmer.status()["error"] == "pooler unreachable"
+
+    flaky.failures = 0
+    await warmer.start()
+    assert warmer.state == WARM
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warm_pool(async_db_engine, monkeypatch, record_sleep):
+    """/health/ready answers 503 while the pool is cold and 200 once it is warm"""
+    warmer = PoolWarmer(FlakyEngine(async_db_engine, failures=1), "primary", connections=1,
+                        max_retries=0, sleep=record_sleep)
+    monkeypatch.setattr(main, "pool_warmers", [warmer])
+    monkeypatch.setattr(main.settings, "DB_WARMUP_ENABLED", True)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        await warmer.start()
+        response = await client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["pools"]["primary"]["state"] == FAILED
+
+        # The failed warm-up is restarted by the readiness probe
+        await warmer._task
+        response = await client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
@@ -0,0 +1,129 @@
+"""
+Tests for profile reads in AppService
+"""
+
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, select
+
+from api.routes.app import update_profile_basic
+from api.schemas.profile import MenstrualTrackingDto, ProfileBasicUpdate
+from db.models.cycle_phase_span import CyclePhaseSpan
+from db.models.profile import Profile
+from db.models.user import User
+from services.app_service import AppService
+
+app_service = AppService()
+
+
+@pytest.mark.asyncio
+async def test_get_profile_response_uses_single_statement(async_db, statements, user_with_profile):
+    """Profile response is built from one joined projection query"""
+    user, profile = user_with_profile
+    statements.clear()
+
+    response = await app_service.get_profile_response(async_db, user.id)
+
+    assert len(statements) == 1
+    assert response.id == profile.id
+    assert response.user_id == user.id
+    assert response.email == "jane@example.com"
+    assert response.name == "Jane"
+    assert response.user_type == "USER"
+    assert response.referral_code == "ABCD1234"
+
+
+@pytest.mark.asyncio
+async def test_get_profile_response_missing_profile(async_db):
+    """Missing profile raises ValueError like find_profile_by_user_id"""
+    with pytest.raises(ValueError):
+        await app_service.get_profile_response(async_db, 999)
+
+
+@pytest.mark.asyncio
+async def test_patch_profile_issues_single_update(async_db, statements, user_with_profile):
+    """Only the fields sent are written, in one UPDATE ... RETURNING"""
+    user, _ = user_with_profile
+    statements.clear()
+
+    patch = ProfileBasicUpdate(name="  Janet ", age=31)
+    updated = await app_service.patch_profile(async_db, user.id, patch)
+
+    writes = [s for s in statements if s.lstrip().upper().startswith(("SELECT", "UPDATE"))]
+    assert len(writes) == 1
+    assert "RETURNING" in writes[0].upper()
+    assert "height" not in writes[0].split("RETURNING")[0]
+    assert (updated.name, updated.age, updated.nick_name) == ("Janet", 31, None)
+    assert await async_db.scalar(select(Profile.name).where(Profile.user_id == user.id)) == "Janet"
+
+
+@pytest.mark.asyncio
+async def test_patch_profile_rejects_blank_name_and_missing_profile(async_db):
+    """Validation happens in the schema; unknown users raise ValueError"""
+    with pytest.raises(ValidationError):
+        ProfileBasicUpdate(name="   ")
+    with pytest.raises(ValueError):
+        await app_service.patch_profile(async_db, 999, ProfileBasicUpdate(age=30))
+
+
+@pytest.mark.asyncio
+async def test_update_menstrual_data_returns_inputs_from_update(async_db, statements, user_with_profile):
+    """Menstrual updates refresh spans from the UPDATE's RETURNING row"""
+    user, _ = user_with_profile
+    dto = MenstrualTrackingDto(period_length=5, cycle_length=28)
+    await app_service.update_menstrual_data(async_db, user.id, dto)
+
+    statements.clear()
+    await app_service.update_menstrual_data(async_db, user.id, MenstrualTrackingDto(last_period_start_date=date(2025, 3, 1)))
+
+    profile_reads = [s for s in statements if s.lstrip().startswith("SELECT") and "FROM profiles" in s]
+    assert profile_reads == []
+    spans = await async_db.scalar(select(func.count()).where(CyclePhaseSpan.user_id == user.id))
+    assert spans > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("basic_info, detail", [
+    ({"age": "30"}, "Age must be between 0 and 120"),
+    ({"age": 121}, "Age must be between 0 and 120"),
+    ({"height": "170"}, "Height must be a positive number"),
+    ({"weight": 0}, "Weight must be a positive number"),
+    ({"name": "  "}, "Name must be a non-empty string"),
+    ({"nick_name": 5}, "Nickname must be a string or null"),
+    ({"name": "", "age": -1}, "Age must be between 0 and 120"),
+])
+async def test_put_profile_basic_keeps_its_validation(async_db, user_with_profile, basic_info, detail):
+    """The legacy route rejects numeric strings with its own 400 messages"""
+    user, _ = user_with_profile
+    with pytest.raises(HTTPException) as error:
+        await update_profile_basic(basic_info, db=async_db, current_user=user)
+    assert (error.value.status_code, error.value.detail) == (400, detail)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("basic_info", [{"age": "30"}, {"age": 30}])
+async def test_put_profile_basic_without_profile_is_not_found(async_db, basic_info):
+    """A user without a profile gets 404 whether or not the body is valid"""
+    user = User(email="no-profile@example.com", password="hashed")
+    async_db.add(user)
+    await async_db.flush()
+
+    with pytest.raises(HTTPException) as error:
+        await update_profile_basic(basic_info, db=async_db, current_user=user)
+    assert (error.value.status_code, error.value.detail) == (404, "Profile not found")
+
+
+@pytest.mark.asyncio
+async def test_put_profile_basic_updates_sent_fields(async_db, user_with_profile):
+    user, _ = user_with_profile
+    basic_info = {"age": 30, "height": 170, "name": " Janet ", "weight": None}
+    response = await update_profile_basic(basic_info, db=async_db, current_user=user)
+
+    assert response == {"message": "Profile updated successfully"}
+    row = (await async_db.execute(
+        select(Profile.age, Profile.height, Profile.name).where(Profile.user_id == user.id)
+    )).first()
+    assert tuple(row) == (30, 170.0, "Janet")
@@ -0,0 +1,95 @@
+"""
+Tests for per-request statement tracking
+"""
+
+import asyncio
+import logging
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core.database import Base
+from core.metrics import DB_STATEMENT_DURATION, DB_STATEMENTS_PER_REQUEST
+import core.query_log
+from core.query_log import QueryStatsMiddleware, RequestQueryStats, instrument_statements, normalize_sql
+from db.models.user import User
+from db.models.profile import Profile
+
+
+def test_normalize_sql_collapses_values():
+    """Statements differing only in values share one shape"""
+    assert normalize_sql("SELECT *\n  FROM profiles WHERE id = 42 AND name = 'O''Hara'") == \
+        "SELECT * FROM profiles WHERE id = ? AND name = ?"
+    assert normalize_sql("SELECT id FROM users WHERE id IN (?, ?, ?)") == \
+        normalize_sql("SELECT id FROM users WHERE id IN ($1, $2)") == \
+        "SELECT id FROM users WHERE id IN (?...)"
+    assert normalize_sql("SELECT col::text FROM t WHERE a = %(a_1)s") == "SELECT col::text FROM t WHERE a = ?"
+    assert normalize_sql("SELECT user_1.id FROM t") == "SELECT user_1.id FROM t"
+
+
+def test_repeated_shapes_and_slow_queries_are_logged(tmp_path, caplog):
+    """An N+1 loop is flagged once per shape; every statement over the threshold is logged"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'query_log.db'}")
+    instrument_statements(engine, "query-log-test", slow_query_seconds=0)
+    session_maker = async_sessionmaker(engine)
+
+    async def get_db():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.get("/users")
+    async def list_users(db: AsyncSession = Depends(get_db)):
+        ids = (await db.scalars(select(User.id))).all()
+        return [await db.scalar(select(Profile.name).where(Profile.user_id == user_id)) for user_id in ids]
+
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[User.__table__, Profile.__table__])
+            for i in range(4):
+                await conn.execute(text(
+                    f"INSERT INTO users (email, password, is_email_verified) VALUES ('u{i}@example.com', 'x', 1)"
+                ))
+        transport = httpx.ASGITransport(app=QueryStatsMiddleware(app, detect_repeats=True, repeat_threshold=3))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/users")
+        await engine.dispose()
+        return response
+
+    before = DB_STATEMENTS_PER_REQUEST.count("GET", "/users")
+    selects_before = DB_STATEMENT_DURATION.count("query-log-test", "SELECT")
+    with caplog.at_level(logging.WARNING, logger="core.query_log"):
+        response = asyncio.run(scenario())
+
+    assert response.headers["server-timing"].endswith('desc="5 statements"')
+    assert DB_STATEMENTS_PER_REQUEST.count("GET", "/users") == before + 1
+    # One timer per statement feeds both the request stats and the histogram
+    assert DB_STATEMENT_DURATION.count("query-log-test", "SELECT") == selects_before + 5
+    n_plus_one = [r.message for r in caplog.records if r.message.startswith("Possible N+1")]
+    assert len(n_plus_one) == 1
+    assert n_plus_one[0].startswith("Possible N+1 in GET /users: 4 x SELECT profiles.name FROM profiles WHERE")
+    assert sum(r.message.startswith("Slow query") for r in caplog.records) >= 5
+
+
+def test_fast_statements_are_not_normalized_without_repeat_detection(monkeypatch):
+    """Shapes are only computed for slow statements or when repeats are tracked"""
+    normalized = []
+    monkeypatch.setattr(core.query_log, "normalize_sql", lambda statement: normalized.append(statement) or statement)
+    engine = create_engine("sqlite://")
+    instrument_statements(engine, "normalize-test", slow_query_seconds=60, record_metrics=False)
+    stats = RequestQueryStats()
+    token = core.query_log._current_stats.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats.track_shapes = True
+            conn.execute(text("SELECT 2"))
+    finally:
+        core.query_log._current_stats.reset(token)
+
+    assert stats.count == 2
+    assert normalized == ["SELECT 2"]
+    assert dict(stats.shapes) == {"SELECT 2": 1}
@@ -0,0 +1,59 @@
+"""
+Tests for the hot-path query repository
+"""
+
+import pytest
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import InvalidRequestError
+
+from db.models.profile import Profile
+from db.repository import (
+    profile_for_update, profile_id_by_referral_code, profile_name_by_referral_code,
+    user_by_email, user_credentials_by_email
+)
+
+
+@pytest.mark.asyncio
+async def test_user_lookups_load_only_what_they_need(async_db, user_with_profile):
+    """The authenticated user never carries the password hash; the login lookup does"""
+    user, _ = user_with_profile
+
+    authenticated = await user_by_email(async_db, user.email)
+    assert (authenticated.id, authenticated.is_email_verified) == (user.id, True)
+    assert "password" in inspect(authenticated).unloaded
+    with pytest.raises(InvalidRequestError):
+        authenticated.password
+
+    async_db.expunge_all()
+    credentials = await user_credentials_by_email(async_db, user.email)
+    assert credentials.password == "hashed"
+    assert await user_by_email(async_db, "missing@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_profile_blobs_are_not_fetched_but_can_be_written(async_db, user_with_profile, statements):
+    """JSONB and binary columns stay out of the SELECT and are still assignable"""
+    user, _ = user_with_profile
+
+    profile = await profile_for_update(async_db, user.id)
+    assert "medical_summary" not in statements[-1]
+    assert "risk_assessment_mcq_data" not in statements[-1]
+    assert {"medical_summary", "risk_assessment_mcq_data", "risk_assessment_mcq_codes"} <= inspect(profile).unloaded
+
+    profile.medical_summary = {"notes": "ok"}
+    profile.language_code = "fr"
+    await async_db.commit()
+
+    row = (await async_db.execute(
+        select(Profile.medical_summary, Profile.language_code).where(Profile.user_id == user.id)
+    )).first()
+    assert row == ({"notes": "ok"}, "fr")
+
+
+@pytest.mark.asyncio
+async def test_referral_code_lookups(async_db, user_with_profile):
+    user, profile = user_with_profile
+
+    assert await profile_id_by_referral_code(async_db, "ABCD1234") == profile.id
+    assert await profile_id_by_referral_code(async_db, "NOPE0000") is None
+    assert tuple(await profile_name_by_referral_code(async_db, "ABCD1234")) == (user.id, "Jane")
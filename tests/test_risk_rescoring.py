@@ -0,0 +1,178 @@
+"""
+Tests for risk assessment history and rescoring
+"""
+
+import pytest
+from sqlalchemy import insert, select
+
+from db.models.mcq_answer_code import McqAnswerCode
+from db.models.profile import Profile, UserType
+from db.models.risk_assessment import RiskAssessment, RiskRescoreJob
+from db.models.risk_rule import McqScoringRule
+from db.models.user import User
+from services.app_service import AppService
+from services.mcq_codec import encode_answers
+from services.risk_rescoring_service import RiskRescoringService
+from services.risk_scoring_service import CompiledRuleSet, DEFAULT_RULES
+from tests.risk_reference import if_chain_score as reference_score, random_answer_sets
+
+app_service = AppService()
+
+
+def seed_profiles(db_engine, answer_sets):
+    """One user and profile per answer set, scored with the default rules"""
+    with db_engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "password": "hashed", "is_email_verified": True}
+            for i in range(len(answer_sets))
+        ])
+        rows = []
+        for i, answers in enumerate(answer_sets):
+            codes, extras = encode_answers(answers)
+            rows.append({
+                "user_id": i + 1,
+                "name": f"User {i}",
+                "user_type": UserType.USER,
+                "risk_assessment_mcq_codes": codes,
+                "risk_assessment_mcq_data": extras,
+                "breast_cancer_risk_level": CompiledRuleSet.risk_level(reference_score(answers))
+            })
+        conn.execute(insert(Profile), rows)
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_appended_to_history(async_db, user_with_profile):
+    """Every submission adds a history row; the profile keeps the latest"""
+    user, _ = user_with_profile
+    await app_service.process_mcq_risk_assessment(async_db, user.id, {"age_group": "AGE_50_PLUS"})
+    await app_service.process_mcq_risk_assessment(async_db, user.id, {"family_history": "YES_FIRST_DEGREE", "age_group": "AGE_50_PLUS"})
+
+    history = (await async_db.execute(
+        select(RiskAssessment.score, RiskAssessment.risk_level, RiskAssessment.source)
+        .where(RiskAssessment.user_id == user.id)
+        .order_by(RiskAssessment.id)
+    )).all()
+    assert history == [(4, "Low Risk", "SUBMISSION"), (9, "Moderate Risk", "SUBMISSION")]
+    level = await async_db.scalar(select(Profile.breast_cancer_risk_level).where(Profile.user_id == user.id))
+    assert level == "Moderate Risk"
+
+
+def test_rescoring_updates_changed_levels_and_resumes(db_engine, db):
+    """A new rule version rescores every profile, in chunks, exactly once"""
+    answer_sets = random_answer_sets(120, seed=5)
+    answer_sets[0]["age_group"] = "AGE_50_PLUS_OTHER"
+    seed_profiles(db_engine, answer_sets)
+
+    doubled = CompiledRuleSet(2, [(q, a, w * 2) for q, a, w in DEFAULT_RULES])
+    expected = [doubled.risk_level(doubled.score(answers)) for answers in answer_sets]
+    current = [CompiledRuleSet.risk_level(reference_score(answers)) for answers in answer_sets]
+    expected_changes = sum(e != c for e, c in zip(expected, current))
+
+    service = RiskRescoringService(chunk_size=50)
+    with db_engine.connect() as conn:
+        job = service.run(conn, rules=doubled)
+    assert job["processed"] == 120
+    assert job["changed"] == expected_changes > 0
+
+    levels = db.execute(select(Profile.breast_cancer_risk_level).order_by(Profile.id)).scalars().all()
+    assert levels == expected
+    assert len(db.execute(select(RiskAssessment.id)).all()) == expected_changes
+
+    with db_engine.connect() as conn:
+        again = service.run(conn, rules=doubled)
+    assert again["processed"] == 120
+    assert db.get(RiskRescoreJob, 2).finished_at is not None
+
+
+def test_interrupted_rescoring_continues_from_checkpoint(db_engine, db):
+    """A run restarted after a crash skips the profiles already done"""
+    seed_profiles(db_engine, random_answer_sets(30, seed=9))
+    doubled = CompiledRuleSet(3, [(q, a, w * 2) for q, a, w in DEFAULT_RULES])
+
+    with db_engine.begin() as conn:
+        conn.execute(insert(RiskRescoreJob), {"rules_version": 3, "last_profile_id": 20, "processed": 20})
+
+    with db_engine.connect() as conn:
+        job = RiskRescoringService(chunk_size=7).run(conn, rules=doubled)
+    assert job["processed"] == 30
+
+
+def test_rescoring_with_a_rule_for_an_uncoded_answer(db_engine, db):
+    """A rule on an answer kept in the extras gets a code and scores every row"""
+    answer_sets = [{"age_group": "AGE_50_PLUS_OTHER"}, {"age_group": "AGE_50_PLUS"}]
+    seed_profiles(db_engine, answer_sets)
+    rules = CompiledRuleSet(4, DEFAULT_RULES + [("age_group", "AGE_50_PLUS_OTHER", 10)])
+
+    with db_engine.connect() as conn:
+        job = RiskRescoringService().run(conn, rules=rules)
+    assert job["changed"] == 1
+
+    levels = db.execute(select(Profile.breast_cancer_risk_level).order_by(Profile.id)).scalars().all()
+    assert levels == ["High Risk", "Low Risk"]
+    assert db.scalar(select(McqAnswerCode.answer).where(McqAnswerCode.question == "age_group")) == "AGE_50_PLUS_OTHER"
+
+
+def test_submissions_scored_with_older_rules_are_swept(db_engine, db):
+    """A submission scored with cached old rules behind the cursor is fixed by the next call"""
+    answers = {"family_history": "YES_FIRST_DEGREE"}
+    seed_profiles(db_engine, [answers, answers])
+    doubled = CompiledRuleSet(2, [(q, a, w * 2) for q, a, w in DEFAULT_RULES])
+    service = RiskRescoringService(chunk_size=1)
+    with db_engine.connect() as conn:
+        assert service.run(conn, rules=doubled)["changed"] == 2
+
+    # A worker still on version 1 stores its level after the run finished
+    codes, extras = encode_answers(answers)
+    with db_engine.begin() as conn:
+        conn.execute(Profile.__table__.update().where(Profile.id == 2).values(breast_cancer_risk_level="Moderate Risk"))
+        conn.execute(insert(RiskAssessment), {
+            "user_id": 2, "answer_codes": codes, "extra_answers": extras, "score": 5,
+            "risk_level": "Moderate Risk", "rules_version": 1, "source": "SUBMISSION"
+        })
+
+    with db_engine.connect() as conn:
+        job = service.run(conn, rules=doubled)
+    assert job["changed"] == 3
+    levels = db.execute(select(Profile.breast_cancer_risk_level).order_by(Profile.id)).scalars().all()
+    assert levels == ["High Risk", "High Risk"]
+
+
+@pytest.mark.asyncio
+async def test_submissions_use_a_newly_published_version(db, async_db, user_with_profile):
+    """Stored results never wait for the per-worker rules cache to expire"""
+    user, _ = user_with_profile
+    await app_service.risk_scoring_service.get_rules(async_db)  # cached: built-in version 1
+
+    db.add_all([
+        McqScoringRule(version=2, question=q, answer=a, weight=w * 2) for q, a, w in DEFAULT_RULES
+    ])
+    db.commit()
+
+    level = await app_service.process_mcq_risk_assessment(async_db, user.id, {"family_history": "YES_FIRST_DEGREE"})
+    assert level == "High Risk"
+    version = await async_db.scalar(select(RiskAssessment.rules_version).where(RiskAssessment.user_id == user.id))
+    assert version == 2
+
+
+def test_rescoring_skips_profiles_resubmitted_meanwhile(db_engine, db, monkeypatch):
+    """A submission landing between the chunk read and the UPDATE is not overwritten"""
+    seed_profiles(db_engine, [{"family_history": "YES_FIRST_DEGREE"}, {"family_history": "YES_FIRST_DEGREE"}])
+    doubled = CompiledRuleSet(2, [(q, a, w * 2) for q, a, w in DEFAULT_RULES])
+    service = RiskRescoringService()
+    score_rows = service.score_rows
+
+    def submit_while_scoring(rows, rules, table):
+        codes, extras = encode_answers({"age_group": "AGE_50_PLUS"})
+        with db_engine.begin() as other:
+            other.execute(Profile.__table__.update().where(Profile.id == 2).values(
+                risk_assessment_mcq_codes=codes, risk_assessment_mcq_data=extras, breast_cancer_risk_level="Moderate Risk"
+            ))
+        return score_rows(rows, rules, table)
+
+    monkeypatch.setattr(service, "score_rows", submit_while_scoring)
+    with db_engine.connect() as conn:
+        assert service.run(conn, rules=doubled)["changed"] == 1
+
+    levels = db.execute(select(Profile.breast_cancer_risk_level).order_by(Profile.id)).scalars().all()
+    assert levels == ["High Risk", "Moderate Risk"]
+    assert db.execute(select(RiskAssessment.user_id)).scalars().all() == [1]
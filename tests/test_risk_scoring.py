@@ -0,0 +1,86 @@
+"""
+Tests for the table-driven MCQ risk scoring
+"""
+
+import itertools
+
+import pytest
+from pydantic import ValidationError
+
+from api.schemas.risk import McqBatchRequest
+from core.config import settings
+from db.models.risk_rule import McqScoringRule
+from services.app_service import AppService
+from services.risk_scoring_service import (
+    CompiledRuleSet, RiskScoringService, DEFAULT_RULES, DEFAULT_RULES_VERSION
+)
+from tests.risk_reference import if_chain_score as reference_score, random_answer_sets
+
+app_service = AppService()
+
+
+def test_compiled_rules_match_reference():
+    """Compiled lookup scores exactly like the if-chain"""
+    rules = CompiledRuleSet(DEFAULT_RULES_VERSION, DEFAULT_RULES)
+    for answers in random_answer_sets(5000):
+        assert rules.score(answers) == reference_score(answers)
+
+    assert rules.score({"breastfeeding_history": "BREASTFED_YES_GT_6MO"}) == 0
+
+
+def test_rule_text_is_treated_as_data():
+    """Quotes and newlines in stored rules are plain lookup keys"""
+    odd = "x'\nraise SystemExit #"
+    rules = CompiledRuleSet(9, [(odd, odd, 3)])
+    assert rules.score({odd: odd}) == 3
+    assert rules.score({odd: "x"}) == 0
+
+
+def test_risk_level_thresholds():
+    """Thresholds are unchanged"""
+    levels = [CompiledRuleSet.risk_level(score) for score in (0, 4, 5, 9, 10)]
+    assert levels == ["Low Risk", "Low Risk", "Moderate Risk", "Moderate Risk", "High Risk"]
+
+
+@pytest.mark.asyncio
+async def test_rules_load_latest_version_from_database(db, async_db):
+    """The newest stored version replaces the built-in rules"""
+    service = RiskScoringService()
+    assert (await service.get_rules(async_db)).version == DEFAULT_RULES_VERSION
+
+    db.add_all([
+        McqScoringRule(version=2, question=question, answer=answer, weight=weight * 2)
+        for question, answer, weight in DEFAULT_RULES
+    ])
+    db.commit()
+
+    rules = service.load_rules(db)
+    assert rules.version == 2
+    assert rules.score({"family_history": "YES_FIRST_DEGREE"}) == 10
+
+
+@pytest.mark.asyncio
+async def test_batch_scoring_and_single_assessment_agree(async_db, user_with_profile):
+    """Batch results equal the stored single-assessment outcome"""
+    user, profile = user_with_profile
+    answer_sets = random_answer_sets(50, seed=3)
+
+    batch = await app_service.score_mcq_batch(async_db, answer_sets)
+    assert batch.rules_version == DEFAULT_RULES_VERSION
+    assert [result.score for result in batch.results] == [reference_score(a) for a in answer_sets]
+
+    for answers, result in itertools.islice(zip(answer_sets, batch.results), 5):
+        assert await app_service.process_mcq_risk_assessment(async_db, user.id, answers) == result.risk_level
+        await async_db.commit()  # one submission per request
+    assert (await app_service.get_mcq_risk_assessment(async_db, user.id)).answers == answer_sets[4]
+
+
+def test_batch_request_size_limit():
+    """Up to MCQ_BATCH_MAX_ANSWER_SETS answer sets are accepted per request"""
+    limit = settings.MCQ_BATCH_MAX_ANSWER_SETS
+    assert limit == 10000
+    assert len(McqBatchRequest(answer_sets=[{}] * limit).answer_sets) == limit
+    with pytest.raises(ValidationError):
+        McqBatchRequest(answer_sets=[{}] * (limit + 1))
+    with pytest.raises(ValidationError):
+        McqBatchRequest(answer_sets=[])
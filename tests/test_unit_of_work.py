@@ -0,0 +1,131 @@
+"""
+Tests for the one-commit-per-request unit of work
+"""
+
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from api.schemas.auth import SignUpRequest
+from core.db_routing import session_wrote
+from api.schemas.profile import ProfileRequest, UserType
+from db.models.otp import Otp
+from db.models.user import User
+from services.app_service import AppService
+
+app_service = AppService()
+
+
+@pytest.fixture
+def commits():
+    """Count commits that wrote, issued by any session (read-only releases don't count)"""
+    counter = []
+
+    def record(session):
+        if session_wrote(session):
+            counter.append(session)
+
+    event.listen(Session, "after_commit", record)
+    yield counter
+    event.remove(Session, "after_commit", record)
+
+
+@pytest.fixture
+def sent_emails(monkeypatch):
+    """Capture OTP emails instead of sending them"""
+    sent = []
+    monkeypatch.setattr(app_service.email_service, "send_otp_email", lambda email, otp: sent.append(email))
+    monkeypatch.setattr("services.app_service.get_password_hash", lambda password: "hashed")
+    return sent
+
+
+async def wait_for(condition, timeout=1.0):
+    """Poll until condition() holds; emails are sent from the default executor"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+@pytest.mark.asyncio
+async def test_signup_and_verification_commit_once(request_session, commits, sent_emails):
+    """Signup and email verification are one transaction each"""
+    async with request_session() as db:
+        user = await app_service.register_user(db, SignUpRequest(email="new@example.com", password="secret123"))
+        assert sent_emails == []
+    assert len(commits) == 1
+    assert await wait_for(lambda: sent_emails == ["new@example.com"])
+
+    async with request_session() as db:
+        otp = await db.scalar(select(Otp).where(Otp.email == "new@example.com"))
+        await app_service.verify_email(db, "new@example.com", otp.otp_code)
+    assert len(commits) == 2
+
+    async with request_session() as db:
+        assert (await db.get(User, user.id)).is_email_verified
+        assert (await db.get(Otp, otp.id)).used
+
+
+@pytest.mark.asyncio
+async def test_failed_otp_email_is_logged(request_session, monkeypatch, caplog):
+    """A send that returns False or raises is logged, since nothing awaits it"""
+    attempts = []
+
+    def send_otp_email(email, otp):
+        attempts.append(email)
+        if email == "raises@example.com":
+            raise ConnectionError("SMTP down")
+        return False
+
+    monkeypatch.setattr(app_service.email_service, "send_otp_email", send_otp_email)
+    monkeypatch.setattr("services.app_service.get_password_hash", lambda password: "hashed")
+    with caplog.at_level(logging.ERROR, logger="services.app_service"):
+        for email in ("fails@example.com", "raises@example.com"):
+            async with request_session() as db:
+                await app_service.register_user(db, SignUpRequest(email=email, password="secret123"))
+        assert await wait_for(lambda: len(caplog.records) == 2)
+
+    messages = sorted(record.getMessage() for record in caplog.records)
+    assert messages == [
+        "Sending the OTP email to fails@example.com failed",
+        "Sending the OTP email to raises@example.com raised",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_profile_commits_once(request_session, commits):
+    """Profile creation flushes for its id and commits once"""
+    async with request_session() as db:
+        user = User(email="other@example.com", password="hashed", is_email_verified=True)
+        db.add(user)
+    commits.clear()
+
+    async with request_session() as db:
+        response = await app_service.create_profile(db, ProfileRequest(name="Ann", user_type=UserType.USER), user)
+    assert len(commits) == 1
+    assert response.referral_code
+
+
+@pytest.mark.asyncio
+async def test_failed_request_rolls_back_and_skips_side_effects(request_session, user_with_profile, commits, sent_emails):
+    """An exception discards staged rows, emails and cache invalidations"""
+    user, _ = user_with_profile
+    async with request_session() as db:
+        snapshot = await app_service.profile_cache.get(db, user.id)
+    commits.clear()
+
+    with pytest.raises(RuntimeError):
+        async with request_session() as db:
+            await app_service.register_user(db, SignUpRequest(email="lost@example.com", password="secret123"))
+            await app_service.update_user_language(db, user.id, "fr")
+            raise RuntimeError("request failed")
+
+    await asyncio.sleep(0.05)
+    assert commits == []
+    assert sent_emails == []
+    async with request_session() as db:
+        assert await db.scalar(select(func.count()).where(User.email == "lost@example.com")) == 0
+        assert await app_service.profile_cache.get(db, user.id) is snapshot